@@ -1,10 +1,20 @@
 #Alinhamento de Sequências
+import re
+
+import numpy as np
+
+from .dot_plot import dot_plot
+from .sequencias import NOMES_TIPO, PROTEINA_PADRAO, TIPO_INDETERMINADO, tipo_sequencia
+from .substituicao import MatrizSubstituicao, carregar_matriz
 
 #Matrizes de Pontos:
 def identificar_sequencia(seq):
     """
     Identifica se a sequência é DNA, RNA ou proteína.
 
+    Usa o classificador de `sequencias` com o alfabeto das 20 proteínas
+    padrão; sequências só com A, C e G são consideradas DNA.
+
     Args:
         seq (str): Sequência biológica.
 
@@ -15,21 +25,10 @@ def identificar_sequencia(seq):
         >>> identificar_sequencia("ACGT")
         'DNA'
     """
-    seq = seq.upper()
-    dna = set("ACGT")
-    rna = set("ACUG")
-    proteina = set("ACDEFGHIKLMNPQRSTVWY")  # aminoácidos padrão
-
-    letras = set(seq)
-
-    if letras.issubset(dna):
+    tipo = tipo_sequencia(seq, PROTEINA_PADRAO)
+    if tipo == TIPO_INDETERMINADO:
         return "DNA"
-    elif letras.issubset(rna):
-        return "RNA"
-    elif letras.issubset(proteina):
-        return "AMINO"
-    else:
-        return "ERRO"
+    return NOMES_TIPO[tipo]
 
 
 def matriz_de_zeros(seq1: str, seq2: str):
@@ -79,6 +78,9 @@ def dot_plot_janela(seq1: str, seq2: str, window: int, stringency: int):
     """
     Cria dot plot usando janela deslizante e stringency mínima.
 
+    Os pontos são calculados por `dot_plot` (hashing de k-mers e contagens
+    ao longo das diagonais), em vez de comparar todos os pares de janelas.
+
     Args:
         seq1 (str): Primeira sequência.
         seq2 (str): Segunda sequência.
@@ -86,19 +88,17 @@ def dot_plot_janela(seq1: str, seq2: str, window: int, stringency: int):
         stringency (int): Número mínimo de matches na janela.
 
     Returns:
-        list[list[int]]: Matriz de 0s e 1s indicando matches.
+        list[list[int]]: Matriz de 0s e 1s indicando matches
+        (len(seq1)+1 x len(seq2)+1; a janela que começa em (p1, p2) está em matriz[p1][p2]).
 
     Example:
-        >>> dot_plot_janela("ACGT", "ACGA", 3, 2)
-        [[1, 0], [0, 0]]
+        >>> dot_plot_janela("ACGT", "ACGA", 3, 2)[:2]
+        [[1, 0, 0, 0, 0], [0, 1, 0, 0, 0]]
     """
     matriz = matriz_de_zeros(seq1, seq2)
-    limite1, limite2 = len(seq1) - window + 1, len(seq2) - window + 1
-
-    for p1 in range(limite1):
-        for p2 in range(limite2):
-            if janela_match(seq1, seq2, p1, p2, window) >= stringency:
-                matriz[p1][p2] = 1
+    linhas, colunas = dot_plot(seq1, seq2, window, stringency)
+    for p1, p2 in zip(linhas.tolist(), colunas.tolist()):
+        matriz[p1][p2] = 1
     return matriz
 
 
@@ -107,6 +107,9 @@ def imprimir_dot_plot(seq1: str, seq2: str, window: int, stringency: int):
     Imprime um dot plot com sliding window e stringency,
     mostrando explicitamente as janelas de ambas as
     sequências nos eixos e alinhando os pontos corretamente.
+
+    Só serve para sequências pequenas; para as grandes, ver
+    `dot_plot.raster_dot_plot` e `dot_plot.escrever_imagem`.
     """
 
     matriz = dot_plot_janela(seq1, seq2, window, stringency)
@@ -140,15 +143,19 @@ def imprimir_dot_plot(seq1: str, seq2: str, window: int, stringency: int):
 def matriz_substituição_proteína():
     """
     Cria uma matriz de substituição BLOSUM62 para proteínas.
-    Definida internamente (sem bibliotecas externas).
+
+    Inclui os 20 aminoácidos, B, Z, X e * (tabela do NCBI incluída na
+    biblioteca, ver `substituicao.carregar_matriz`).
+
+    Returns:
+        dict[str, dict[str, int]]: Matriz de substituição.
+
+    Example:
+        >>> matriz_substituição_proteína()["W"]["W"]
+        11
     """
-    return {
-        "A": {"A": 4,  "C": 0,  "D": -2, "E": -1, "F": -2},
-        "C": {"A": 0,  "C": 9,  "D": -3, "E": -4, "F": -2},
-        "D": {"A": -2, "C": -3, "D": 6,  "E": 2,  "F": -3},
-        "E": {"A": -1, "C": -4, "D": 2,  "E": 5,  "F": -3},
-        "F": {"A": -2, "C": -2, "D": -3, "E": -3, "F": 6},
-    }
+    blosum62 = carregar_matriz("BLOSUM62")
+    return {a: dict(blosum62[a]) for a in blosum62.alfabeto}
 
 
 def matriz_substituição_dna(match: int, mismatch: int):
@@ -288,7 +295,8 @@ def imprimir_grid(grid, setas):
 
     Args:
         grid (list[list[str|int]]): Grid de scores com seq2 na primeira linha e seq1 na primeira coluna.
-        setas (list[list[str]]): Matriz de setas ("↖", "↑", "←", "STOP") correspondente ao grid.
+        setas (list[list[str]] | SetasCompactas): Matriz de setas ("↖", "↑",
+            "←", "STOP") correspondente ao grid.
 
     Returns:
         None
@@ -310,79 +318,165 @@ def imprimir_grid(grid, setas):
     for linha in grid:
         print(linha)
     print("\nMatriz de Setas:")
+    if isinstance(setas, SetasCompactas):
+        setas = setas.texto()
     for linha in setas:
         print(linha)
 
 
-def needleman_wunsch(seq1: str, seq2: str, match: int = 2, mismatch: int = -3, space: int = -4):
+def needleman_wunsch(seq1: str, seq2: str, match: int = 2, mismatch: int = -3, space: int = -4,
+                     backend: str = "python", subst=None):
+    """
+    Calcula as matrizes de scores e de setas do alinhamento global.
+
+    Args:
+        seq1 (str): Primeira sequência.
+        seq2 (str): Segunda sequência.
+        match (int, optional): Pontuação para match (DNA).
+        mismatch (int, optional): Pontuação para mismatch (DNA).
+        space (int, optional): Penalidade de gap.
+        backend (str, optional): "python" (listas) ou "numpy" (arrays; muito
+            mais rápido em sequências longas).
+        subst (dict | MatrizSubstituicao | None, optional): Matriz de
+            substituição (ex.: `carregar_matriz("BLOSUM62")`). Por omissão é
+            escolhida com `escolha_de_matriz` a partir de match/mismatch.
+
+    Returns:
+        tuple: (matriz, setas). A matriz de scores é uma lista de listas com
+        "python" e um array int32 com "numpy" (os valores são os mesmos); as
+        setas vêm sempre numa `SetasCompactas` (2 bits por célula;
+        `setas.texto()` dá as strings "↖", "↑", "←", só para mostrar).
+
+    Example:
+        >>> matriz, setas = needleman_wunsch("ACG", "AG")
+        >>> matriz[-1][-1]
+        0
+    """
+    if subst is None:
+        subst = escolha_de_matriz(seq1, seq2, match, mismatch)
+    if _usar_numpy(backend):
+        return _matrizes_numpy(seq1, seq2, subst, space)
     n, m = len(seq1), len(seq2)
     matriz = [[0] * (m + 1) for _ in range(n + 1)]
-    setas = [["" for _ in range(m + 1)] for _ in range(n + 1)]
-    subst = escolha_de_matriz(seq1, seq2, match, mismatch)
+    # Uma linha de índices em SETAS por linha da matriz (empacotadas no fim).
+    setas = [bytearray([_STOP]) + bytearray([_ESQ]) * m]
+    codigos1, codigos2, tabela = _tabela_python(seq1, seq2, subst)
 
     for i in range(1, n + 1):
         matriz[i][0] = matriz[i-1][0] + space
-        setas[i][0] = "↑"
     for j in range(1, m + 1):
         matriz[0][j] = matriz[0][j-1] + space
-        setas[0][j] = "←"
 
     for i in range(1, n + 1):
+        scores = tabela[codigos1[i-1]]
+        linha = bytearray([_CIMA]) * (m + 1)
         for j in range(1, m + 1):
-            diag = matriz[i-1][j-1] + subst[seq1[i-1]][seq2[j-1]]
+            diag = matriz[i-1][j-1] + scores[codigos2[j-1]]
             cima = matriz[i-1][j] + space
             esquerda = matriz[i][j-1] + space
             score, seta = melhor_movimento(diag, cima, esquerda)
             matriz[i][j] = score
-            setas[i][j] = seta
+            linha[j] = _INDICE_SETA[seta]
+        setas.append(linha)
 
-    return matriz, setas  
+    return matriz, _setas_de_linhas(setas, fim=(n, m))
 
 
 
-def smith_waterman(seq1: str, seq2: str, match: int = 2, mismatch: int = -3, space: int = -4):
+def smith_waterman(seq1: str, seq2: str, match: int = 2, mismatch: int = -3, space: int = -4,
+                   backend: str = "python", subst=None):
+    """
+    Calcula as matrizes de scores e de setas do alinhamento local.
+
+    Args:
+        seq1 (str): Primeira sequência.
+        seq2 (str): Segunda sequência.
+        match (int, optional): Pontuação para match (DNA).
+        mismatch (int, optional): Pontuação para mismatch (DNA).
+        space (int, optional): Penalidade de gap.
+        backend (str, optional): "python" (listas) ou "numpy" (arrays).
+        subst (dict | MatrizSubstituicao | None, optional): Matriz de substituição.
+
+    Returns:
+        tuple: (matriz, setas), como em `needleman_wunsch`; as células com
+        score 0 têm a seta "STOP" e `setas.fim` é a (primeira) célula de
+        score máximo, onde `reconstruir_alinhamento` começa.
+    """
+    if subst is None:
+        subst = escolha_de_matriz(seq1, seq2, match, mismatch)
+    if _usar_numpy(backend):
+        return _matrizes_numpy(seq1, seq2, subst, space, local=True)
     n, m = len(seq1), len(seq2)
     matriz = [[0] * (m + 1) for _ in range(n + 1)]
-    setas = [["" for _ in range(m + 1)] for _ in range(n + 1)]
-    subst = escolha_de_matriz(seq1, seq2, match, mismatch)
+    setas = [bytearray([_STOP]) * (m + 1)]
+    codigos1, codigos2, tabela = _tabela_python(seq1, seq2, subst)
+    maximo, inicio = 0, None
 
     for i in range(1, n + 1):
+        scores = tabela[codigos1[i - 1]]
+        linha = bytearray([_STOP]) * (m + 1)
         for j in range(1, m + 1):
-            diag = matriz[i - 1][j - 1] + subst[seq1[i - 1]][seq2[j - 1]]
+            diag = matriz[i - 1][j - 1] + scores[codigos2[j - 1]]
             cima = matriz[i - 1][j] + space
             esquerda = matriz[i][j - 1] + space
             melhor = max(0, diag, cima, esquerda)
             matriz[i][j] = melhor
 
             if melhor == 0:
-                setas[i][j] = "STOP"
+                linha[j] = _STOP
             elif melhor == diag:
-                setas[i][j] = "↖"
+                linha[j] = _DIAG
             elif melhor == cima:
-                setas[i][j] = "↑"
+                linha[j] = _CIMA
             else:
-                setas[i][j] = "←"
+                linha[j] = _ESQ
+            if melhor > maximo:
+                maximo, inicio = melhor, (i, j)
+        setas.append(linha)
 
-    return matriz, setas
+    return matriz, _setas_de_linhas(setas, local=True, fim=inicio)
 
 
-def reconstruir_alinhamento(setas, seq1, seq2):
+def reconstruir_alinhamento(setas, seq1, seq2, matriz=None):
     """
-    Reconstrói o alinhamento global a partir da matriz de setas (Needleman-Wunsch).
+    Reconstrói o alinhamento a partir da matriz de setas.
+
+    Para setas de Needleman-Wunsch o caminho vai do canto inferior direito
+    até (0, 0). Para setas de Smith-Waterman (as de `smith_waterman`, que
+    guardam a célula inicial, ou qualquer matriz de setas acompanhada da
+    `matriz` de scores) o caminho começa na célula de score máximo e acaba
+    em "STOP", como em `reconstruir_alinhamento_local`.
 
     Args:
-        setas (list[list[str]]): Matriz de setas.
+        setas (list[list[str]] | SetasCompactas | numpy.ndarray): Matriz de
+            setas (ou índices em `SETAS`).
         seq1 (str): Primeira sequência.
         seq2 (str): Segunda sequência.
+        matriz (list[list[int]] | numpy.ndarray | None, optional): Matriz de
+            scores do alinhamento local.
 
     Returns:
         tuple[str, str]: Sequências alinhadas com gaps.
+
+    Raises:
+        ValueError: Se as setas forem strings de um alinhamento local (com
+            "STOP") sem a `matriz` de scores.
+
+    Example:
+        >>> matriz, setas = smith_waterman("TTACGTT", "GACGA")
+        >>> reconstruir_alinhamento(setas, "TTACGTT", "GACGA")
+        ('ACG', 'ACG')
     """
+    if matriz is not None or getattr(setas, "local", False):
+        return reconstruir_alinhamento_local(matriz, setas, seq1, seq2)
+    if isinstance(setas, list) and any("STOP" in linha for linha in setas):
+        raise ValueError("Setas locais em strings precisam da matriz de scores (matriz=)")
     i, j = len(seq1), len(seq2)
     a1, a2 = [], []
+    codificadas = not isinstance(setas, list)
 
     while i > 0 or j > 0:
-        direcao = setas[i][j]
+        direcao = SETAS[setas[i, j]] if codificadas else setas[i][j]
         if direcao == "↖":
             a1.append(seq1[i-1])
             a2.append(seq2[j-1])
@@ -410,8 +504,502 @@ def reconstruir_alinhamento(setas, seq1, seq2):
     return "".join(reversed(a1)), "".join(reversed(a2))
 
 
+def reconstruir_alinhamento_local(matriz, setas, seq1, seq2):
+    """
+    Reconstrói o alinhamento local a partir das matrizes de Smith-Waterman.
 
+    O caminho começa na célula de score máximo (a primeira, percorrendo a
+    matriz por linhas) e segue as setas até encontrar "STOP".
 
+    Args:
+        matriz (list[list[int]] | numpy.ndarray | None): Matriz de scores; pode
+            ser None se `setas` for uma `SetasCompactas` (que guarda a célula inicial).
+        setas (list[list[str]] | SetasCompactas | numpy.ndarray): Matriz de
+            setas (ou índices em `SETAS`).
+        seq1 (str): Primeira sequência.
+        seq2 (str): Segunda sequência.
+
+    Returns:
+        tuple[str, str]: Segmentos alinhados, com gaps.
+
+    Example:
+        >>> matriz, setas = smith_waterman("TTACGTT", "GACGA")
+        >>> reconstruir_alinhamento_local(matriz, setas, "TTACGTT", "GACGA")
+        ('ACG', 'ACG')
+    """
+    if matriz is None:
+        inicio = setas.fim
+    else:
+        matriz = np.asarray(matriz)
+        inicio = None
+        if matriz.size and matriz.max() > 0:
+            inicio = tuple(int(x) for x in np.unravel_index(np.argmax(matriz), matriz.shape))
+    if inicio is None:
+        return "", ""
+    i, j = inicio
+    codificadas = not isinstance(setas, list)
+    a1, a2 = [], []
+    while i > 0 and j > 0:
+        direcao = SETAS[setas[i, j]] if codificadas else setas[i][j]
+        if direcao == "↖":
+            a1.append(seq1[i - 1])
+            a2.append(seq2[j - 1])
+            i, j = i - 1, j - 1
+        elif direcao == "↑":
+            a1.append(seq1[i - 1])
+            a2.append("-")
+            i -= 1
+        elif direcao == "←":
+            a1.append("-")
+            a2.append(seq2[j - 1])
+            j -= 1
+        else:
+            break
+    return "".join(reversed(a1)), "".join(reversed(a2))
+
+
+#Needleman-Wunsch em espaço linear:
+# score com duas linhas + divisão e conquista para o alinhamento
+
+_NEG = -(1 << 60)
+_DIAG, _CIMA, _ESQ, _STOP, _VAZIO = 0, 1, 2, 3, 4
+SETAS = ("↖", "↑", "←", "STOP", "")
+_INDICE_SETA = {seta: k for k, seta in enumerate(SETAS)}
+_CELULAS_BLOCO = 1 << 20
+_PASSOS = {}
+
+
+def _codificar(seq1, seq2, subst):
+    """
+    Converte as sequências em índices e a matriz de substituição num array.
+
+    Com uma `MatrizSubstituicao` são usados diretamente os seus códigos e valores.
+
+    Returns:
+        tuple: (códigos de seq1, códigos de seq2, matriz int64 com
+        `subst[a][b]` na posição [código de a, código de b]).
+    """
+    if isinstance(subst, MatrizSubstituicao):
+        return subst.codificar(seq1), subst.codificar(seq2), subst.valores.astype(np.int64)
+    alfa1, alfa2 = sorted(set(seq1)), sorted(set(seq2))
+    matriz = np.array([[subst[a][b] for b in alfa2] for a in alfa1], dtype=np.int64).reshape(len(alfa1), len(alfa2))
+    return _indices(seq1, alfa1), _indices(seq2, alfa2), matriz
+
+
+def _indices(seq, alfabeto):
+    """Posição de cada símbolo de `seq` em `alfabeto` (tabela de 256 entradas para texto de 1 byte)."""
+    if all(ord(a) < 256 for a in alfabeto):
+        tabela = np.zeros(256, dtype=np.intp)
+        tabela[[ord(a) for a in alfabeto]] = np.arange(len(alfabeto))
+        return tabela[np.frombuffer(seq.encode("latin-1"), dtype=np.uint8)]
+    indice = {a: k for k, a in enumerate(alfabeto)}
+    return np.fromiter((indice[a] for a in seq), dtype=np.intp, count=len(seq))
+
+
+def _tabela_python(seq1, seq2, subst):
+    """Como `_codificar`, mas com listas (indexação mais rápida em ciclos Python)."""
+    codigos1, codigos2, matriz = _codificar(seq1, seq2, subst)
+    return codigos1.tolist(), codigos2.tolist(), matriz.tolist()
+
+
+def _linha_nw(anterior, esquerda, scores, space, com_setas=True):
+    """
+    Calcula uma linha da matriz de Needleman-Wunsch a partir da anterior.
+
+    A dependência da esquerda, F[j] = max(D[j], F[j-1] + space), é resolvida
+    com um máximo acumulado: F[j] = j*space + max_{k<=j}(D[k] - k*space).
+
+    Args:
+        anterior (numpy.ndarray): Linha anterior (colunas b..fim).
+        esquerda (int): Valor da nova linha na coluna b (fronteira).
+        scores (numpy.ndarray): Substituição de cada célula (colunas b+1..fim).
+        space (int): Penalidade de gap.
+        com_setas (bool, optional): Se False, não calcula as setas.
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray | None]: Nova linha e setas (_DIAG,
+        _CIMA, _ESQ) das colunas b+1..fim, com a mesma prioridade de `melhor_movimento`.
+    """
+    diag = anterior[:-1] + scores
+    cima = anterior[1:] + space
+    passos = _passos(len(anterior), space)
+    melhor = np.empty_like(anterior)
+    melhor[0] = esquerda
+    np.maximum(diag, cima, out=melhor[1:])
+    melhor -= passos
+    linha = np.maximum.accumulate(melhor, out=melhor)
+    linha += passos
+    if not com_setas:
+        return linha, None
+    setas = np.full(len(diag), _ESQ, dtype=np.uint8)
+    setas[linha[1:] == cima] = _CIMA
+    setas[linha[1:] == diag] = _DIAG
+    return linha, setas
+
+
+def _passos(n, space):
+    """Devolve [0, space, 2*space, ...] com n elementos (reutilizado entre linhas)."""
+    passos = _PASSOS.get(space)
+    if passos is None or len(passos) < n:
+        passos = _PASSOS[space] = np.arange(max(n, 1024), dtype=np.int64) * space
+    return passos[:n]
+
+
+def _pontuacao_linear(codigos1, codigos2, matriz, space):
+    linha = np.arange(len(codigos2) + 1, dtype=np.int64) * space
+    for i, a in enumerate(codigos1, 1):
+        linha, _ = _linha_nw(linha, i * space, matriz[a, codigos2], space, com_setas=False)
+    return int(linha[-1])
+
+
+def pontuacao_needleman_wunsch(seq1: str, seq2: str, match: int = 2, mismatch: int = -3, space: int = -4,
+                               subst=None):
+    """
+    Calcula apenas o score do alinhamento global, guardando duas linhas da matriz.
+
+    Usa O(len(seq2)) de memória em vez da matriz (n+1)x(m+1) de `needleman_wunsch`.
+
+    Args:
+        seq1 (str): Primeira sequência.
+        seq2 (str): Segunda sequência.
+        match (int, optional): Pontuação para match (DNA).
+        mismatch (int, optional): Pontuação para mismatch (DNA).
+        space (int, optional): Penalidade de gap.
+        subst (dict | MatrizSubstituicao | None, optional): Matriz de substituição.
+
+    Returns:
+        int: Score do alinhamento global (o valor da última célula de `needleman_wunsch`).
+
+    Example:
+        >>> pontuacao_needleman_wunsch("ACG", "AG")
+        0
+    """
+    if subst is None:
+        subst = escolha_de_matriz(seq1, seq2, match, mismatch)
+    return _pontuacao_linear(*_codificar(seq1, seq2, subst), space)
+
+
+class _Linear:
+    """
+    Reconstrução do alinhamento global em espaço linear (divisão e conquista).
+
+    Cada subproblema é o retângulo de linhas lo..hi e colunas b..fim, dado
+    pela linha de cima F[lo][b..fim] e pela coluna da esquerda F[lo+1..hi][b];
+    o objetivo é seguir as setas desde (hi, fim) até entrar na linha lo. A
+    linha do meio é calculada e, numa segunda passagem pelas linhas de baixo,
+    cada célula propaga a coluna onde o seu caminho de setas cruza a linha
+    do meio. Assim as setas seguidas são exatamente as de `needleman_wunsch`,
+    e o caminho divide o retângulo em dois subproblemas com metade da área.
+    """
+
+    def __init__(self, codigos1, codigos2, matriz, space):
+        self.codigos1 = codigos1
+        # Coluna virtual -1 antes da coluna 0, para a fronteira da raiz
+        # (com um símbolo extra de score 0, sempre dominado por _NEG).
+        self.matriz = np.pad(matriz, ((0, 0), (0, 1)))
+        self.codigos2 = np.concatenate(([matriz.shape[1]], codigos2)).astype(np.intp)
+        self.space = space
+
+    def _scores(self, i, b, fim):
+        return self.matriz[self.codigos1[i - 1], self.codigos2[b + 1:fim + 1]]
+
+    def resolver(self, lo, hi, b, fim, cima, esquerda):
+        """Devolve (movimentos por ordem, coluna onde o caminho entra na linha lo)."""
+        if hi - lo <= 1 or (hi - lo) * (fim - b + 1) <= _CELULAS_BLOCO:
+            return self._direto(lo, hi, b, fim, cima, esquerda)
+
+        mid = (lo + hi) // 2
+        linha = cima
+        for i in range(lo + 1, mid + 1):
+            linha, _ = _linha_nw(linha, esquerda[i - lo - 1], self._scores(i, b, fim), self.space, False)
+        linha_mid = linha
+
+        # Coluna onde o caminho de cada célula cruza a linha mid.
+        cruza = np.arange(b, fim + 1)
+        posicoes = np.arange(1, fim - b + 1)
+        for i in range(mid + 1, hi + 1):
+            linha, setas = _linha_nw(linha, esquerda[i - lo - 1], self._scores(i, b, fim), self.space)
+            valores = np.concatenate(([-1], np.where(setas == _DIAG, cruza[:-1], cruza[1:])))
+            origem = np.maximum.accumulate(np.concatenate(([0], np.where(setas != _ESQ, posicoes, 0))))
+            cruza = valores[origem]
+        c = int(cruza[-1])
+
+        # Fronteira do subproblema de baixo: linha mid e coluna c-1.
+        cima_baixo = linha_mid[c - 1 - b:]
+        esquerda_baixo = np.empty(hi - mid, dtype=np.int64)
+        linha = linha_mid[:c - b]
+        for i in range(mid + 1, hi + 1):
+            linha, _ = _linha_nw(linha, esquerda[i - lo - 1], self._scores(i, b, c - 1), self.space, False)
+            esquerda_baixo[i - mid - 1] = linha[-1]
+        del linha_mid, linha
+
+        movimentos_cima, entrada = self.resolver(lo, mid, b, c, cima[:c - b + 1], esquerda[:mid - lo])
+        movimentos_baixo, _ = self.resolver(mid, hi, c - 1, fim, cima_baixo, esquerda_baixo)
+        return movimentos_cima + movimentos_baixo, entrada
+
+    def _direto(self, lo, hi, b, fim, cima, esquerda):
+        setas = np.empty((hi - lo, fim - b), dtype=np.uint8)
+        linha = cima
+        for i in range(lo + 1, hi + 1):
+            linha, setas[i - lo - 1] = _linha_nw(linha, esquerda[i - lo - 1], self._scores(i, b, fim), self.space)
+        movimentos = []
+        i, j = hi, fim
+        while i > lo:
+            seta = setas[i - lo - 1, j - b - 1]
+            movimentos.append(seta)
+            if seta == _DIAG:
+                i, j = i - 1, j - 1
+            elif seta == _CIMA:
+                i -= 1
+            else:
+                j -= 1
+        movimentos.reverse()
+        return movimentos, j
+
+
+def needleman_wunsch_linear(seq1: str, seq2: str, match: int = 2, mismatch: int = -3, space: int = -4,
+                            subst=None):
+    """
+    Alinhamento global (Needleman-Wunsch) com memória O(n+m).
+
+    Devolve o mesmo alinhamento que `reconstruir_alinhamento` aplicado às
+    setas de `needleman_wunsch` (incluindo os desempates diagonal > cima >
+    esquerda), mas sem guardar as matrizes: cada linha é calculada com
+    arrays NumPy a partir da anterior e o caminho é encontrado por divisão
+    e conquista (Hirschberg), recalculando as linhas necessárias. Só blocos
+    pequenos (até ~1 milhão de células) guardam as setas.
+
+    Args:
+        seq1 (str): Primeira sequência.
+        seq2 (str): Segunda sequência.
+        match (int, optional): Pontuação para match (DNA).
+        mismatch (int, optional): Pontuação para mismatch (DNA).
+        space (int, optional): Penalidade de gap.
+        subst (dict | MatrizSubstituicao | None, optional): Matriz de substituição.
+
+    Returns:
+        tuple[str, str]: Sequências alinhadas com gaps.
+
+    Example:
+        >>> needleman_wunsch_linear("ACG", "AG")
+        ('ACG', 'A-G')
+    """
+    if subst is None:
+        subst = escolha_de_matriz(seq1, seq2, match, mismatch)
+    return _alinhar_linear(seq1, seq2, subst, space)
+
+
+def _alinhar_linear(seq1, seq2, subst, space):
+    n, m = len(seq1), len(seq2)
+    motor = _Linear(*_codificar(seq1, seq2, subst), space)
+    cima = np.concatenate(([_NEG], np.arange(m + 1, dtype=np.int64) * space))
+    movimentos, entrada = motor.resolver(0, n, -1, m, cima, np.full(n, _NEG, dtype=np.int64))
+
+    # Na linha 0 todas as setas são "←".
+    a1, a2 = ["-"] * entrada, list(seq2[:entrada])
+    i, j = 0, entrada
+    for movimento in movimentos:
+        if movimento == _DIAG:
+            a1.append(seq1[i])
+            a2.append(seq2[j])
+            i, j = i + 1, j + 1
+        elif movimento == _CIMA:
+            a1.append(seq1[i])
+            a2.append("-")
+            i += 1
+        else:
+            a1.append("-")
+            a2.append(seq2[j])
+            j += 1
+    return "".join(a1), "".join(a2)
+
+#Motor NumPy (matrizes completas):
+# mesmas matrizes e setas que as versões em Python, calculadas por linhas
+
+class SetasCompactas:
+    """
+    Matriz de setas guardada com 2 bits por célula (4 células por byte).
+
+    Cada célula guarda o índice da seta em `SETAS` (0 = "↖", 1 = "↑",
+    2 = "←", 3 = "STOP"); na primeira linha e coluna, "STOP" representa as
+    células sem seta. Indexar com `setas[i, j]` devolve esse índice;
+    `texto()` devolve as setas como strings, só para mostrar (ex.:
+    `imprimir_grid`). `fim` é a célula onde começa a reconstrução: o canto
+    inferior direito no alinhamento global e a (primeira) célula de score
+    máximo no local (None se nenhum score for positivo).
+
+    Example:
+        >>> matriz, setas = smith_waterman("TTACGTT", "GACGA", backend="numpy")
+        >>> setas.fim, setas.nbytes
+        ((5, 4), 16)
+        >>> reconstruir_alinhamento(setas, "TTACGTT", "GACGA")
+        ('ACG', 'ACG')
+    """
+
+    __slots__ = ("bits", "shape", "local", "fim")
+
+    _DESLOCAMENTOS = np.arange(0, 8, 2, dtype=np.uint8)
+    # Byte com os bits b0..b7 -> inteiro de 16 bits com os mesmos bits nas posições pares.
+    _INTERCALAR = sum(((np.arange(256) >> k) & 1) << (2 * k) for k in range(8)).astype("<u2")
+
+    def __init__(self, bits, shape, local=False, fim=None):
+        self.bits = bits
+        self.shape = shape
+        self.local = local
+        self.fim = fim
+
+    @staticmethod
+    def empacotar(codigos):
+        """
+        Junta os índices de setas (array uint8 com valores 0..3) 4 a 4 em bytes.
+
+        Args:
+            codigos (numpy.ndarray): Array 2D de índices em `SETAS`.
+
+        Returns:
+            numpy.ndarray: Array uint8 com ceil(colunas/4) bytes por linha.
+        """
+        codigos = np.asarray(codigos, dtype=np.uint8)
+        return SetasCompactas._juntar((codigos & 1).astype(bool), (codigos & 2).astype(bool))
+
+    @staticmethod
+    def _juntar(baixo, alto):
+        """Empacota os bits baixo e alto de cada célula: a célula j fica nos bits 2j e 2j+1 da linha."""
+        intercalar = SetasCompactas._INTERCALAR
+        palavras = intercalar[np.packbits(baixo, axis=1, bitorder="little")]
+        palavras |= intercalar[np.packbits(alto, axis=1, bitorder="little")] << 1
+        return palavras.view(np.uint8)[:, :(baixo.shape[1] + 3) // 4]
+
+    @classmethod
+    def de_codigos(cls, codigos, local=False, fim=None):
+        """Cria a matriz compacta a partir de um array uint8 de índices em `SETAS`."""
+        codigos = np.asarray(codigos, dtype=np.uint8)
+        return cls(cls.empacotar(np.minimum(codigos, _STOP)), codigos.shape, local, fim)
+
+    @property
+    def nbytes(self):
+        return self.bits.nbytes
+
+    def __getitem__(self, celula):
+        i, j = celula
+        return (int(self.bits[i, j >> 2]) >> ((j & 3) << 1)) & 3
+
+    def __eq__(self, outra):
+        if not isinstance(outra, SetasCompactas):
+            return NotImplemented
+        return ((tuple(self.shape), self.local, self.fim) == (tuple(outra.shape), outra.local, outra.fim)
+                and np.array_equal(self.bits, outra.bits))
+
+    def codigos(self):
+        """Array uint8 (uma célula por byte) com o índice de cada seta em `SETAS`."""
+        codigos = (self.bits[:, :, None] >> self._DESLOCAMENTOS) & 3
+        return codigos.reshape(self.shape[0], -1)[:, :self.shape[1]]
+
+    def __array__(self, dtype=None, copy=None):
+        codigos = self.codigos()
+        return codigos if dtype is None else codigos.astype(dtype)
+
+    def texto(self):
+        """
+        Setas como listas de strings, iguais às do backend "python".
+
+        Returns:
+            list[list[str]]: "↖", "↑", "←", "STOP" ou "" (células sem seta).
+        """
+        codigos = self.codigos().copy()
+        for borda in (codigos[0], codigos[:, 0]):
+            borda[borda == _STOP] = _VAZIO
+        return [[SETAS[c] for c in linha] for linha in codigos.tolist()]
+
+
+def _setas_de_linhas(linhas, local=False, fim=None):
+    """Empacota as setas do backend "python" (uma `bytearray` de índices em `SETAS` por linha)."""
+    codigos = np.frombuffer(b"".join(linhas), dtype=np.uint8).reshape(len(linhas), -1)
+    return SetasCompactas.de_codigos(codigos, local, fim)
+
+
+BACKENDS = ("python", "numpy")
+
+
+def _usar_numpy(backend):
+    if backend not in BACKENDS:
+        raise ValueError(f"backend desconhecido: {backend!r} (use {' ou '.join(BACKENDS)})")
+    return backend == "numpy"
+
+
+def _matrizes_numpy(seq1, seq2, subst, space, local=False):
+    """
+    Calcula a matriz de scores (int32) e a matriz de setas (uint8) com NumPy.
+
+    Cada linha é obtida da anterior com operações vetoriais sobre todas as
+    colunas: a dependência da esquerda, F[j] = max(D[j], F[j-1] + space), é
+    resolvida com um máximo acumulado, F[j] = j*space + max_{k<=j}(D[k] - k*space),
+    onde D[j] = max(diag, cima) (e 0, no alinhamento local). Os scores de
+    substituição de cada símbolo de `seq1` contra `seq2` (perfil da query)
+    são calculados uma única vez. As setas são depois obtidas por blocos de
+    linhas, com a mesma prioridade das versões em Python.
+
+    Returns:
+        tuple[numpy.ndarray, SetasCompactas]: (matriz, setas), com as setas
+        guardadas com 2 bits por célula.
+    """
+    n, m = len(seq1), len(seq2)
+    codigos1, codigos2, matriz_subst = _codificar(seq1, seq2, subst)
+    perfil = matriz_subst[:, codigos2].astype(np.int32)
+    passos = np.arange(m + 1, dtype=np.int32) * np.int32(space)
+
+    # Durante o ciclo guarda-se G[i][j] = F[i][j] - j*space: a seta "←" passa
+    # a ser G[j-1] e cada linha fica G = max.accumulate(max(diag', cima')).
+    matriz = np.zeros((n + 1, m + 1), dtype=np.int32)
+    setas = np.empty((n + 1, (m + 4) // 4), dtype=np.uint8)
+    negativos = -passos
+    if local:
+        matriz[0] = negativos
+    else:
+        matriz[:, 0] = np.arange(n + 1, dtype=np.int32) * np.int32(space)
+    perfil_g = perfil - np.int32(space)
+    cima = np.empty(m, dtype=np.int32)
+    for i in range(1, n + 1):
+        anterior, linha = matriz[i - 1], matriz[i]
+        np.add(anterior[:-1], perfil_g[codigos1[i - 1]], out=linha[1:])
+        np.add(anterior[1:], space, out=cima)
+        np.maximum(linha[1:], cima, out=linha[1:])
+        if local:
+            np.maximum(linha, negativos, out=linha)
+        np.maximum.accumulate(linha, out=linha)
+    matriz += passos
+
+    primeira = np.full((1, m + 1), _STOP if local else _ESQ, dtype=np.uint8)
+    primeira[0, 0] = _STOP
+    setas[:1] = SetasCompactas.empacotar(primeira)
+    bloco = max(1, (1 << 18) // (m + 1))
+    # Bits baixo e alto de cada seta: 0 = diagonal, 1 = cima, 2 = esquerda,
+    # 3 = STOP (ver SETAS).
+    baixos = np.empty((bloco, m + 1), dtype=bool)
+    altos = np.empty((bloco, m + 1), dtype=bool)
+    baixos[:, 0], altos[:, 0] = True, local
+    for i in range(1, n + 1, bloco):
+        fim = min(i + bloco, n + 1)
+        valores = matriz[i:fim, 1:]
+        diag = matriz[i - 1:fim - 1, :-1] + perfil[codigos1[i - 1:fim - 1]]
+        cima = matriz[i - 1:fim - 1, 1:] + np.int32(space)
+        baixo, alto = baixos[:fim - i, 1:], altos[:fim - i, 1:]
+        np.not_equal(valores, diag, out=baixo)
+        np.not_equal(valores, cima, out=alto)
+        alto &= baixo
+        baixo ^= alto
+        if local:
+            zeros = valores == 0
+            baixo |= zeros
+            alto |= zeros
+        setas[i:fim] = SetasCompactas._juntar(baixos[:fim - i], altos[:fim - i])
+
+    inicio = (n, m)
+    if local:
+        inicio = None
+        if matriz.size and matriz.max() > 0:
+            inicio = tuple(int(x) for x in np.unravel_index(np.argmax(matriz), matriz.shape))
+    return matriz, SetasCompactas(setas, (n + 1, m + 1), local, inicio)
 
 
 #Alinhamento progressivo (múltiplo):
@@ -465,15 +1053,16 @@ def melhor_movimento(diag: int, cima: int, esquerda: int) -> tuple[int, str]:
     return melhor, "←"
 
 
-def alinhar_par(seq1: str, seq2: str, subst: dict, space: int):
+def alinhar_par(seq1: str, seq2: str, subst: dict, space: int, backend: str = "python"):
     """
     Realiza um alinhamento simples entre duas sequências.
 
     Args:
         seq1 (str): Primeira sequência.
         seq2 (str): Segunda sequência.
-        subst (dict): Matriz de substituição.
+        subst (dict | MatrizSubstituicao): Matriz de substituição.
         space (int): Penalidade de gap.
+        backend (str, optional): "python" ou "numpy" (mesmo resultado, mais rápido).
 
     Returns:
         tuple[str, str]: Sequências alinhadas.
@@ -483,6 +1072,8 @@ def alinhar_par(seq1: str, seq2: str, subst: dict, space: int):
         >>> alinhar_par("ACG", "AG", subst, -2)
         ('ACG', 'A-G')
     """
+    if _usar_numpy(backend):
+        return reconstruir_alinhamento(_matrizes_numpy(seq1, seq2, subst, space)[1], seq1, seq2)
     matriz = [[0 for _ in range(len(seq2) + 1)] for _ in range(len(seq1) + 1)]
     setas = [["" for _ in range(len(seq2) + 1)] for _ in range(len(seq1) + 1)]
 
@@ -494,9 +1085,11 @@ def alinhar_par(seq1: str, seq2: str, subst: dict, space: int):
         matriz[0][j + 1] = matriz[0][j] + space
         setas[0][j + 1] = "←"
 
-    for i, a in enumerate(seq1):
-        for j, b in enumerate(seq2):
-            diag = matriz[i][j] + subst[a][b]
+    codigos1, codigos2, tabela = _tabela_python(seq1, seq2, subst)
+    for i, a in enumerate(codigos1):
+        scores = tabela[a]
+        for j, b in enumerate(codigos2):
+            diag = matriz[i][j] + scores[b]
             cima = matriz[i][j + 1] + space
             esquerda = matriz[i + 1][j] + space
 
@@ -507,10 +1100,630 @@ def alinhar_par(seq1: str, seq2: str, subst: dict, space: int):
     return reconstruir_alinhamento(setas, seq1, seq2)
 
 
+def alinhar_local(seq1: str, seq2: str, subst: dict, space: int):
+    """
+    Alinhamento local (Smith-Waterman) com uma matriz de substituição dada.
+
+    Usa o motor NumPy e `reconstruir_alinhamento_local`.
+
+    Args:
+        seq1 (str): Primeira sequência.
+        seq2 (str): Segunda sequência.
+        subst (dict | MatrizSubstituicao): Matriz de substituição.
+        space (int): Penalidade de gap.
+
+    Returns:
+        tuple[str, str, int]: Segmentos alinhados e score do alinhamento local.
+
+    Example:
+        >>> alinhar_local("TTACGTT", "GACGA", matriz_substituição_dna(2, -3), -4)
+        ('ACG', 'ACG', 6)
+    """
+    matriz, setas = _matrizes_numpy(seq1, seq2, subst, space, local=True)
+    a1, a2 = reconstruir_alinhamento_local(matriz, setas, seq1, seq2)
+    return a1, a2, int(matriz.max(initial=0))
+
+
+MODOS = ("global", "local")
+
+# Operações CIGAR pelos índices das setas: ↖ = "M", ↑ = "I" (só seq1), ← = "D" (só seq2).
+_CIGAR = "MID"
+
+
+def _caminho(setas, i, j, local):
+    """
+    Operações (índices em `_CIGAR`) do caminho de setas que acaba em (i, j).
+
+    Returns:
+        tuple: (célula inicial (i, j), lista das operações pela ordem do alinhamento).
+    """
+    codificadas = not isinstance(setas, list)
+    operacoes = []
+    while i > 0 and j > 0 or not local and (i > 0 or j > 0):
+        direcao = SETAS[setas[i, j]] if codificadas else setas[i][j]
+        if direcao not in ("↖", "↑", "←"):
+            if local:
+                break
+            # Início da matriz ou setas vazias (alinhamento global).
+            direcao = "↑" if i > 0 else "←"
+        operacao = SETAS.index(direcao)
+        operacoes.append(operacao)
+        i -= operacao != _ESQ
+        j -= operacao != _CIMA
+    return (i, j), operacoes[::-1]
+
+
+class Alinhamento:
+    """
+    Resultado de um alinhamento de pares, guardado como CIGAR.
+
+    Guarda só o score, as posições onde o alinhamento começa em cada
+    sequência e as operações em run-length (CIGAR: "M" = coluna com os dois
+    símbolos, "I" = símbolo só de `seq1`, "D" = símbolo só de `seq2`),
+    empacotadas em `bytes` (um inteiro de 32 bits por run, comprimento << 2 |
+    operação). As sequências não são copiadas: `seq1` e `seq2` são as
+    referências dadas, partilhadas por todos os resultados que as usam. As
+    sequências com gaps, a identidade e as colunas são construídas só
+    quando pedidas, em vez de duas strings com gaps por alinhamento.
+
+    Cada instância ocupa ainda 140 a 210 bytes (o objeto, os `bytes` do
+    CIGAR e os inteiros), ou seja, 140 a 210 MB por milhão de resultados;
+    para guardar muitos resultados use `Alinhamentos`, que os guarda em
+    colunas (uns 40 bytes por resultado).
+
+    Args:
+        seq1 (str): Primeira sequência (completa).
+        seq2 (str): Segunda sequência (completa).
+        score (int): Score do alinhamento.
+        cigar (str | Iterable[tuple[int, str]]): CIGAR em texto ("3M1D2M")
+            ou pares (comprimento, operação).
+        inicio1 (int, optional): Posição (0-based) do início em `seq1`.
+        inicio2 (int, optional): Posição (0-based) do início em `seq2`.
+
+    Raises:
+        ValueError: Se o CIGAR tiver operações desconhecidas ou sair das sequências.
+
+    Example:
+        >>> aln = alinhar("TTACGTT", "GACGA", modo="local")
+        >>> aln.score, aln.inicio1, aln.fim1, aln.inicio2, aln.fim2, aln.cigar_texto()
+        (6, 2, 5, 1, 4, '3M')
+        >>> alinhar("ACGTT", "AGTT").linhas()
+        ('ACGTT', 'A-GTT')
+    """
+
+    __slots__ = ("seq1", "seq2", "score", "inicio1", "inicio2", "_cigar")
+
+    def __init__(self, seq1: str, seq2: str, score: int, cigar, inicio1: int = 0, inicio2: int = 0):
+        if isinstance(cigar, str):
+            partes = re.findall(r"(\d+)(\D)", cigar)
+            if "".join(c + o for c, o in partes) != cigar:
+                raise ValueError(f"CIGAR inválido: {cigar!r}")
+            cigar = [(int(c), o) for c, o in partes]
+        runs = []
+        for comprimento, operacao in cigar:
+            if operacao not in _CIGAR:
+                raise ValueError(f"Operação CIGAR desconhecida: {operacao!r} (use {' ou '.join(_CIGAR)})")
+            if comprimento > 0:
+                runs.append(comprimento << 2 | _CIGAR.index(operacao))
+        self.seq1, self.seq2, self.score = seq1, seq2, score
+        self.inicio1, self.inicio2 = inicio1, inicio2
+        self._cigar = np.array(runs, dtype="<u4").tobytes()
+        if self.fim1 > len(seq1) or self.fim2 > len(seq2):
+            raise ValueError("O CIGAR sai das sequências")
+
+    @classmethod
+    def _de_operacoes(cls, seq1, seq2, score, operacoes, inicio1=0, inicio2=0):
+        """Cria o alinhamento a partir da lista de operações, coluna a coluna."""
+        alinhamento = cls(seq1, seq2, score, (), inicio1, inicio2)
+        operacoes = np.asarray(operacoes, dtype=np.uint32)
+        if len(operacoes):
+            cortes = np.flatnonzero(np.diff(operacoes)) + 1
+            inicios = np.concatenate(([0], cortes))
+            comprimentos = np.diff(np.concatenate((inicios, [len(operacoes)]))).astype(np.uint32)
+            alinhamento._cigar = (comprimentos << 2 | operacoes[inicios]).astype("<u4").tobytes()
+        return alinhamento
+
+    @classmethod
+    def de_setas(cls, setas, seq1: str, seq2: str, score: int, matriz=None):
+        """
+        Cria o alinhamento seguindo as setas, sem construir as strings com gaps.
+
+        O caminho é o de `reconstruir_alinhamento` (ou de
+        `reconstruir_alinhamento_local`, para setas de Smith-Waterman).
+
+        Args:
+            setas (list[list[str]] | SetasCompactas | numpy.ndarray): Matriz de setas.
+            seq1 (str): Primeira sequência.
+            seq2 (str): Segunda sequência.
+            score (int): Score do alinhamento.
+            matriz (list[list[int]] | numpy.ndarray | None, optional): Matriz de
+                scores do alinhamento local.
+
+        Returns:
+            Alinhamento: O alinhamento.
+        """
+        local = matriz is not None or getattr(setas, "local", False)
+        if not local:
+            fim = (len(seq1), len(seq2))
+        elif matriz is None:
+            fim = setas.fim
+        else:
+            matriz = np.asarray(matriz)
+            fim = None
+            if matriz.size and matriz.max() > 0:
+                fim = tuple(int(x) for x in np.unravel_index(np.argmax(matriz), matriz.shape))
+        if fim is None:
+            return cls(seq1, seq2, score, ())
+        (i, j), operacoes = _caminho(setas, *fim, local)
+        return cls._de_operacoes(seq1, seq2, score, operacoes, i, j)
+
+    @classmethod
+    def de_strings(cls, a1: str, a2: str, score: int, seq1: str = None, seq2: str = None,
+                   inicio1: int = 0, inicio2: int = 0):
+        """
+        Cria o alinhamento a partir de duas sequências com gaps.
+
+        Args:
+            a1 (str): Primeira sequência alinhada.
+            a2 (str): Segunda sequência alinhada.
+            score (int): Score do alinhamento.
+            seq1 (str | None, optional): Sequência completa de que `a1` é um
+                segmento (por omissão, `a1` sem gaps).
+            seq2 (str | None, optional): Idem para `a2`.
+            inicio1 (int, optional): Início do segmento em `seq1`.
+            inicio2 (int, optional): Início do segmento em `seq2`.
+
+        Returns:
+            Alinhamento: O alinhamento.
+
+        Raises:
+            ValueError: Se as sequências alinhadas tiverem comprimentos
+                diferentes ou uma coluna só com gaps.
+        """
+        if len(a1) != len(a2):
+            raise ValueError("As sequências alinhadas têm de ter o mesmo comprimento")
+        gaps1 = np.frombuffer(a1.encode("utf-32-le"), dtype="<u4") == ord("-")
+        gaps2 = np.frombuffer(a2.encode("utf-32-le"), dtype="<u4") == ord("-")
+        if (gaps1 & gaps2).any():
+            raise ValueError("Coluna só com gaps")
+        operacoes = np.where(gaps1, _ESQ, np.where(gaps2, _CIMA, _DIAG))
+        seq1 = a1.replace("-", "") if seq1 is None else seq1
+        seq2 = a2.replace("-", "") if seq2 is None else seq2
+        return cls._de_operacoes(seq1, seq2, score, operacoes, inicio1, inicio2)
+
+    @property
+    def cigar(self):
+        """numpy.ndarray: Runs do CIGAR (uint32, comprimento << 2 | índice em "MID"), sem cópia."""
+        return np.frombuffer(self._cigar, dtype="<u4")
+
+    def operacoes(self):
+        """
+        Runs do CIGAR como pares.
+
+        Returns:
+            list[tuple[int, str]]: (comprimento, operação) de cada run.
+        """
+        return [(run >> 2, _CIGAR[run & 3]) for run in self.cigar.tolist()]
+
+    def cigar_texto(self):
+        """str: CIGAR em texto (ex.: "3M1D2M")."""
+        return "".join(f"{comprimento}{operacao}" for comprimento, operacao in self.operacoes())
+
+    def _consumidos(self, excluida):
+        cigar = self.cigar
+        return int((cigar >> 2)[(cigar & 3) != excluida].sum())
+
+    @property
+    def fim1(self):
+        """int: Posição (exclusiva) do fim em `seq1`."""
+        return self.inicio1 + self._consumidos(_ESQ)
+
+    @property
+    def fim2(self):
+        """int: Posição (exclusiva) do fim em `seq2`."""
+        return self.inicio2 + self._consumidos(_CIMA)
+
+    def __len__(self):
+        """Número de colunas do alinhamento."""
+        return int((self.cigar >> 2).sum())
+
+    def linhas(self):
+        """
+        Constrói as sequências alinhadas, com gaps.
+
+        Returns:
+            tuple[str, str]: Os segmentos alinhados (como `alinhar_par` ou
+            `alinhar_local`).
+        """
+        i, j = self.inicio1, self.inicio2
+        a1, a2 = [], []
+        for comprimento, operacao in self.operacoes():
+            if operacao == "D":
+                a1.append("-" * comprimento)
+            else:
+                a1.append(self.seq1[i:i + comprimento])
+                i += comprimento
+            if operacao == "I":
+                a2.append("-" * comprimento)
+            else:
+                a2.append(self.seq2[j:j + comprimento])
+                j += comprimento
+        return "".join(a1), "".join(a2)
+
+    def colunas(self):
+        """
+        Posições de cada coluna nas duas sequências.
+
+        Returns:
+            tuple[numpy.ndarray, numpy.ndarray]: Para cada coluna, a posição
+            (0-based) do símbolo de `seq1` e de `seq2`, ou -1 num gap.
+        """
+        cigar = self.cigar
+        operacoes = np.repeat(cigar & 3, cigar >> 2)
+        posicoes = []
+        for inicio, excluida in ((self.inicio1, _ESQ), (self.inicio2, _CIMA)):
+            presentes = operacoes != excluida
+            posicoes.append(np.where(presentes, inicio + np.cumsum(presentes) - 1, -1))
+        return tuple(posicoes)
+
+    def identicos(self):
+        """int: Número de colunas com o mesmo símbolo nas duas sequências."""
+        total, i, j = 0, self.inicio1, self.inicio2
+        for comprimento, operacao in self.operacoes():
+            if operacao == "M":
+                a = np.frombuffer(self.seq1[i:i + comprimento].encode("utf-32-le"), dtype="<u4")
+                b = np.frombuffer(self.seq2[j:j + comprimento].encode("utf-32-le"), dtype="<u4")
+                total += int(np.count_nonzero(a == b))
+            i += comprimento * (operacao != "D")
+            j += comprimento * (operacao != "I")
+        return total
+
+    def identidade(self):
+        """
+        Fração das colunas com símbolos idênticos.
+
+        Returns:
+            float: Colunas idênticas / colunas do alinhamento (0.0 se vazio).
+        """
+        colunas = len(self)
+        return self.identicos() / colunas if colunas else 0.0
+
+    def __repr__(self):
+        return (f"Alinhamento(score={self.score}, seq1[{self.inicio1}:{self.fim1}], "
+                f"seq2[{self.inicio2}:{self.fim2}], cigar={self.cigar_texto()!r})")
+
+
+def alinhar(seq1: str, seq2: str, match: int = 2, mismatch: int = -3, space: int = -4,
+            modo: str = "global", subst=None):
+    """
+    Alinha duas sequências e devolve um `Alinhamento` (score, posições e CIGAR).
+
+    Usa o motor NumPy (`needleman_wunsch`/`smith_waterman` com
+    `backend="numpy"`) e segue as setas diretamente para o CIGAR, sem
+    construir as sequências com gaps.
+
+    Args:
+        seq1 (str): Primeira sequência.
+        seq2 (str): Segunda sequência.
+        match (int, optional): Pontuação para match (DNA).
+        mismatch (int, optional): Pontuação para mismatch (DNA).
+        space (int, optional): Penalidade de gap.
+        modo (str, optional): "global" (Needleman-Wunsch) ou "local" (Smith-Waterman).
+        subst (dict | MatrizSubstituicao | None, optional): Matriz de substituição.
+
+    Returns:
+        Alinhamento: O alinhamento ótimo.
+
+    Raises:
+        ValueError: Se o modo for desconhecido.
+
+    Example:
+        >>> alinhar("ACGTT", "AGTT")
+        Alinhamento(score=4, seq1[0:5], seq2[0:4], cigar='1M1I3M')
+    """
+    if modo not in MODOS:
+        raise ValueError(f"Modo desconhecido: {modo!r} (use {' ou '.join(MODOS)})")
+    if subst is None:
+        subst = escolha_de_matriz(seq1, seq2, match, mismatch)
+    local = modo == "local"
+    matriz, setas = _matrizes_numpy(seq1, seq2, subst, space, local=local)
+    score = int(matriz.max(initial=0)) if local else int(matriz[-1, -1])
+    return Alinhamento.de_setas(setas, seq1, seq2, score)
+
+
+def _crescer(array, minimo):
+    """Cópia de `array` com pelo menos `minimo` linhas (o dobro, para crescer amortizado)."""
+    novo = np.zeros((max(minimo, 2 * len(array)),) + array.shape[1:], dtype=array.dtype)
+    novo[:len(array)] = array
+    return novo
+
+
+class Alinhamentos:
+    """
+    Coleção de resultados de alinhamentos de pares, guardada em colunas.
+
+    Em vez de um objeto `Alinhamento` por resultado, guarda arrays NumPy:
+    os runs de todos os CIGAR concatenados (uint32, como em
+    `Alinhamento.cigar`) com o deslocamento de cada resultado, o score
+    (int64), as posições de início (int32) e os índices das duas
+    sequências numa lista partilhada (`sequencias`, onde cada referência
+    aparece uma só vez). Cada resultado ocupa assim 32 bytes mais 4 por
+    run do CIGAR (uns 40 a 50 MB por milhão de alinhamentos curtos); os
+    arrays crescem para o dobro quando enchem e `de_alinhamentos` ajusta-os
+    ao tamanho final. `colecao[k]` devolve o k-ésimo resultado como um
+    `Alinhamento`, construído na altura.
+
+    Example:
+        >>> colecao = Alinhamentos.de_alinhamentos([alinhar("ACGTT", "AGTT"), alinhar("ACG", "ACG")])
+        >>> len(colecao), colecao.scores.tolist()
+        (2, [4, 6])
+        >>> colecao[0]
+        Alinhamento(score=4, seq1[0:5], seq2[0:4], cigar='1M1I3M')
+    """
+
+    __slots__ = ("sequencias", "_posicao_seq", "_n", "_scores", "_inicios", "_seqs", "_deslocamentos", "_runs")
+
+    def __init__(self):
+        self.sequencias = []
+        # id(sequência) -> índice em `sequencias` (que mantém a referência viva).
+        self._posicao_seq = {}
+        self._n = 0
+        self._scores = np.zeros(0, dtype=np.int64)
+        self._inicios = np.zeros((0, 2), dtype=np.int32)
+        self._seqs = np.zeros((0, 2), dtype=np.int32)
+        self._deslocamentos = np.zeros(1, dtype=np.int64)
+        self._runs = np.zeros(0, dtype="<u4")
+
+    @classmethod
+    def de_alinhamentos(cls, alinhamentos):
+        """
+        Cria a coleção a partir de resultados já calculados.
+
+        Args:
+            alinhamentos (Iterable[Alinhamento]): Os resultados.
+
+        Returns:
+            Alinhamentos: A coleção, com os arrays no tamanho exato.
+        """
+        colecao = cls()
+        for alinhamento in alinhamentos:
+            colecao.adicionar(alinhamento)
+        colecao._ajustar()
+        return colecao
+
+    def _indice_sequencia(self, seq):
+        indice = self._posicao_seq.get(id(seq))
+        if indice is None:
+            indice = self._posicao_seq[id(seq)] = len(self.sequencias)
+            self.sequencias.append(seq)
+        return indice
+
+    def adicionar(self, alinhamento: Alinhamento):
+        """
+        Acrescenta um resultado (o `Alinhamento` dado pode ser descartado a seguir).
+
+        Args:
+            alinhamento (Alinhamento): O resultado.
+        """
+        k = self._n
+        runs = alinhamento.cigar
+        fim = int(self._deslocamentos[k]) + len(runs)
+        if k == len(self._scores):
+            self._scores = _crescer(self._scores, k + 1)
+            self._inicios = _crescer(self._inicios, k + 1)
+            self._seqs = _crescer(self._seqs, k + 1)
+            self._deslocamentos = _crescer(self._deslocamentos, k + 2)
+        if fim > len(self._runs):
+            self._runs = _crescer(self._runs, fim)
+        self._runs[self._deslocamentos[k]:fim] = runs
+        self._deslocamentos[k + 1] = fim
+        self._scores[k] = alinhamento.score
+        self._inicios[k] = alinhamento.inicio1, alinhamento.inicio2
+        self._seqs[k] = self._indice_sequencia(alinhamento.seq1), self._indice_sequencia(alinhamento.seq2)
+        self._n = k + 1
+
+    def _ajustar(self):
+        """Corta os arrays ao número de resultados guardados."""
+        n = self._n
+        self._scores = self._scores[:n].copy()
+        self._inicios = self._inicios[:n].copy()
+        self._seqs = self._seqs[:n].copy()
+        self._deslocamentos = self._deslocamentos[:n + 1].copy()
+        self._runs = self._runs[:self._deslocamentos[n]].copy()
+
+    def __len__(self):
+        return self._n
+
+    def __getitem__(self, k):
+        if k < 0:
+            k += self._n
+        if not 0 <= k < self._n:
+            raise IndexError("Índice de alinhamento fora da coleção")
+        alinhamento = Alinhamento.__new__(Alinhamento)
+        i, j = self._seqs[k].tolist()
+        alinhamento.seq1, alinhamento.seq2 = self.sequencias[i], self.sequencias[j]
+        alinhamento.score = int(self._scores[k])
+        alinhamento.inicio1, alinhamento.inicio2 = self._inicios[k].tolist()
+        alinhamento._cigar = self._runs[self._deslocamentos[k]:self._deslocamentos[k + 1]].tobytes()
+        return alinhamento
+
+    def __iter__(self):
+        return (self[k] for k in range(self._n))
+
+    @property
+    def scores(self):
+        """numpy.ndarray: Score de cada resultado (int64), sem cópia."""
+        return self._scores[:self._n]
+
+    @property
+    def nbytes(self):
+        """int: Bytes ocupados pelos arrays (sem a lista de sequências)."""
+        arrays = (self._scores, self._inicios, self._seqs, self._deslocamentos, self._runs)
+        return sum(array.nbytes for array in arrays)
+
+
+class AlinhamentoMultiplo:
+    """
+    Alinhamento múltiplo construído por adição de sequências a um perfil de colunas.
+
+    Em vez das linhas alinhadas, guarda um perfil de contagens (array
+    colunas x alfabeto) e, para cada linha, a sequência sem gaps e as
+    colunas dos seus resíduos no momento em que foi adicionada (os gaps
+    são as restantes). Cada adição regista só onde as colunas antigas
+    ficaram no alinhamento novo (as outras são colunas de gaps inseridas):
+    o perfil é atualizado com esse mapa e com a nova linha, sem refazer as
+    linhas anteriores. As linhas são materializadas só quando lidas,
+    compondo os mapas das adições seguintes.
+
+    O consenso é o símbolo mais frequente de cada coluna; em caso de
+    empate, o que aparece primeiro na coluna (como em `consenso`).
+
+    Example:
+        >>> msa = AlinhamentoMultiplo("ACG")
+        >>> msa.adicionar("AC", matriz_substituição_dna(2, -1), -2)
+        >>> msa.adicionar("AG", matriz_substituição_dna(2, -1), -2)
+        >>> msa.linhas(), msa.consenso()
+        (['ACG', 'AC-', 'A-G'], 'ACG')
+    """
+
+    __slots__ = ("alfabeto", "_indice", "contagens", "_primeira", "_linhas", "_mapas")
+
+    def __init__(self, seq: str = None):
+        self.alfabeto = []
+        self._indice = {}
+        # contagens[c, a]: número de linhas com o símbolo alfabeto[a] na coluna c;
+        # _primeira[c, a]: primeira linha onde esse símbolo aparece na coluna.
+        self.contagens = np.zeros((0, 0), dtype=np.int64)
+        self._primeira = np.zeros((0, 0), dtype=np.int64)
+        self._linhas = []
+        self._mapas = []
+        if seq is not None:
+            self._acrescentar(seq, np.arange(len(seq)), len(seq))
+
+    @classmethod
+    def de_alinhamento(cls, alinhamento: list[str]):
+        """
+        Cria o perfil a partir de sequências já alinhadas (com "-").
+
+        Raises:
+            ValueError: Se as linhas não tiverem todas o mesmo comprimento.
+        """
+        msa = cls()
+        comprimento = len(alinhamento[0]) if alinhamento else 0
+        for linha in alinhamento:
+            if len(linha) != comprimento:
+                raise ValueError("As linhas do alinhamento têm comprimentos diferentes")
+            colunas = np.array([c for c, simbolo in enumerate(linha) if simbolo != "-"], dtype=np.int64)
+            msa._acrescentar(linha.replace("-", ""), colunas, comprimento)
+        return msa
+
+    def __len__(self):
+        return len(self._linhas)
+
+    @property
+    def comprimento(self):
+        """Número de colunas do alinhamento."""
+        return len(self.contagens)
+
+    def _codigos(self, seq):
+        for simbolo in set(seq) - self._indice.keys():
+            self._indice[simbolo] = len(self.alfabeto)
+            self.alfabeto.append(simbolo)
+        falta = len(self.alfabeto) - self.contagens.shape[1]
+        if falta:
+            self.contagens = np.pad(self.contagens, ((0, 0), (0, falta)))
+            self._primeira = np.pad(self._primeira, ((0, 0), (0, falta)), constant_values=np.iinfo(np.int64).max)
+        return np.array([self._indice[simbolo] for simbolo in seq], dtype=np.int64)
+
+    def _acrescentar(self, seq, colunas, comprimento):
+        """Junta uma linha cujos resíduos estão em `colunas` (num alinhamento com `comprimento` colunas)."""
+        if comprimento > len(self.contagens):
+            extra = comprimento - len(self.contagens)
+            self.contagens = np.pad(self.contagens, ((0, extra), (0, 0)))
+            self._primeira = np.pad(self._primeira, ((0, extra), (0, 0)), constant_values=np.iinfo(np.int64).max)
+        codigos = self._codigos(seq)
+        linha = len(self._linhas)
+        self.contagens[colunas, codigos] += 1
+        np.minimum.at(self._primeira, (colunas, codigos), linha)
+        self._linhas.append((seq, colunas, len(self._mapas)))
+
+    def _inserir_colunas(self, antigas, comprimento):
+        """Passa para um alinhamento com `comprimento` colunas, onde a coluna c fica em antigas[c]."""
+        contagens = np.zeros((comprimento, self.contagens.shape[1]), dtype=np.int64)
+        primeira = np.full(contagens.shape, np.iinfo(np.int64).max, dtype=np.int64)
+        contagens[antigas] = self.contagens
+        primeira[antigas] = self._primeira
+        self.contagens, self._primeira = contagens, primeira
+        self._mapas.append(antigas)
+
+    def consenso(self):
+        """
+        Sequência consenso, calculada a partir do perfil.
+
+        Returns:
+            str: Símbolo mais frequente de cada coluna ("-" nas colunas só com gaps).
+        """
+        if not self.alfabeto:
+            return "-" * self.comprimento
+        # Mais contagens primeiro e, em empate, a primeira linha onde aparece.
+        chave = self.contagens * (len(self._linhas) + 1) - np.minimum(self._primeira, len(self._linhas))
+        melhores = np.argmax(chave, axis=1).tolist()
+        vazias = (self.contagens.sum(axis=1) == 0).tolist()
+        return "".join("-" if vazia else self.alfabeto[a] for a, vazia in zip(melhores, vazias))
+
+    def adicionar(self, seq: str, subst: dict, space: int):
+        """
+        Alinha `seq` ao consenso (com `alinhar_par`) e junta-a ao alinhamento.
+
+        Args:
+            seq (str): Nova sequência.
+            subst (dict | MatrizSubstituicao): Matriz de substituição.
+            space (int): Penalidade de gap.
+        """
+        if not self._linhas:
+            self._acrescentar(seq, np.arange(len(seq)), len(seq))
+            return
+        cons_al, nova_al = alinhar_par(self.consenso(), seq, subst, space)
+        self._inserir_colunas(np.array([c for c, s in enumerate(cons_al) if s != "-"], dtype=np.int64),
+                              len(cons_al))
+        self._acrescentar(seq, np.array([c for c, s in enumerate(nova_al) if s != "-"], dtype=np.int64),
+                          len(nova_al))
+
+    def _materializar(self, seq, colunas):
+        linha = ["-"] * self.comprimento
+        for c, simbolo in zip(colunas.tolist(), seq):
+            linha[c] = simbolo
+        return "".join(linha)
+
+    def __getitem__(self, k):
+        seq, colunas, passo = self._linhas[k]
+        for mapa in self._mapas[passo:]:
+            colunas = mapa[colunas]
+        return self._materializar(seq, colunas)
+
+    def linhas(self):
+        """
+        Sequências alinhadas, pela ordem em que foram adicionadas.
+
+        Returns:
+            list[str]: Linhas do alinhamento (todas com `comprimento` colunas).
+        """
+        # finais[p]: coluna final de cada coluna do alinhamento depois de p adições.
+        finais = [None] * (len(self._mapas) + 1)
+        finais[-1] = np.arange(self.comprimento)
+        for p in range(len(self._mapas) - 1, -1, -1):
+            finais[p] = finais[p + 1][self._mapas[p]]
+        return [self._materializar(seq, finais[passo][colunas]) for seq, colunas, passo in self._linhas]
+
+
 def alinhar_consenso(alinhamento: list[str], nova_seq: str, subst: dict, space: int):
     """
     Alinha uma nova sequência ao consenso existente.
 
+    O consenso sai do perfil de colunas de `AlinhamentoMultiplo`; para
+    adicionar várias sequências, usar essa classe diretamente evita
+    refazer o perfil a cada adição.
+
     Args:
         alinhamento (list[str]): Lista de sequências alinhadas.
         nova_seq (str): Nova sequência a ser alinhada.
@@ -525,26 +1738,19 @@ def alinhar_consenso(alinhamento: list[str], nova_seq: str, subst: dict, space:
         >>> alinhar_consenso(["ACG", "A-C"], "AG", subst, -2)
         ['ACG', 'A-C', 'A-G']
     """
-    cons = consenso(alinhamento)
-    cons_al, nova_al = alinhar_par(cons, nova_seq, subst, space)
-
-    novo_alinhamento = []
-    idx = 0
-    for simbolo in cons_al:
-        if simbolo == "-":
-            novo_alinhamento.append("-" * len(alinhamento))
-        else:
-            novo_alinhamento.append("".join(seq[idx] for seq in alinhamento))
-            idx += 1
-    alinhamento_final = ["".join(coluna) for coluna in zip(*novo_alinhamento)]
-    alinhamento_final.append(nova_al)
-    return alinhamento_final
+    msa = AlinhamentoMultiplo.de_alinhamento(alinhamento)
+    msa.adicionar(nova_seq, subst, space)
+    return msa.linhas()
 
 
 def alinhamento_progressivo(seqs: list[str], subst: dict, space: int = -4):
     """
     Realiza um alinhamento múltiplo progressivo de sequências.
 
+    Cada sequência é alinhada ao consenso das anteriores; o perfil de
+    colunas (`AlinhamentoMultiplo`) é atualizado a cada adição e as linhas
+    só são construídas no fim.
+
     Args:
         seqs (list[str]): Lista de sequências.
         subst (dict): Matriz de substituição.
@@ -557,9 +1763,9 @@ def alinhamento_progressivo(seqs: list[str], subst: dict, space: int = -4):
         >>> seqs = ["ACG", "AC", "AG"]
         >>> subst = matriz_substituição_dna(2, -1)
         >>> alinhamento_progressivo(seqs, subst)
-        ['ACG', 'A-C', 'A-G']
+        ['ACG', 'AC-', 'A-G']
     """
-    alinhamento = [seqs[0]]
+    msa = AlinhamentoMultiplo(seqs[0])
     for seq in seqs[1:]:
-        alinhamento = alinhar_consenso(alinhamento, seq, subst, space)
-    return alinhamento
\ No newline at end of file
+        msa.adicionar(seq, subst, space)
+    return msa.linhas()
\ No newline at end of file
@@ -0,0 +1,370 @@
+# Alinhamento com penalidades de gap afins (Gotoh) em espaço linear
+import numpy as np
+
+from .alinhamento import _CIMA, _DIAG, _ESQ, _NEG, _codificar, _passos, escolha_de_matriz
+
+MODOS = ("global", "local", "semiglobal")
+
+# Estados de Gotoh: H (melhor score da célula), F (termina com gap vertical,
+# "↑") e E (termina com gap horizontal, "←").
+_H, _F, _E = 0, 1, 2
+# Bits das setas de cada célula: seta de H (_DIAG, _CIMA ou _ESQ) nos
+# bits 0-1; E aberto a partir de H na coluna anterior; F aberto a partir de H
+# na linha anterior.
+_ABRE_E, _ABRE_F = 4, 8
+_CELULAS_BLOCO = 1 << 20
+
+
+def _linha_afim(h_ant, f_ant, h_esq, e_esq, scores, abertura, extensao, local=False, com_setas=True):
+    """
+    Calcula uma linha das três matrizes de Gotoh a partir da anterior.
+
+    F (gap vertical) depende só da linha anterior. E (gap horizontal) é
+    resolvido com um máximo acumulado: como abertura <= extensao, um gap
+    horizontal nunca começa numa célula que já termina num gap horizontal,
+    pelo que E[t] = abertura + (t-1)*extensao + max_{k<t}(D[k] - k*extensao),
+    com D = max(diag, F) (e 0, no alinhamento local).
+
+    Args:
+        h_ant, f_ant (numpy.ndarray): H e F da linha anterior (colunas b..fim).
+        h_esq, e_esq (int): H e E da nova linha na coluna b (fronteira).
+        scores (numpy.ndarray): Substituição de cada célula (colunas b+1..fim).
+        abertura, extensao (int): Penalidades do primeiro e dos restantes símbolos de um gap.
+        local (bool, optional): Se True, os scores não descem abaixo de 0.
+        com_setas (bool, optional): Se False, não calcula as setas (usado
+            apenas no modo global).
+
+    Returns:
+        tuple: H, E e F da nova linha (colunas b..fim) e setas (uint8, colunas
+        b+1..fim) ou None.
+    """
+    f = np.empty_like(h_ant)
+    f[0] = _NEG
+    estende_f = f_ant[1:] + extensao
+    abre_f = h_ant[1:] + abertura
+    np.maximum(estende_f, abre_f, out=f[1:])
+
+    diag = h_ant[:-1] + scores
+    d = np.empty_like(h_ant)
+    # A coluna b entra como candidata a abrir (H) ou a continuar (E) o gap.
+    d[0] = max(h_esq, e_esq + extensao - abertura)
+    np.maximum(diag, f[1:], out=d[1:])
+    if local:
+        np.maximum(d[1:], 0, out=d[1:])
+
+    passos = _passos(len(d), extensao)
+    d -= passos
+    acumulado = np.maximum.accumulate(d)
+    e = np.empty_like(h_ant)
+    e[0] = e_esq
+    np.add(acumulado[:-1], passos[:-1] + abertura, out=e[1:])
+
+    h = d
+    h += passos
+    h[0] = h_esq
+    np.maximum(h[1:], e[1:], out=h[1:])
+    if not com_setas:
+        return h, e, f, None
+
+    setas = np.full(len(diag), _ESQ, dtype=np.uint8)
+    setas[h[1:] == f[1:]] = _CIMA
+    setas[h[1:] == diag] = _DIAG
+    # E[t] abre a partir de H[t-1] quando t-1 é um novo máximo estrito.
+    novo = np.ones(len(diag), dtype=bool)
+    np.greater(acumulado[1:-1], acumulado[:-2], out=novo[1:])
+    setas[novo] |= _ABRE_E
+    setas[abre_f > estende_f] |= _ABRE_F
+    return h, e, f, setas
+
+
+def _propagar(setas, cruza_h, cruza_f, fronteira):
+    """
+    Propaga por uma linha a coluna onde o caminho de setas de cada célula cruza uma linha dada.
+
+    Cada célula (em cada estado) herda o valor da célula de onde vem a sua seta.
+
+    Args:
+        setas (numpy.ndarray): Setas da linha (colunas b+1..fim).
+        cruza_h, cruza_f (numpy.ndarray): Valores de H e F na linha anterior (colunas b..fim).
+        fronteira (int): Valor da coluna b.
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray]: Valores de H e F da nova linha (colunas b..fim).
+    """
+    seta_h = setas & 3
+    novo_f = np.where(setas & _ABRE_F, cruza_h[1:], cruza_f[1:])
+    d = np.empty_like(cruza_h)
+    d[0] = fronteira
+    d[1:] = np.where(seta_h == _DIAG, cruza_h[:-1], novo_f)
+    origem = np.maximum.accumulate(np.where(setas & _ABRE_E, np.arange(len(setas)), 0))
+    novo_h = d.copy()
+    np.copyto(novo_h[1:], d[origem], where=seta_h == _ESQ)
+    return novo_h, np.concatenate(([fronteira], novo_f))
+
+
+class _Afim:
+    """
+    Reconstrução do alinhamento global afim em espaço linear.
+
+    Segue o mesmo esquema de `alinhamento._Linear`: cada subproblema é dado
+    pelas linhas de H e F acima do retângulo, pelos valores de H e E na
+    coluna à esquerda e pelo estado em que o caminho termina. A linha do
+    meio é calculada e, nas linhas de baixo, cada célula propaga a coluna e
+    o estado (H ou F) com que o seu caminho entra na linha do meio.
+    """
+
+    def __init__(self, codigos1, codigos2, matriz, abertura, extensao):
+        self.codigos1 = codigos1
+        # Coluna virtual -1 antes da coluna 0 (ver `alinhamento._Linear`).
+        self.matriz = np.pad(matriz, ((0, 0), (0, 1)))
+        self.codigos2 = np.concatenate(([matriz.shape[1]], codigos2)).astype(np.intp)
+        self.abertura = abertura
+        self.extensao = extensao
+
+    def _linha(self, i, b, fim, h, f, h_esq, e_esq, com_setas=True):
+        scores = self.matriz[self.codigos1[i - 1], self.codigos2[b + 1:fim + 1]]
+        return _linha_afim(h, f, h_esq, e_esq, scores, self.abertura, self.extensao, com_setas=com_setas)
+
+    def resolver(self, lo, hi, b, fim, cima_h, cima_f, esq_h, esq_e, estado):
+        """Devolve (movimentos por ordem, (coluna, estado) onde o caminho entra na linha lo)."""
+        if hi - lo <= 1 or (hi - lo) * (fim - b + 1) <= _CELULAS_BLOCO:
+            return self._direto(lo, hi, b, fim, cima_h, cima_f, esq_h, esq_e, estado)
+
+        mid = (lo + hi) // 2
+        h, f = cima_h, cima_f
+        for i in range(lo + 1, mid + 1):
+            h, _, f, _ = self._linha(i, b, fim, h, f, esq_h[i - lo - 1], esq_e[i - lo - 1], False)
+        h_mid, f_mid = h, f
+
+        # Coluna e estado (codificados como 2*coluna + estado) onde o caminho
+        # de cada célula entra na linha mid.
+        cruza_h = np.arange(b, fim + 1) * 2
+        cruza_f = cruza_h + _F
+        for i in range(mid + 1, hi + 1):
+            h, _, f, setas = self._linha(i, b, fim, h, f, esq_h[i - lo - 1], esq_e[i - lo - 1])
+            cruza_h, cruza_f = _propagar(setas, cruza_h, cruza_f, -1)
+        codigo = int((cruza_f if estado == _F else cruza_h)[-1])
+        c, estado_mid = codigo >> 1, codigo & 1
+
+        # Fronteira do subproblema de baixo: linha mid e coluna c-1.
+        esq_h_baixo = np.empty(hi - mid, dtype=np.int64)
+        esq_e_baixo = np.empty(hi - mid, dtype=np.int64)
+        h, f = h_mid[:c - b], f_mid[:c - b]
+        for i in range(mid + 1, hi + 1):
+            h, e, f, _ = self._linha(i, b, c - 1, h, f, esq_h[i - lo - 1], esq_e[i - lo - 1], False)
+            esq_h_baixo[i - mid - 1], esq_e_baixo[i - mid - 1] = h[-1], e[-1]
+        del h, f
+
+        movimentos_cima, entrada = self.resolver(lo, mid, b, c, cima_h[:c - b + 1], cima_f[:c - b + 1],
+                                                 esq_h[:mid - lo], esq_e[:mid - lo], estado_mid)
+        movimentos_baixo, _ = self.resolver(mid, hi, c - 1, fim, h_mid[c - 1 - b:], f_mid[c - 1 - b:],
+                                            esq_h_baixo, esq_e_baixo, estado)
+        return movimentos_cima + movimentos_baixo, entrada
+
+    def _direto(self, lo, hi, b, fim, cima_h, cima_f, esq_h, esq_e, estado):
+        setas = np.empty((hi - lo, fim - b), dtype=np.uint8)
+        h, f = cima_h, cima_f
+        for i in range(lo + 1, hi + 1):
+            h, _, f, setas[i - lo - 1] = self._linha(i, b, fim, h, f, esq_h[i - lo - 1], esq_e[i - lo - 1])
+        movimentos = []
+        i, j = hi, fim
+        while i > lo:
+            seta = int(setas[i - lo - 1, j - b - 1])
+            if estado == _H:
+                if seta & 3 == _DIAG:
+                    movimentos.append(_DIAG)
+                    i, j = i - 1, j - 1
+                else:
+                    estado = _F if seta & 3 == _CIMA else _E
+            elif estado == _F:
+                movimentos.append(_CIMA)
+                estado = _H if seta & _ABRE_F else _F
+                i -= 1
+            else:
+                movimentos.append(_ESQ)
+                estado = _H if seta & _ABRE_E else _E
+                j -= 1
+        movimentos.reverse()
+        return movimentos, (j, estado)
+
+
+def _validar(modo, abertura, extensao):
+    if modo not in MODOS:
+        raise ValueError(f"modo desconhecido: {modo!r} (use {', '.join(MODOS)})")
+    if abertura > extensao:
+        raise ValueError("A abertura de um gap não pode custar menos do que a extensão (abertura <= extensao)")
+
+
+def _primeira_linha(m, abertura, extensao, modo):
+    """H e F da linha 0 (colunas 0..m)."""
+    if modo == "global":
+        h = np.concatenate(([0], abertura + np.arange(m, dtype=np.int64) * extensao))
+    else:
+        h = np.zeros(m + 1, dtype=np.int64)
+    return h, np.full(m + 1, _NEG, dtype=np.int64)
+
+
+def _varrer(codigos1, codigos2, matriz, abertura, extensao, modo):
+    """
+    Percorre as matrizes linha a linha, guardando só a linha atual.
+
+    Returns:
+        tuple[int, tuple[int, int]]: Score ótimo e célula onde o alinhamento
+        acaba (a primeira, por linhas, no modo local).
+    """
+    n, m = len(codigos1), len(codigos2)
+    local = modo == "local"
+    h, f = _primeira_linha(m, abertura, extensao, modo)
+    melhor, celula = (0, (0, 0)) if local else (int(h[-1]), (0, m))
+    for i in range(1, n + 1):
+        h_esq = abertura + (i - 1) * extensao if modo == "global" else 0
+        h, _, f, _ = _linha_afim(h, f, h_esq, _NEG, matriz[codigos1[i - 1], codigos2], abertura, extensao,
+                                 local, com_setas=False)
+        if modo == "global":
+            continue
+        j = int(np.argmax(h)) if local or i == n else m
+        if h[j] > melhor:
+            melhor, celula = int(h[j]), (i, j)
+    if modo == "global":
+        return int(h[-1]), (n, m)
+    return melhor, celula
+
+
+def _inicio(codigos1, codigos2, matriz, abertura, extensao, modo, score, fim):
+    """
+    Célula onde começa um alinhamento local/semiglobal ótimo que acaba em `fim`.
+
+    Percorre os prefixos invertidos a partir de `fim` com fronteiras globais:
+    a primeira célula com o score ótimo (em qualquer coluna, no modo local,
+    ou na primeira linha/coluna da matriz original, no semiglobal) dá o
+    início. O ciclo pára aí, pelo que normalmente só uma pequena parte da
+    matriz é recalculada.
+    """
+    i1, j1 = fim
+    if score == 0 and modo == "local" or i1 == 0 or j1 == 0:
+        return fim
+    invertidos1, invertidos2 = codigos1[i1 - 1::-1], codigos2[j1 - 1::-1]
+    h, f = _primeira_linha(j1, abertura, extensao, "global")
+    if modo == "semiglobal" and h[-1] == score:
+        return i1, 0
+    for i in range(1, i1 + 1):
+        h, _, f, _ = _linha_afim(h, f, abertura + (i - 1) * extensao, _NEG, matriz[invertidos1[i - 1], invertidos2],
+                                 abertura, extensao, com_setas=False)
+        if modo == "local":
+            iguais = np.flatnonzero(h[1:] == score)
+            if len(iguais):
+                return i1 - i, j1 - 1 - int(iguais[0])
+        elif h[-1] == score:
+            return i1 - i, 0
+    return 0, j1 - int(np.flatnonzero(h == score)[0])
+
+
+def _alinhar_global(seq1, seq2, codigos1, codigos2, matriz, abertura, extensao):
+    n, m = len(codigos1), len(codigos2)
+    motor = _Afim(codigos1, codigos2, matriz, abertura, extensao)
+    cima_h, cima_f = _primeira_linha(m, abertura, extensao, "global")
+    cima_h, cima_f = np.concatenate(([_NEG], cima_h)), np.concatenate(([_NEG], cima_f))
+    negativos = np.full(n, _NEG, dtype=np.int64)
+    movimentos, (entrada, _) = motor.resolver(0, n, -1, m, cima_h, cima_f, negativos, negativos, _H)
+
+    # Na linha 0 o caminho é um único gap horizontal.
+    a1, a2 = ["-"] * entrada, list(seq2[:entrada])
+    i, j = 0, entrada
+    for movimento in movimentos:
+        if movimento == _DIAG:
+            a1.append(seq1[i])
+            a2.append(seq2[j])
+            i, j = i + 1, j + 1
+        elif movimento == _CIMA:
+            a1.append(seq1[i])
+            a2.append("-")
+            i += 1
+        else:
+            a1.append("-")
+            a2.append(seq2[j])
+            j += 1
+    return "".join(a1), "".join(a2)
+
+
+def pontuacao_afim(seq1: str, seq2: str, match: int = 2, mismatch: int = -3, abertura: int = -7,
+                   extensao: int = -2, modo: str = "global", subst=None):
+    """
+    Calcula o score do alinhamento com gaps afins, guardando só uma linha de cada matriz.
+
+    Um gap de comprimento k vale `abertura + (k-1)*extensao` (com abertura =
+    extensao obtém-se a penalidade linear `space` de `needleman_wunsch`).
+
+    Args:
+        seq1 (str): Primeira sequência.
+        seq2 (str): Segunda sequência.
+        match (int, optional): Pontuação para match (DNA).
+        mismatch (int, optional): Pontuação para mismatch (DNA).
+        abertura (int, optional): Score do primeiro símbolo de um gap.
+        extensao (int, optional): Score de cada símbolo seguinte do gap.
+        modo (str, optional): "global", "local" ou "semiglobal" (gaps nas
+            pontas de qualquer das sequências não são penalizados).
+        subst (dict | MatrizSubstituicao | None, optional): Matriz de substituição.
+
+    Returns:
+        int: Score do alinhamento ótimo.
+
+    Raises:
+        ValueError: Se o modo for desconhecido ou abertura > extensao.
+
+    Example:
+        >>> pontuacao_afim("ACGTTTACG", "ACGACG", abertura=-5, extensao=-1)
+        5
+    """
+    _validar(modo, abertura, extensao)
+    if subst is None:
+        subst = escolha_de_matriz(seq1, seq2, match, mismatch)
+    return _varrer(*_codificar(seq1, seq2, subst), abertura, extensao, modo)[0]
+
+
+def alinhamento_afim(seq1: str, seq2: str, match: int = 2, mismatch: int = -3, abertura: int = -7,
+                     extensao: int = -2, modo: str = "global", subst=None):
+    """
+    Alinhamento com penalidades de gap afins (Gotoh), com memória O(n+m).
+
+    Usa as três matrizes de Gotoh (H, E e F), calculadas linha a linha com
+    arrays NumPy como em `needleman_wunsch_linear`, e reconstrói o caminho
+    por divisão e conquista. Nos modos local e semiglobal, uma passagem só
+    com scores encontra a célula onde o alinhamento ótimo acaba e uma
+    passagem pelos prefixos invertidos encontra onde começa; o troço entre
+    elas é depois alinhado globalmente.
+
+    Args:
+        seq1 (str): Primeira sequência.
+        seq2 (str): Segunda sequência.
+        match, mismatch, abertura, extensao, modo, subst: Ver `pontuacao_afim`.
+
+    Returns:
+        tuple[str, str, int]: Sequências alinhadas (no modo local, só os
+        segmentos alinhados) e score.
+
+    Raises:
+        ValueError: Se o modo for desconhecido ou abertura > extensao.
+
+    Example:
+        >>> alinhamento_afim("ACGTTTACG", "ACGACG", abertura=-5, extensao=-1)
+        ('ACGTTTACG', 'ACG---ACG', 5)
+    """
+    _validar(modo, abertura, extensao)
+    if subst is None:
+        subst = escolha_de_matriz(seq1, seq2, match, mismatch)
+    codigos1, codigos2, matriz = _codificar(seq1, seq2, subst)
+    if modo == "global":
+        score = _varrer(codigos1, codigos2, matriz, abertura, extensao, modo)[0]
+        return (*_alinhar_global(seq1, seq2, codigos1, codigos2, matriz, abertura, extensao), score)
+
+    score, (i1, j1) = _varrer(codigos1, codigos2, matriz, abertura, extensao, modo)
+    i0, j0 = _inicio(codigos1, codigos2, matriz, abertura, extensao, modo, score, (i1, j1))
+    a1, a2 = _alinhar_global(seq1[i0:i1], seq2[j0:j1], codigos1[i0:i1], codigos2[j0:j1], matriz,
+                             abertura, extensao)
+    if modo == "local":
+        return a1, a2, score
+    n, m = len(seq1), len(seq2)
+    # Gaps nas pontas (sem custo).
+    a1 = "-" * j0 + seq1[:i0] + a1 + seq1[i1:] + "-" * (m - j1 if i1 == n else 0)
+    a2 = seq2[:j0] + "-" * i0 + a2 + ("-" * (n - i1) if i1 < n else "") + seq2[j1:]
+    return a1, a2, score
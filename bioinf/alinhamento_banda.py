@@ -0,0 +1,322 @@
+# Alinhamento em banda (|i-j| <= w) com largura adaptativa
+import numpy as np
+
+from .alinhamento import _codificar, escolha_de_matriz
+
+MODOS = ("global", "semiglobal")
+
+_NEG32, _NEG64 = -(1 << 30), -(1 << 60)
+_LINHAS_BLOCO = 32768
+
+
+class _Banda:
+    """
+    Matriz de Needleman-Wunsch restrita às diagonais -w..w, guardada por diagonais.
+
+    `valores[k, i]` é o score da célula (i, i+d), com d = k - w. Cada célula
+    depende da anterior na mesma diagonal (↖), da diagonal d+1 na linha
+    anterior (↑) e da diagonal d-1 na mesma linha (←). Dados os valores das
+    diagonais vizinhas, uma diagonal inteira é calculada de uma só vez:
+    A[i] = max(A[i-1] + s[i], X[i]) resolve-se com um máximo acumulado,
+    A = P + max.accumulate(X - P), onde P é a soma acumulada dos scores de
+    substituição ao longo da diagonal. As diagonais são percorridas
+    alternadamente por ordem crescente e decrescente até nenhum valor mudar
+    (os valores só aumentam e convergem para os da matriz completa, restrita
+    à banda); com sequências quase idênticas bastam poucas passagens.
+    """
+
+    def __init__(self, codigos1, codigos2, matriz, space, w, modo, anterior=None):
+        n, m = len(codigos1), len(codigos2)
+        self.n, self.m, self.w, self.space, self.modo = n, m, w, space, modo
+        limite = (n + m + 2) * (int(np.abs(matriz).max(initial=0)) + abs(space))
+        tipo, self.neg = (np.int32, _NEG32) if limite < 1 << 29 else (np.int64, _NEG64)
+
+        diagonais = range(-w, w + 1)
+        self.inicios = [max(0, -d) for d in diagonais]
+        self.fins = [min(n, m - d) for d in diagonais]
+        self.valores = np.full((2 * w + 1, n + 1), self.neg, dtype=tipo)
+        # Somas acumuladas dos scores de substituição ao longo de cada diagonal.
+        self.somas = np.zeros((2 * w + 1, n + 1), dtype=tipo)
+        # Blocos de linhas de cada diagonal cujas entradas mudaram (a recalcular).
+        self.sujos = np.ones((2 * w + 1, n // _LINHAS_BLOCO + 1), dtype=bool)
+        interior = range(0)
+        if anterior is not None:
+            # Os valores de uma banda mais estreita são limites inferiores; as
+            # suas diagonais já são consistentes entre si e só as das pontas
+            # (vizinhas das novas) têm de ser recalculadas à partida.
+            interior = range(w - anterior.w, w + anterior.w + 1)
+            self.valores[interior.start:interior.stop] = anterior.valores
+            self.somas[interior.start:interior.stop] = anterior.somas
+            self.sujos[interior.start + 1:interior.stop - 1] = False
+        # Score do par (a, b) na posição a*len(alfabeto de seq2) + b da tabela.
+        tabela = matriz.astype(tipo).ravel()
+        linhas = codigos1 * matriz.shape[1]
+        for k, d in enumerate(diagonais):
+            lo, hi = self.inicios[k], self.fins[k]
+            if lo > hi or k in interior:
+                continue
+            self.valores[k, lo] = 0 if modo == "semiglobal" else abs(d) * space
+            scores = tabela.take(linhas[lo:hi] + codigos2[lo + d:hi + d])
+            np.cumsum(scores, out=self.somas[k, lo + 1:hi + 1])
+
+    def _cadeia(self, k, a, b, inicial):
+        """Valores da diagonal k nas linhas a..b, dado o valor na linha a."""
+        v = self.valores
+        x = np.empty(b - a + 1, dtype=v.dtype)
+        if k + 1 < len(v):
+            x[1:] = v[k + 1, a:b]
+        else:
+            x[1:] = self.neg
+        if k > 0:
+            np.maximum(x[1:], v[k - 1, a + 1:b + 1], out=x[1:])
+        x[1:] += self.space
+        x[0] = inicial
+        somas = self.somas[k, a:b + 1]
+        x -= somas
+        np.maximum.accumulate(x, out=x)
+        x += somas
+        return x
+
+    def _diagonal(self, k):
+        """
+        Recalcula os blocos de linhas marcados da diagonal k e marca os das vizinhas.
+
+        Um bloco cujo último valor mude obriga também a recalcular o bloco
+        seguinte da mesma diagonal.
+        """
+        inicio, fim = self.inicios[k], self.fins[k]
+        blocos = np.flatnonzero(self.sujos[k]).tolist()
+        self.sujos[k] = False
+        while blocos:
+            bloco = blocos.pop(0)
+            a = max(inicio, bloco * _LINHAS_BLOCO - 1)
+            b = min(fim, (bloco + 1) * _LINHAS_BLOCO - 1)
+            if a >= b:
+                continue
+            x = self._cadeia(k, a, b, self.valores[k, a])
+            antigos = self.valores[k, a:b + 1]
+            diferentes = np.flatnonzero(x != antigos)
+            if len(diferentes) == 0:
+                continue
+            antigos[:] = x
+            primeira, ultima = a + int(diferentes[0]), a + int(diferentes[-1])
+            # A diagonal d+1 usa esta como ← (mesma linha) e a d-1 como ↑ (linha seguinte).
+            if k + 1 < len(self.valores):
+                self.sujos[k + 1, primeira // _LINHAS_BLOCO:ultima // _LINHAS_BLOCO + 1] = True
+            if k > 0:
+                self.sujos[k - 1, (primeira + 1) // _LINHAS_BLOCO:(ultima + 1) // _LINHAS_BLOCO + 1] = True
+            if ultima == b and b < fim and (not blocos or blocos[0] != bloco + 1):
+                blocos.insert(0, bloco + 1)
+
+    def calcular(self):
+        ordem = list(range(len(self.valores)))
+        while True:
+            pendentes = [k for k in ordem if self.sujos[k].any()]
+            if not pendentes:
+                return
+            for k in pendentes:
+                self._diagonal(k)
+            ordem.reverse()
+
+    def valor(self, i, j):
+        return int(self.valores[j - i + self.w, i])
+
+    def melhor_fim(self):
+        """Célula final (dentro da banda) e score ótimo."""
+        n, m, w = self.n, self.m, self.w
+        if self.modo == "global":
+            return (n, m), self.valor(n, m)
+        # Semiglobal: última linha ou última coluna.
+        candidatos = [(n, j) for j in range(max(0, n - w), min(m, n + w) + 1)]
+        candidatos += [(i, m) for i in range(max(0, m - w), min(n, m + w) + 1)]
+        valores = [self.valor(i, j) for i, j in candidatos]
+        melhor = int(np.argmax(valores))
+        return candidatos[melhor], valores[melhor]
+
+    def caminho(self, i, j):
+        """
+        Segue o caminho ótimo de (i, j) até à linha 0 ou à coluna 0.
+
+        Os troços diagonais são saltados de uma vez: para cada diagonal
+        visitada calcula-se a última linha, até cada posição, cuja célula
+        não vem da diagonal anterior (prioridade ↖ > ↑ > ←, como em
+        `needleman_wunsch`).
+
+        Returns:
+            tuple: (movimentos por ordem como (tipo, quantidade), célula inicial).
+        """
+        v, w, space = self.valores, self.w, self.space
+        paragens = {}
+        movimentos = []
+        while i > 0 and j > 0:
+            k = j - i + w
+            if k not in paragens:
+                lo, hi = self.inicios[k], self.fins[k]
+                linhas = np.arange(lo, hi + 1)
+                diag = np.zeros(hi - lo + 1, dtype=bool)
+                diag[1:] = v[k, lo + 1:hi + 1] == v[k, lo:hi] + np.diff(self.somas[k, lo:hi + 1])
+                paragens[k] = (lo, np.maximum.accumulate(np.where(diag, lo, linhas)))
+            lo, ultimas = paragens[k]
+            r = int(ultimas[i - lo])
+            if r < i:
+                movimentos.append(("↖", i - r))
+                j -= i - r
+                i = r
+            if i == 0 or j == 0:
+                break
+            if k + 1 < len(v) and v[k, i] == v[k + 1, i - 1] + space:
+                movimentos.append(("↑", 1))
+                i -= 1
+            else:
+                movimentos.append(("←", 1))
+                j -= 1
+        movimentos.reverse()
+        return movimentos, (i, j)
+
+
+def _limite_fora(n, m, melhor_subst, space, w, modo):
+    """
+    Limite superior do score de qualquer caminho que saia da banda |i-j| <= w.
+
+    Um caminho com k passos diagonais e g gaps vale no máximo
+    k*melhor_subst + g*space, com 2k + g fixo pelas células onde começa e
+    acaba; sair da banda obriga a um número mínimo de gaps. Devolve None se
+    não houver limite útil (penalidade de gap não negativa).
+    """
+    c = melhor_subst / 2 - space
+    if modo == "global":
+        if c <= 0:
+            return None
+        return melhor_subst * (n + m) / 2 - c * (2 * (w + 1) - abs(m - n))
+    if space >= 0 or melhor_subst < 0:
+        return None
+
+    def total(s):
+        # Linhas + colunas disponíveis até ao fim na diagonal s.
+        return np.minimum(2 * n + s, 2 * m - s)
+
+    # Começa fora da banda (gap inicial grátis) e segue sem gaps.
+    fora = melhor_subst * max(min(n, m - w - 1), min(n - w - 1, m))
+    # Começa dentro e acaba fora da banda.
+    fim_fora = max(melhor_subst / 2 * (total(s) - w) - c for s in (w + 1, -w - 1))
+    # Começa e acaba dentro da banda, mas sai dela pelo meio.
+    s1 = np.arange(-w, w + 1)
+    dentro = -np.inf
+    for s0 in (np.full_like(s1, -w), np.zeros_like(s1), np.full_like(s1, w), -s1):
+        valores = melhor_subst / 2 * (total(s1) - np.abs(s0)) - c * (2 * (w + 1) - np.abs(s0 + s1))
+        dentro = max(dentro, valores.max())
+    return max(fora, fim_fora, dentro)
+
+
+def _banda_otima(codigos1, codigos2, matriz, space, modo, largura):
+    """Duplica a largura da banda até o score ótimo estar provadamente dentro dela."""
+    n, m = len(codigos1), len(codigos2)
+    maxima = max(n, m)
+    w = min(max(largura, abs(n - m) if modo == "global" else 0, 1), maxima)
+    melhor_subst = int(matriz.max(initial=0))
+    banda = None
+    while True:
+        banda = _Banda(codigos1, codigos2, matriz, space, w, modo, banda)
+        banda.calcular()
+        fim, score = banda.melhor_fim()
+        if w >= maxima:
+            return banda, fim, score
+        limite = _limite_fora(n, m, melhor_subst, space, w, modo)
+        if limite is not None and score >= limite:
+            return banda, fim, score
+        w = min(2 * w, maxima)
+
+
+def _validar(modo):
+    if modo not in MODOS:
+        raise ValueError(f"modo desconhecido: {modo!r} (use {' ou '.join(MODOS)})")
+
+
+def pontuacao_banda(seq1: str, seq2: str, match: int = 2, mismatch: int = -3, space: int = -4,
+                    modo: str = "global", largura: int = 16, subst=None):
+    """
+    Calcula o score ótimo do alinhamento global ou semiglobal calculando só uma banda da matriz.
+
+    Só são calculadas as células com |i-j| <= w. Depois de cada cálculo, o
+    score obtido é comparado com um limite superior do score de qualquer
+    alinhamento que saia da banda (que tem de usar um número mínimo de
+    gaps); se o limite não for atingido, o ótimo está garantidamente na
+    banda, senão w é duplicado. O resultado é sempre igual ao da matriz
+    completa (`needleman_wunsch`, no modo global), mas para sequências
+    quase idênticas basta uma banda estreita. A memória usada é O(n*w).
+
+    Args:
+        seq1 (str): Primeira sequência.
+        seq2 (str): Segunda sequência.
+        match (int, optional): Pontuação para match (DNA).
+        mismatch (int, optional): Pontuação para mismatch (DNA).
+        space (int, optional): Penalidade de gap.
+        modo (str, optional): "global" ou "semiglobal" (gaps nas pontas não
+            são penalizados).
+        largura (int, optional): Largura w inicial da banda.
+        subst (dict | MatrizSubstituicao | None, optional): Matriz de substituição.
+
+    Returns:
+        int: Score ótimo.
+
+    Raises:
+        ValueError: Se o modo for desconhecido.
+
+    Example:
+        >>> pontuacao_banda("ACGTACGTAC", "ACGTCGTAC")
+        14
+    """
+    _validar(modo)
+    if subst is None:
+        subst = escolha_de_matriz(seq1, seq2, match, mismatch)
+    return _banda_otima(*_codificar(seq1, seq2, subst), space, modo, largura)[2]
+
+
+def alinhamento_banda(seq1: str, seq2: str, match: int = 2, mismatch: int = -3, space: int = -4,
+                      modo: str = "global", largura: int = 16, subst=None):
+    """
+    Alinhamento global ou semiglobal ótimo calculando só uma banda da matriz.
+
+    Calcula a banda como `pontuacao_banda` e reconstrói o caminho a partir
+    dos valores guardados, saltando os troços diagonais de uma vez.
+
+    Args:
+        seq1 (str): Primeira sequência.
+        seq2 (str): Segunda sequência.
+        match, mismatch, space, modo, largura, subst: Ver `pontuacao_banda`.
+
+    Returns:
+        tuple[str, str, int]: Sequências alinhadas e score.
+
+    Raises:
+        ValueError: Se o modo for desconhecido.
+
+    Example:
+        >>> alinhamento_banda("ACGTACGTAC", "ACGTCGTAC")
+        ('ACGTACGTAC', 'ACGT-CGTAC', 14)
+    """
+    _validar(modo)
+    if subst is None:
+        subst = escolha_de_matriz(seq1, seq2, match, mismatch)
+    banda, (i, j), score = _banda_otima(*_codificar(seq1, seq2, subst), space, modo, largura)
+    n, m = len(seq1), len(seq2)
+    movimentos, (i0, j0) = banda.caminho(i, j)
+
+    # Antes da linha/coluna 0 e depois da célula final só há gaps.
+    a1, a2 = ["-" * j0 + seq1[:i0]], [seq2[:j0] + "-" * i0]
+    for tipo, quantidade in movimentos:
+        if tipo == "↖":
+            a1.append(seq1[i0:i0 + quantidade])
+            a2.append(seq2[j0:j0 + quantidade])
+            i0, j0 = i0 + quantidade, j0 + quantidade
+        elif tipo == "↑":
+            a1.append(seq1[i0])
+            a2.append("-")
+            i0 += 1
+        else:
+            a1.append("-")
+            a2.append(seq2[j0])
+            j0 += 1
+    a1.append(seq1[i:] + "-" * (m - j))
+    a2.append("-" * (n - i) + seq2[j:])
+    return "".join(a1), "".join(a2), score
@@ -0,0 +1,300 @@
+# Alinhamento de pares longos por blocos em frente de onda (wavefront), em paralelo
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+import numpy as np
+
+from .alinhamento import (_CIMA, _DIAG, _ESQ, _STOP, Alinhamento, _codificar, _linha_nw, _passos,
+                          escolha_de_matriz)
+
+MODOS = ("global", "local")
+PARALELISMOS = ("threads", "processos")
+
+# Dados de cada processo (códigos, matriz de substituição, gap e modo), dados pelo inicializador.
+_DADOS = {}
+
+
+def _linha(anterior, esquerda, scores, space, local, com_setas=False):
+    """
+    Calcula uma linha de Needleman-Wunsch (ou Smith-Waterman, com `local`) a partir da anterior.
+
+    Como `alinhamento._linha_nw`; no modo local as células ficam >= 0 e as
+    que valem 0 têm a seta _STOP (com prioridade, como em `smith_waterman`).
+    """
+    if not local:
+        return _linha_nw(anterior, esquerda, scores, space, com_setas)
+    diag = anterior[:-1] + scores
+    cima = anterior[1:] + space
+    passos = _passos(len(anterior), space)
+    melhor = np.empty_like(anterior)
+    melhor[0] = esquerda
+    np.maximum(diag, cima, out=melhor[1:])
+    np.maximum(melhor, 0, out=melhor)
+    melhor -= passos
+    linha = np.maximum.accumulate(melhor, out=melhor)
+    linha += passos
+    if not com_setas:
+        return linha, None
+    setas = np.full(len(diag), _ESQ, dtype=np.uint8)
+    setas[linha[1:] == cima] = _CIMA
+    setas[linha[1:] == diag] = _DIAG
+    setas[linha[1:] == 0] = _STOP
+    return linha, setas
+
+
+def _iniciar(codigos1, codigos2, matriz, space, local):
+    """Inicializador dos processos: guarda os dados comuns a todos os blocos."""
+    _DADOS.update(codigos1=codigos1, codigos2=codigos2, matriz=matriz, space=space, local=local)
+
+
+def _bloco(r0, r1, c0, c1, cima, esquerda, dados=None):
+    """
+    Calcula o bloco de células (r0+1..r1, c0+1..c1) a partir das suas fronteiras.
+
+    Args:
+        cima (numpy.ndarray): Linha r0, colunas c0..c1.
+        esquerda (numpy.ndarray): Coluna c0, linhas r0+1..r1.
+
+    Returns:
+        tuple: (linha r1 nas colunas c0..c1, coluna c1 nas linhas r0+1..r1,
+        (score máximo, i, j) da primeira célula máxima do bloco).
+    """
+    dados = _DADOS if dados is None else dados
+    space, local = dados["space"], dados["local"]
+    perfil = dados["matriz"][:, dados["codigos2"][c0:c1]]
+    direita = np.empty(r1 - r0, dtype=np.int64)
+    melhor = (0, 0, 0)
+    linha = cima
+    for i in range(r0 + 1, r1 + 1):
+        linha, _ = _linha(linha, esquerda[i - r0 - 1], perfil[dados["codigos1"][i - 1]], space, local)
+        direita[i - r0 - 1] = linha[-1]
+        if local:
+            k = int(np.argmax(linha[1:]))
+            if linha[k + 1] > melhor[0]:
+                melhor = (int(linha[k + 1]), i, c0 + k + 1)
+    return linha, direita, melhor
+
+
+class _Wavefront:
+    """
+    Matriz de programação dinâmica dividida em blocos, calculada em frente de onda.
+
+    O bloco (I, J) precisa só da última linha do bloco de cima e da última
+    coluna do bloco da esquerda; logo que ambos estão prontos é entregue ao
+    conjunto de threads ou processos, pelo que os blocos de cada
+    antidiagonal são calculados em paralelo. Entre blocos passam apenas
+    estas fronteiras. As fronteiras ficam guardadas (uma linha completa a
+    cada `bloco` linhas e uma coluna completa a cada `bloco` colunas) para
+    a reconstrução, que recalcula só os blocos atravessados pelo caminho.
+    """
+
+    def __init__(self, codigos1, codigos2, matriz, space, local, bloco):
+        n, m = len(codigos1), len(codigos2)
+        self.dados = {"codigos1": codigos1, "codigos2": codigos2, "matriz": matriz, "space": space,
+                      "local": local}
+        self.cortes1 = list(range(0, n, bloco)) + [n]
+        self.cortes2 = list(range(0, m, bloco)) + [m]
+        borda = (lambda k: np.zeros(k + 1, dtype=np.int64)) if local else \
+            (lambda k: np.arange(k + 1, dtype=np.int64) * space)
+        # linhas[I]: linha cortes1[I] da matriz; colunas[J]: coluna cortes2[J].
+        self.linhas = np.empty((len(self.cortes1), m + 1), dtype=np.int64)
+        self.colunas = np.empty((len(self.cortes2), n + 1), dtype=np.int64)
+        self.linhas[0] = borda(m)
+        self.colunas[0] = borda(n)
+        self.linhas[:, 0] = self.colunas[0, self.cortes1]
+        self.colunas[:, 0] = self.linhas[0, self.cortes2]
+        self.melhor = (0, 0, 0)
+
+    def _limites(self, I, J):
+        return self.cortes1[I], self.cortes1[I + 1], self.cortes2[J], self.cortes2[J + 1]
+
+    def _fronteiras(self, I, J):
+        r0, r1, c0, c1 = self._limites(I, J)
+        return r0, r1, c0, c1, self.linhas[I, c0:c1 + 1], self.colunas[J, r0 + 1:r1 + 1]
+
+    def _guardar(self, I, J, resultado):
+        r0, r1, c0, c1 = self._limites(I, J)
+        linha, direita, melhor = resultado
+        self.linhas[I + 1, c0:c1 + 1] = linha
+        self.colunas[J + 1, r0 + 1:r1 + 1] = direita
+        # Máximo com desempate pela primeira célula (por linhas), como em `smith_waterman`.
+        if (melhor[0], -melhor[1], -melhor[2]) > (self.melhor[0], -self.melhor[1], -self.melhor[2]):
+            self.melhor = melhor
+
+    def calcular(self, processos=None, paralelismo="threads"):
+        blocos1, blocos2 = len(self.cortes1) - 1, len(self.cortes2) - 1
+        if blocos1 == 0 or blocos2 == 0:
+            return
+        trabalhadores = processos or os.cpu_count() or 1
+        if trabalhadores == 1 or blocos1 * blocos2 == 1:
+            for I in range(blocos1):
+                for J in range(blocos2):
+                    self._guardar(I, J, _bloco(*self._fronteiras(I, J), self.dados))
+            return
+        if paralelismo == "threads":
+            executor = ThreadPoolExecutor(max_workers=trabalhadores)
+            submeter = lambda I, J: executor.submit(_bloco, *self._fronteiras(I, J), self.dados)
+        else:
+            d = self.dados
+            executor = ProcessPoolExecutor(max_workers=trabalhadores, initializer=_iniciar,
+                                           initargs=(d["codigos1"], d["codigos2"], d["matriz"], d["space"], d["local"]))
+            submeter = lambda I, J: executor.submit(_bloco, *self._fronteiras(I, J))
+        # Dependências em falta de cada bloco (o de cima e o da esquerda).
+        faltam = {(I, J): (I > 0) + (J > 0) for I in range(blocos1) for J in range(blocos2)}
+        with executor:
+            a_correr = {submeter(0, 0): (0, 0)}
+            while a_correr:
+                feitos, _ = wait(a_correr, return_when=FIRST_COMPLETED)
+                for futuro in feitos:
+                    I, J = a_correr.pop(futuro)
+                    self._guardar(I, J, futuro.result())
+                    for seguinte in ((I + 1, J), (I, J + 1)):
+                        if seguinte in faltam:
+                            faltam[seguinte] -= 1
+                            if faltam[seguinte] == 0:
+                                a_correr[submeter(*seguinte)] = seguinte
+
+    def score(self):
+        return self.melhor[0] if self.dados["local"] else int(self.linhas[-1, -1])
+
+    def caminho(self):
+        """
+        Segue as setas desde a célula final, recalculando um bloco de cada vez.
+
+        Returns:
+            tuple: (célula inicial (i, j), operações _DIAG/_CIMA/_ESQ por ordem).
+        """
+        local, space = self.dados["local"], self.dados["space"]
+        codigos1, codigos2, matriz = self.dados["codigos1"], self.dados["codigos2"], self.dados["matriz"]
+        if local:
+            _, i, j = self.melhor
+        else:
+            i, j = self.cortes1[-1], self.cortes2[-1]
+        partes = []
+        while i > 0 and j > 0:
+            I = np.searchsorted(self.cortes1, i) - 1
+            J = np.searchsorted(self.cortes2, j) - 1
+            r0, c0 = self.cortes1[I], self.cortes2[J]
+            # Setas do retângulo (r0+1..i, c0+1..j), a partir das fronteiras guardadas.
+            setas = np.empty((i - r0, j - c0), dtype=np.uint8)
+            perfil = matriz[:, codigos2[c0:j]]
+            linha = self.linhas[I, c0:j + 1]
+            for k in range(r0 + 1, i + 1):
+                linha, setas[k - r0 - 1] = _linha(linha, self.colunas[J, k], perfil[codigos1[k - 1]], space,
+                                                  local, com_setas=True)
+            operacoes, parou = [], False
+            while i > r0 and j > c0:
+                seta = setas[i - r0 - 1, j - c0 - 1]
+                if seta == _STOP:
+                    parou = True
+                    break
+                operacoes.append(seta)
+                i -= seta != _ESQ
+                j -= seta != _CIMA
+            partes.append(operacoes)
+            if parou:
+                break
+        operacoes = [op for parte in partes for op in parte][::-1]
+        if not local:
+            # Na primeira linha e na primeira coluna só há gaps.
+            operacoes = [_CIMA] * i + [_ESQ] * j + operacoes
+            i = j = 0
+        return (i, j), operacoes
+
+
+def _preparar(seq1, seq2, match, mismatch, space, modo, subst, bloco, paralelismo):
+    if modo not in MODOS:
+        raise ValueError(f"Modo desconhecido: {modo!r} (use {' ou '.join(MODOS)})")
+    if paralelismo not in PARALELISMOS:
+        raise ValueError(f"Paralelismo desconhecido: {paralelismo!r} (use {' ou '.join(PARALELISMOS)})")
+    if bloco < 1:
+        raise ValueError("bloco tem de ser positivo")
+    if subst is None:
+        subst = escolha_de_matriz(seq1, seq2, match, mismatch)
+    codigos1, codigos2, matriz = _codificar(seq1, seq2, subst)
+    return _Wavefront(codigos1, codigos2, matriz, space, modo == "local", bloco)
+
+
+def pontuacao_wavefront(seq1: str, seq2: str, match: int = 2, mismatch: int = -3, space: int = -4,
+                        modo: str = "global", subst=None, bloco: int = 4096, processos: int = None,
+                        paralelismo: str = "threads"):
+    """
+    Score de Needleman-Wunsch ou Smith-Waterman calculado por blocos, em paralelo.
+
+    A matriz é dividida em blocos de `bloco` x `bloco` células; cada bloco
+    é calculado linha a linha com NumPy (como `pontuacao_needleman_wunsch`)
+    logo que o bloco de cima e o da esquerda estão prontos, pelo que os
+    blocos de uma mesma antidiagonal correm ao mesmo tempo. Entre blocos só
+    passam a última linha e a última coluna de cada um. A memória é
+    O((n + m) * (n + m) / bloco), para as fronteiras guardadas.
+
+    Args:
+        seq1 (str): Primeira sequência.
+        seq2 (str): Segunda sequência.
+        match (int, optional): Pontuação para match (DNA).
+        mismatch (int, optional): Pontuação para mismatch (DNA).
+        space (int, optional): Penalidade de gap.
+        modo (str, optional): "global" (Needleman-Wunsch) ou "local" (Smith-Waterman).
+        subst (dict | MatrizSubstituicao | None, optional): Matriz de substituição.
+        bloco (int, optional): Lado de cada bloco, em células.
+        processos (int | None, optional): Número de threads ou processos;
+            None usa `os.cpu_count()` e 1 calcula tudo na thread atual.
+        paralelismo (str, optional): "threads" (as operações NumPy libertam o
+            GIL) ou "processos".
+
+    Returns:
+        int: Score do alinhamento (igual ao de `needleman_wunsch` ou `smith_waterman`).
+
+    Raises:
+        ValueError: Se o modo ou o paralelismo forem desconhecidos, ou `bloco`
+            não for positivo.
+
+    Example:
+        >>> pontuacao_wavefront("ACGTACGTAC", "ACGTCGTAC", bloco=4)
+        14
+    """
+    motor = _preparar(seq1, seq2, match, mismatch, space, modo, subst, bloco, paralelismo)
+    motor.calcular(processos, paralelismo)
+    return motor.score()
+
+
+def alinhamento_wavefront(seq1: str, seq2: str, match: int = 2, mismatch: int = -3, space: int = -4,
+                          modo: str = "global", subst=None, bloco: int = 4096, processos: int = None,
+                          paralelismo: str = "threads"):
+    """
+    Alinhamento ótimo de duas sequências longas, com a matriz calculada por blocos em paralelo.
+
+    Calcula as fronteiras dos blocos como `pontuacao_wavefront` e depois
+    segue o caminho para trás, recalculando as setas só dos blocos que ele
+    atravessa (no máximo n/bloco + m/bloco blocos), a partir das fronteiras
+    guardadas: as setas nunca são guardadas para a matriz inteira. O
+    alinhamento é o mesmo de `needleman_wunsch` (ou `smith_waterman`) com
+    `reconstruir_alinhamento`, incluindo os desempates.
+
+    Args:
+        seq1 (str): Primeira sequência.
+        seq2 (str): Segunda sequência.
+        match (int, optional): Pontuação para match (DNA).
+        mismatch (int, optional): Pontuação para mismatch (DNA).
+        space (int, optional): Penalidade de gap.
+        modo (str, optional): "global" ou "local".
+        subst (dict | MatrizSubstituicao | None, optional): Matriz de substituição.
+        bloco (int, optional): Lado de cada bloco, em células.
+        processos (int | None, optional): Número de threads ou processos.
+        paralelismo (str, optional): "threads" ou "processos".
+
+    Returns:
+        Alinhamento: Score, posições e CIGAR do alinhamento.
+
+    Raises:
+        ValueError: Se o modo ou o paralelismo forem desconhecidos, ou `bloco`
+            não for positivo.
+
+    Example:
+        >>> alinhamento_wavefront("ACGTACGTAC", "ACGTCGTAC", bloco=4).linhas()
+        ('ACGTACGTAC', 'ACGT-CGTAC')
+    """
+    motor = _preparar(seq1, seq2, match, mismatch, space, modo, subst, bloco, paralelismo)
+    motor.calcular(processos, paralelismo)
+    (i, j), operacoes = motor.caminho()
+    return Alinhamento._de_operacoes(seq1, seq2, motor.score(), operacoes, i, j)
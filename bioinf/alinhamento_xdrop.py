@@ -0,0 +1,188 @@
+# Score de alinhamento local com sementes, extensões X-drop e paragem antecipada
+from collections import namedtuple
+
+import numpy as np
+
+from .alinhamento import _codificar, escolha_de_matriz
+
+# Motivos de paragem: todas as sementes tratadas (sem limiar), limiar
+# atingido, ou nenhuma das sementes que faltam consegue atingir o limiar.
+PARAGENS = ("fim", "limiar", "inalcancavel")
+
+_NEG = -(1 << 60)
+
+ResultadoXDrop = namedtuple("ResultadoXDrop", ["score", "celulas", "paragem"])
+ResultadoXDrop.__doc__ = """
+Resultado de `pontuacao_xdrop`.
+
+Attributes:
+    score (int): Melhor score encontrado (com paragem "limiar" é só um
+        limite inferior do score final, já acima do limiar).
+    celulas (int): Células da matriz efetivamente calculadas.
+    paragem (str): Motivo da paragem (um de `PARAGENS`).
+"""
+
+
+def _linha(anterior, inicio_ant, fila, codigos2, inicio, fim, space, corte):
+    """
+    Calcula as colunas inicio..fim (e o prolongamento por gaps à direita) de uma linha.
+
+    `anterior` tem os valores da linha anterior a partir da coluna
+    `inicio_ant`; fora dela as células estão mortas. `fila` é a linha da
+    matriz de substituição do símbolo desta linha.
+    """
+    largura = fim - inicio + 1
+    # Valores da linha anterior nas colunas inicio-1..fim (mortas fora da janela).
+    cima = np.full(largura + 1, _NEG, dtype=np.int64)
+    a, b = max(inicio - 1, inicio_ant), min(fim, inicio_ant + len(anterior) - 1)
+    if a <= b:
+        cima[a - inicio + 1:b - inicio + 2] = anterior[a - inicio_ant:b - inicio_ant + 1]
+    linha = cima[1:] + space
+    colunas = slice(max(inicio, 1), fim + 1)
+    diagonal = cima[colunas.start - inicio:largura] + fila[codigos2[colunas.start - 1:fim]]
+    np.maximum(linha[colunas.start - inicio:], diagonal, out=linha[colunas.start - inicio:])
+    # Gaps horizontais: H[j] = max(base[j], H[j-1] + space), com um máximo acumulado.
+    passos = np.arange(largura, dtype=np.int64) * space
+    linha -= passos
+    np.maximum.accumulate(linha, out=linha)
+    linha += passos
+    # Prolongamento à direita só por gaps, enquanto não cair abaixo do corte.
+    m = len(codigos2)
+    if fim < m:
+        extra = m - fim if space >= 0 else min(m - fim, max(0, (int(linha[-1]) - corte) // -space))
+        if extra:
+            linha = np.concatenate([linha, linha[-1] + space * np.arange(1, extra + 1, dtype=np.int64)])
+    return linha
+
+
+def _extensao(codigos1, codigos2, matriz, space, x):
+    """
+    Extensão ancorada em (0, 0), com poda X-drop em relação ao seu próprio melhor score.
+
+    Returns:
+        tuple: (melhor score, (linha, coluna) onde é atingido, células calculadas).
+    """
+    n, m = len(codigos1), len(codigos2)
+    extra = m if space >= 0 else min(m, x // -space)
+    anterior, inicio_ant = space * np.arange(extra + 1, dtype=np.int64), 0
+    melhor, fim, celulas = 0, (0, 0), extra
+    for i in range(1, n + 1):
+        inicio = inicio_ant
+        linha = _linha(anterior, inicio_ant, matriz[codigos1[i - 1]], codigos2,
+                       inicio, min(m, inicio_ant + len(anterior)), space, melhor - x)
+        celulas += len(linha)
+        k = int(linha.argmax())
+        if linha[k] > melhor:
+            melhor, fim = int(linha[k]), (i, inicio + k)
+        corte = melhor - x
+        vivas = np.flatnonzero(linha >= corte)
+        if len(vivas) == 0:
+            break
+        primeira, ultima = int(vivas[0]), int(vivas[-1])
+        anterior, inicio_ant = linha[primeira:ultima + 1], inicio + primeira
+        anterior[anterior < corte] = _NEG
+    return melhor, fim, celulas
+
+
+def _sementes(seq1, seq2, k):
+    """Posições (i, j) de todas as palavras de `k` símbolos iguais nas duas sequências."""
+    janelas = []
+    for seq in (seq1, seq2):
+        simbolos = np.frombuffer(seq.encode("utf-32-le"), dtype="<u4")
+        janelas.append(np.lib.stride_tricks.sliding_window_view(simbolos, k) if len(seq) >= k
+                       else np.zeros((0, k), dtype="<u4"))
+    # Identificador de cada palavra, comum às duas sequências.
+    _, ids = np.unique(np.concatenate(janelas), axis=0, return_inverse=True)
+    ids1, ids2 = ids[:len(janelas[0])], ids[len(janelas[0]):]
+    ordem = np.argsort(ids1, kind="stable")
+    esquerda = np.searchsorted(ids1[ordem], ids2, "left")
+    contagens = np.searchsorted(ids1[ordem], ids2, "right") - esquerda
+    desvios = np.arange(contagens.sum()) - np.repeat(np.cumsum(contagens) - contagens, contagens)
+    i = ordem[np.repeat(esquerda, contagens) + desvios]
+    j = np.repeat(np.arange(len(ids2)), contagens)
+    return i.astype(np.int64), j.astype(np.int64)
+
+
+def pontuacao_xdrop(seq1: str, seq2: str, match: int = 2, mismatch: int = -3, space: int = -4,
+                    x: int = 20, limiar: int = None, subst=None, k: int = 11):
+    """
+    Score de alinhamento local (sem traceback) por extensão X-drop de sementes.
+
+    Como no BLAST, só são procurados alinhamentos que contêm uma semente:
+    uma palavra de `k` símbolos iguais nas duas sequências. Cada semente é
+    estendida para os dois lados com programação dinâmica (com gaps),
+    linha a linha e só numa janela de colunas vivas; uma célula morre
+    quando o seu score fica mais de `x` abaixo do melhor score dessa
+    extensão (não do melhor global, para que o ruído de uma zona não mate
+    um alinhamento que começa mais adiante). O score de uma semente é o da
+    semente mais o melhor de cada extensão. As sementes já contidas num
+    alinhamento encontrado (mesmas linhas e diagonais) não são estendidas
+    outra vez. Com `x` grande cada extensão é exata; com `x` menor é um
+    limite inferior. O resultado é sempre o score de um alinhamento real,
+    logo nunca passa do de `smith_waterman`.
+
+    As sementes são estendidas por ordem decrescente de um limite superior
+    do score que podem dar (o melhor valor da matriz de substituição por
+    cada símbolo da semente e dos que restam para cada lado). O cálculo
+    para quando esse limite já não passa do melhor score; com `limiar`,
+    para logo que o score o atinja, ou quando nenhuma das sementes que
+    faltam o consegue atingir.
+
+    Args:
+        seq1 (str): Primeira sequência.
+        seq2 (str): Segunda sequência.
+        match (int, optional): Pontuação para match (DNA).
+        mismatch (int, optional): Pontuação para mismatch (DNA).
+        space (int, optional): Penalidade de gap.
+        x (int, optional): Queda máxima em relação ao melhor score de cada extensão.
+        limiar (int | None, optional): Score que basta atingir.
+        subst (dict | MatrizSubstituicao | None, optional): Matriz de substituição.
+        k (int, optional): Comprimento das sementes (por exemplo, 3 para proteínas).
+
+    Returns:
+        ResultadoXDrop: score, células calculadas e motivo da paragem.
+
+    Raises:
+        ValueError: Se `x` for negativo ou `k` não for positivo.
+
+    Example:
+        >>> pontuacao_xdrop("TTTTACGTACGTTTTT", "GGACGTACGGG", k=4)
+        ResultadoXDrop(score=14, celulas=168, paragem='fim')
+    """
+    if x < 0:
+        raise ValueError("x tem de ser maior ou igual a 0")
+    if k < 1:
+        raise ValueError("k tem de ser positivo")
+    if subst is None:
+        subst = escolha_de_matriz(seq1, seq2, match, mismatch)
+    codigos1, codigos2, matriz = _codificar(seq1, seq2, subst)
+    n, m = len(codigos1), len(codigos2)
+    melhor_subst = max(int(matriz.max(initial=0)), 0)
+
+    si, sj = _sementes(seq1, seq2, k)
+    cotas = melhor_subst * (np.minimum(si, sj) + np.minimum(n - si, m - sj))
+    ordem = np.argsort(-cotas, kind="stable")
+
+    melhor, celulas = 0, 0
+    # (primeira linha, última linha, menor diagonal, maior diagonal) de cada alinhamento encontrado.
+    cobertos = []
+    for s in ordem.tolist():
+        if limiar is not None and melhor >= limiar:
+            return ResultadoXDrop(melhor, celulas, "limiar")
+        if limiar is not None and cotas[s] < limiar:
+            return ResultadoXDrop(melhor, celulas, "inalcancavel")
+        if cotas[s] <= melhor:
+            break
+        i, j = int(si[s]), int(sj[s])
+        if any(i0 <= i and i + k <= i1 and d0 <= i - j <= d1 for i0, i1, d0, d1 in cobertos):
+            continue
+        esquerda, (ei, ej), celulas_esq = _extensao(codigos1[:i][::-1], codigos2[:j][::-1], matriz, space, x)
+        direita, (di, dj), celulas_dir = _extensao(codigos1[i + k:], codigos2[j + k:], matriz, space, x)
+        celulas += k + celulas_esq + celulas_dir
+        semente = int(matriz[codigos1[i:i + k], codigos2[j:j + k]].sum())
+        melhor = max(melhor, semente + esquerda + direita)
+        i0, j0, i1, j1 = i - ei, j - ej, i + k + di, j + k + dj
+        cobertos.append((i0, i1, min(i0 - j0, i1 - j1), max(i0 - j0, i1 - j1)))
+    if limiar is not None:
+        return ResultadoXDrop(melhor, celulas, "limiar" if melhor >= limiar else "inalcancavel")
+    return ResultadoXDrop(melhor, celulas, "fim")
@@ -1,5 +1,7 @@
 from collections import defaultdict
 
+from .leitor import como_texto
+
 def novo_indice(sequencia, k=3):
     """
     Cria um índice de k-mers (substrings de tamanho k) de uma sequência.
@@ -25,6 +27,7 @@ def novo_indice(sequencia, k=3):
 
     if k <= 0:  #Verificar se k menor que zero. Caso não parar.
         raise ValueError("k tem de ser > 0")
+    sequencia = como_texto(sequencia)
     indice = defaultdict(list)
     for i in range(len(sequencia) - k + 1):
         indice[sequencia[i:i+k]].append(i)
@@ -54,6 +57,7 @@ def busca_pares(query, subject, k=3):   #Função para encontramos os hits
     """
 
     indice = novo_indice(query, k)
+    subject = como_texto(subject)
     pares = []      #Guardar todos os hits como pares de coordenadas
     for j in range(len(subject) - k + 1):       #Garantir que a ultima sbstring tem k comrpimento
         seccao = subject[j:j+k]
@@ -118,8 +122,8 @@ def alinhamento_pro(query, subject, k=3):       #Serve para executar o blast e d
     devolve `None`.
 
     Args:
-        query (str): Sequência query.
-        subject (str): Sequência subject.
+        query (str | bytes | Registo): Sequência query.
+        subject (str | bytes | Registo): Sequência subject.
         k (int, optional): Tamanho do seed (k-mer). Por omissão é 3.
 
     Returns:
@@ -136,6 +140,7 @@ def alinhamento_pro(query, subject, k=3):       #Serve para executar o blast e d
         {'query_start': 0, 'subject_start': 1, 'tamanho': 4, 'alinhado_q': 'ACGT', 'alinhado_s': 'ACGT'}
     """
 
+    query, subject = como_texto(query), como_texto(subject)
     if len(query) < k or len(subject) < k:
         return None  # não há seeds possiveis
 
@@ -0,0 +1,233 @@
+# Cache de resultados de alinhamentos (LRU em memória + SQLite em disco)
+import hashlib
+import inspect
+import json
+import pickle
+import sqlite3
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+from . import alinhamento, blast
+from .leitor import Registo, como_texto
+from .substituicao import MatrizSubstituicao
+
+# Muda quando o formato das chaves ou dos resultados guardados muda.
+_VERSAO = 1
+
+EstatisticasCache = namedtuple("EstatisticasCache", ["acertos_memoria", "acertos_disco", "falhas", "entradas"])
+EstatisticasCache.__doc__ = """
+Contadores de `CacheAlinhamentos`.
+
+Attributes:
+    acertos_memoria (int): Resultados encontrados na LRU em memória.
+    acertos_disco (int): Resultados encontrados só no ficheiro SQLite.
+    falhas (int): Resultados que tiveram de ser calculados.
+    entradas (int): Resultados guardados atualmente na LRU.
+"""
+
+
+def _serializar(valor):
+    """Representação canónica (bytes) de um argumento, para a chave."""
+    if isinstance(valor, (str, bytes, bytearray, memoryview, Registo)):
+        return b"s" + como_texto(valor).encode("utf-8")
+    if valor is None or isinstance(valor, (bool, int, float)):
+        return b"n" + repr(valor).encode()
+    if isinstance(valor, MatrizSubstituicao):
+        return b"m" + json.dumps(valor.alfabeto).encode("utf-8") + valor.valores.astype(np.int64).tobytes()
+    if isinstance(valor, np.ndarray):
+        return b"a" + f"{valor.dtype.str}{valor.shape}".encode() + np.ascontiguousarray(valor).tobytes()
+    if isinstance(valor, dict):
+        itens = sorted((_serializar(k), _serializar(v)) for k, v in valor.items())
+        return b"d" + _juntar([k + b":" + v for k, v in itens])
+    if isinstance(valor, (list, tuple)):
+        return b"l" + _juntar([_serializar(v) for v in valor])
+    raise TypeError(f"Argumento sem chave de cache: {type(valor).__name__}")
+
+
+def _juntar(partes):
+    """Junta as partes com o comprimento de cada uma (sem ambiguidades)."""
+    return b"".join(len(p).to_bytes(8, "little") + p for p in partes)
+
+
+class CacheAlinhamentos:
+    """
+    Cache de resultados de alinhamentos, endereçada pelo conteúdo.
+
+    A chave é o SHA-256 do nome da função e de todos os argumentos
+    (sequências, parâmetros de pontuação e matriz de substituição, com os
+    valores por omissão preenchidos), pelo que `needleman_wunsch("ACG",
+    "AG")` e `needleman_wunsch("ACG", "AG", match=2)` partilham o resultado.
+    Os resultados ficam serializados (pickle) numa LRU com no máximo
+    `capacidade` entradas; cada acerto devolve uma cópia nova, que pode ser
+    alterada sem estragar a cache. Com `caminho`, cada resultado calculado
+    é também escrito num ficheiro SQLite, consultado quando a chave não
+    está em memória, para ser reutilizado entre execuções. O ficheiro usa
+    o modo WAL com `synchronous=NORMAL` e as escritas são confirmadas em
+    lotes de `lote_escrita` resultados (e em `fechar`), em vez de uma
+    transação por resultado; os resultados ainda por confirmar já são
+    encontrados pela própria cache.
+
+    Args:
+        capacidade (int, optional): Número máximo de resultados em memória.
+        caminho (str | None, optional): Ficheiro SQLite (criado se não existir).
+        lote_escrita (int, optional): Resultados novos por transação no SQLite.
+
+    Raises:
+        ValueError: Se a capacidade for negativa ou `lote_escrita` não for positivo.
+
+    Example:
+        >>> cache = CacheAlinhamentos(capacidade=100)
+        >>> cache.alinhar_par("ACG", "AG", matriz_substituição_dna(2, -1), -2)
+        ('ACG', 'A-G')
+        >>> cache.alinhar_par("ACG", "AG", matriz_substituição_dna(2, -1), -2)
+        ('ACG', 'A-G')
+        >>> cache.estatisticas()
+        EstatisticasCache(acertos_memoria=1, acertos_disco=0, falhas=1, entradas=1)
+    """
+
+    def __init__(self, capacidade: int = 1024, caminho: str = None, lote_escrita: int = 256):
+        if capacidade < 0:
+            raise ValueError("A capacidade não pode ser negativa")
+        if lote_escrita < 1:
+            raise ValueError("lote_escrita tem de ser positivo")
+        self.capacidade = capacidade
+        self.lote_escrita = lote_escrita
+        self._memoria = OrderedDict()
+        self._acertos_memoria = self._acertos_disco = self._falhas = 0
+        self._por_confirmar = 0
+        self._bd = None
+        if caminho is not None:
+            self._bd = sqlite3.connect(caminho)
+            self._bd.execute("PRAGMA journal_mode=WAL")
+            self._bd.execute("PRAGMA synchronous=NORMAL")
+            self._bd.execute("CREATE TABLE IF NOT EXISTS resultados (chave TEXT PRIMARY KEY, valor BLOB NOT NULL)")
+            self._bd.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *erro):
+        self.fechar()
+
+    def fechar(self):
+        """Confirma as escritas pendentes e fecha o SQLite (a cache em memória continua a funcionar)."""
+        if self._bd is not None:
+            self.confirmar()
+            self._bd.close()
+            self._bd = None
+
+    def confirmar(self):
+        """Confirma no SQLite os resultados escritos desde a última transação."""
+        if self._bd is not None and self._por_confirmar:
+            self._bd.commit()
+            self._por_confirmar = 0
+
+    def __len__(self):
+        return len(self._memoria)
+
+    @staticmethod
+    def chave(funcao, *args, **kwargs):
+        """
+        Chave (SHA-256 em hexadecimal) de uma chamada.
+
+        Args:
+            funcao (Callable): Função de alinhamento.
+            *args: Argumentos posicionais da chamada.
+            **kwargs: Argumentos nomeados da chamada.
+
+        Returns:
+            str: A chave.
+
+        Raises:
+            TypeError: Se os argumentos não corresponderem à função ou algum
+                não tiver representação canónica.
+        """
+        argumentos = inspect.signature(funcao).bind(*args, **kwargs)
+        argumentos.apply_defaults()
+        nome = f"{funcao.__module__}.{funcao.__qualname__}:{_VERSAO}".encode()
+        return hashlib.sha256(_juntar([nome] + [
+            nome_arg.encode() + b"=" + _serializar(valor) for nome_arg, valor in argumentos.arguments.items()
+        ])).hexdigest()
+
+    def _guardar_memoria(self, chave, dados):
+        if self.capacidade == 0:
+            return
+        self._memoria[chave] = dados
+        self._memoria.move_to_end(chave)
+        while len(self._memoria) > self.capacidade:
+            self._memoria.popitem(last=False)
+
+    def chamar(self, funcao, *args, **kwargs):
+        """
+        Devolve o resultado de `funcao(*args, **kwargs)`, da cache se possível.
+
+        Args:
+            funcao (Callable): Função de alinhamento (determinística).
+            *args: Argumentos posicionais.
+            **kwargs: Argumentos nomeados.
+
+        Returns:
+            object: O resultado (uma cópia, se vier da cache).
+        """
+        chave = self.chave(funcao, *args, **kwargs)
+        dados = self._memoria.get(chave)
+        if dados is not None:
+            self._memoria.move_to_end(chave)
+            self._acertos_memoria += 1
+            return pickle.loads(dados)
+        if self._bd is not None:
+            linha = self._bd.execute("SELECT valor FROM resultados WHERE chave = ?", (chave,)).fetchone()
+            if linha is not None:
+                self._acertos_disco += 1
+                self._guardar_memoria(chave, linha[0])
+                return pickle.loads(linha[0])
+        self._falhas += 1
+        resultado = funcao(*args, **kwargs)
+        dados = pickle.dumps(resultado, protocol=pickle.HIGHEST_PROTOCOL)
+        self._guardar_memoria(chave, dados)
+        if self._bd is not None:
+            self._bd.execute("INSERT OR REPLACE INTO resultados VALUES (?, ?)", (chave, dados))
+            self._por_confirmar += 1
+            if self._por_confirmar >= self.lote_escrita:
+                self.confirmar()
+        return resultado
+
+    def estatisticas(self):
+        """
+        Acertos e falhas desde a criação (ou desde `limpar`).
+
+        Returns:
+            EstatisticasCache: Contadores da cache.
+        """
+        return EstatisticasCache(self._acertos_memoria, self._acertos_disco, self._falhas, len(self._memoria))
+
+    def limpar(self, disco: bool = False):
+        """
+        Esvazia a LRU em memória e reinicia as estatísticas.
+
+        Args:
+            disco (bool, optional): Se True, apaga também os resultados do SQLite.
+        """
+        self._memoria.clear()
+        self._acertos_memoria = self._acertos_disco = self._falhas = 0
+        if disco and self._bd is not None:
+            self._bd.execute("DELETE FROM resultados")
+            self._bd.commit()
+            self._por_confirmar = 0
+
+    def needleman_wunsch(self, *args, **kwargs):
+        """Como `alinhamento.needleman_wunsch`, com cache."""
+        return self.chamar(alinhamento.needleman_wunsch, *args, **kwargs)
+
+    def smith_waterman(self, *args, **kwargs):
+        """Como `alinhamento.smith_waterman`, com cache."""
+        return self.chamar(alinhamento.smith_waterman, *args, **kwargs)
+
+    def alinhar_par(self, *args, **kwargs):
+        """Como `alinhamento.alinhar_par`, com cache."""
+        return self.chamar(alinhamento.alinhar_par, *args, **kwargs)
+
+    def alinhamento_pro(self, *args, **kwargs):
+        """Como `blast.alinhamento_pro`, com cache."""
+        return self.chamar(blast.alinhamento_pro, *args, **kwargs)
@@ -0,0 +1,192 @@
+# Índice de composição (somas acumuladas) para consultas por janela
+import numpy as np
+
+from .leitor import como_bytes
+
+BASES = "ACGTN"
+
+_CODIGOS = np.full(256, 4, dtype=np.uint8)
+_CODIGOS[list(b"ACGTacgt")] = [0, 1, 2, 3, 0, 1, 2, 3]
+# Uma base por byte de um uint32 (A no byte 0, ..., T no byte 3), para somar
+# as quatro contagens de uma só vez em restos de até 255 bases.
+_UM_QUENTE = np.zeros(256, dtype=np.uint32)
+_UM_QUENTE[list(b"ACGTacgt")] = [1, 1 << 8, 1 << 16, 1 << 24] * 2
+_LOTE = 1 << 15
+
+
+class IndiceComposicao:
+    """
+    Índice de composição de uma sequência de DNA, construído uma única vez.
+
+    Guarda, para cada base A, C, G e T, o número acumulado de ocorrências
+    desde o início da sequência (somas de prefixo). A composição de qualquer
+    intervalo [inicio, fim) é a diferença de dois prefixos, pelo que cada
+    consulta custa O(1), independentemente do tamanho da janela; com
+    `dna_counter` seria preciso voltar a contar a janela inteira.
+
+    Com `amostragem` > 1 só é guardado um prefixo a cada `amostragem` bases
+    (ex.: 64), reduzindo a memória nesse fator; o resto do prefixo é contado
+    na sequência original (no máximo `amostragem` - 1 bases por consulta).
+    As minúsculas contam como a base correspondente (a como A, ...) e os
+    restantes símbolos que não são A, C, G ou T contam como N.
+
+    Args:
+        seq (str | bytes | Registo | PackedSeq): Sequência de DNA.
+        amostragem (int, optional): Distância entre prefixos guardados.
+
+    Raises:
+        ValueError: Se `amostragem` não estiver entre 1 e 256.
+
+    Example:
+        >>> indice = IndiceComposicao("GGCCATNA")
+        >>> indice.contar(0, 4)
+        {'A': 0, 'C': 2, 'G': 2, 'T': 0, 'N': 0}
+        >>> indice.gc(2, 8)
+        0.4
+    """
+
+    def __init__(self, seq, amostragem=1):
+        if not 0 < amostragem <= 256:
+            raise ValueError("amostragem tem de estar entre 1 e 256")
+        self.amostragem = amostragem
+        self._dados = np.frombuffer(como_bytes(seq), dtype=np.uint8)
+        self.n = n = len(self._dados)
+        tipo = np.uint32 if n < 2 ** 32 else np.uint64
+
+        blocos = -(-n // amostragem)
+        codigos = np.full(blocos * amostragem, 4, dtype=np.uint8)
+        codigos[:n] = _CODIGOS[self._dados]
+        codigos = codigos.reshape(blocos, amostragem)
+        self._prefixos = np.zeros((4, blocos + 1), dtype=tipo)
+        for b in range(4):
+            presentes = (codigos[:, 0] == b) if amostragem == 1 else (codigos == b).sum(axis=1, dtype=tipo)
+            np.cumsum(presentes, dtype=tipo, out=self._prefixos[b, 1:])
+        if amostragem == 1:
+            self._dados = None
+
+    def __len__(self):
+        return self.n
+
+    @property
+    def nbytes(self):
+        """int: Memória ocupada pelas somas de prefixo (bytes)."""
+        return self._prefixos.nbytes
+
+    def _prefixo(self, pos):
+        """Contagens de A, C, G, T em [0, pos), para um array de posições (forma 4 x len(pos))."""
+        s = self.amostragem
+        bloco, resto = np.divmod(pos, s)
+        contagem = self._prefixos[:, bloco].astype(np.int64)
+        if s > 1 and resto.any():
+            # Conta o resto de cada prefixo (menos de `s` bases) na sequência original.
+            desvios = np.arange(s - 1)
+            for i in range(0, len(pos), _LOTE):
+                lote = slice(i, i + _LOTE)
+                indices = np.minimum(bloco[lote, None] * s + desvios, max(self.n - 1, 0))
+                bases = np.where(desvios < resto[lote, None], _UM_QUENTE[self._dados[indices]], 0)
+                soma = bases.sum(axis=1, dtype=np.uint32)
+                for b in range(4):
+                    contagem[b, lote] += (soma >> (8 * b)) & 0xFF
+        return contagem
+
+    def _validar(self, inicio, fim):
+        fim = self.n if fim is None else fim
+        if not 0 <= inicio <= fim <= self.n:
+            raise ValueError(f"Intervalo inválido [{inicio}, {fim}) para sequência de comprimento {self.n}")
+        return fim
+
+    def _contagens(self, inicio, fim):
+        fim = self._validar(inicio, fim)
+        acgt = np.diff(self._prefixo(np.array([inicio, fim])), axis=1)[:, 0]
+        return [int(c) for c in acgt] + [fim - inicio - int(acgt.sum())]
+
+    def contar(self, inicio=0, fim=None):
+        """
+        Composição do intervalo [inicio, fim) (base 0), em O(1).
+
+        Args:
+            inicio (int, optional): Primeira posição (incluída).
+            fim (int | None, optional): Última posição (exclusiva). Por omissão, o fim da sequência.
+
+        Returns:
+            dict[str, int]: Contagem de A, C, G, T e N (outros símbolos).
+
+        Raises:
+            ValueError: Se o intervalo estiver fora da sequência.
+        """
+        return dict(zip(BASES, self._contagens(inicio, fim)))
+
+    def gc(self, inicio=0, fim=None):
+        """
+        Conteúdo GC do intervalo, calculado sobre as bases A, C, G e T (sem N).
+
+        Returns:
+            float: (G + C) / (A + C + G + T), ou 0.0 se não houver bases.
+        """
+        a, c, g, t, _ = self._contagens(inicio, fim)
+        return (g + c) / (a + c + g + t) if a + c + g + t else 0.0
+
+    def gc_skew(self, inicio=0, fim=None):
+        """
+        GC skew do intervalo.
+
+        Returns:
+            float: (G - C) / (G + C), ou 0.0 se não houver G nem C.
+        """
+        _, c, g, _, _ = self._contagens(inicio, fim)
+        return (g - c) / (g + c) if g + c else 0.0
+
+    def janelas(self, tamanho, passo=1):
+        """
+        Composição de todas as janelas de `tamanho` bases, com avanço `passo`.
+
+        Todas as janelas são calculadas de uma só vez, como diferenças de
+        prefixos, sem ciclos por janela.
+
+        Args:
+            tamanho (int): Tamanho das janelas.
+            passo (int, optional): Distância entre o início de janelas consecutivas.
+
+        Returns:
+            tuple[numpy.ndarray, numpy.ndarray]: Posição inicial de cada janela e
+            matriz (janelas x 5) com as contagens de A, C, G, T e N.
+
+        Raises:
+            ValueError: Se `tamanho` ou `passo` não forem positivos.
+
+        Example:
+            >>> inicios, contagens = IndiceComposicao("ACGTAC").janelas(4, 2)
+            >>> inicios.tolist(), contagens[:, 1].tolist()
+            ([0, 2], [1, 1])
+        """
+        if tamanho <= 0 or passo <= 0:
+            raise ValueError("tamanho e passo têm de ser positivos")
+        inicios = np.arange(0, max(self.n - tamanho + 1, 0), passo, dtype=np.int64)
+        contagens = np.empty((len(inicios), 5), dtype=np.int64)
+        if len(inicios):
+            acgt = self._prefixo(inicios + tamanho) - self._prefixo(inicios)
+            contagens[:, :4] = acgt.T
+            contagens[:, 4] = tamanho - acgt.sum(axis=0)
+        return inicios, contagens
+
+    def gc_janelas(self, tamanho, passo=1):
+        """
+        Conteúdo GC de todas as janelas (ver `janelas` e `gc`).
+
+        Returns:
+            tuple[numpy.ndarray, numpy.ndarray]: Posições iniciais e conteúdo GC de cada janela.
+        """
+        inicios, c = self.janelas(tamanho, passo)
+        acgt = c[:, :4].sum(axis=1)
+        return inicios, np.divide(c[:, 1] + c[:, 2], acgt, out=np.zeros(len(c)), where=acgt > 0)
+
+    def skew_janelas(self, tamanho, passo=1):
+        """
+        GC skew de todas as janelas (ver `janelas` e `gc_skew`).
+
+        Returns:
+            tuple[numpy.ndarray, numpy.ndarray]: Posições iniciais e GC skew de cada janela.
+        """
+        inicios, c = self.janelas(tamanho, passo)
+        gc = c[:, 1] + c[:, 2]
+        return inicios, np.divide(c[:, 2] - c[:, 1], gc, out=np.zeros(len(c)), where=gc > 0)
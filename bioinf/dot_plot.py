@@ -0,0 +1,371 @@
+# Dot plot por k-mers: janelas idênticas por hashing e stringency por somas ao longo das diagonais
+import os
+import struct
+import zlib
+
+import numpy as np
+
+from .kmers import _rolar
+
+FORMATOS = ("coordenadas", "bits")
+FORMATOS_IMAGEM = ("pgm", "pbm", "png")
+_LINHAS_BLOCO = 1 << 16
+_PONTOS_BLOCO = 1 << 22
+
+
+def _codificar(seq1, seq2):
+    """Códigos 0..sigma-1 dos símbolos das duas sequências (alfabeto comum) e sigma."""
+    texto = seq1 + seq2
+    try:
+        simbolos = np.frombuffer(texto.encode("latin-1"), dtype=np.uint8)
+    except UnicodeEncodeError:
+        simbolos = np.fromiter(map(ord, texto), dtype=np.int64, count=len(texto))
+        alfabeto, codigos = np.unique(simbolos, return_inverse=True)
+        return codigos, len(alfabeto)
+    presentes = np.flatnonzero(np.bincount(simbolos, minlength=256))
+    tabela = np.zeros(256, dtype=np.uint8)
+    tabela[presentes] = np.arange(len(presentes))
+    return tabela[simbolos], len(presentes)
+
+
+def _classes(a, b):
+    """Numera os pares (a[i], b[i]) distintos: pares iguais recebem o mesmo número."""
+    return np.unique(a * (int(b.max(initial=0)) + 1) + b, return_inverse=True)[1]
+
+
+def _ids_kmers(c1, c2, k, sigma):
+    """
+    Identificador de cada k-mer de `c1` e de `c2`: k-mers iguais têm o mesmo identificador.
+
+    Se k símbolos couberem em 64 bits, o identificador é o próprio k-mer
+    empacotado (`kmers._rolar`), calculado para cada sequência em
+    separado. Senão os k-mers das duas sequências juntas são numerados por
+    duplicação, como na construção de suffix arrays: as classes dos
+    blocos de 2m símbolos saem dos pares de classes dos blocos de m.
+    """
+    bits = max(1, (sigma - 1).bit_length())
+    if bits * k <= 64:
+        return tuple(_rolar(c.astype(np.uint64), k, len(c) - k + 1, bits) if len(c) >= k
+                     else np.zeros(0, dtype=np.uint64) for c in (c1, c2))
+    codigos = np.concatenate((c1, c2))
+    total = len(codigos)
+    if total < k:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    ids, feito = None, 0
+    potencia, m = codigos.astype(np.int64), 1
+    while m <= k:
+        if k & m:
+            if ids is None:
+                ids = potencia
+            else:
+                tamanho = total - feito - m + 1
+                ids = _classes(ids[:tamanho], potencia[feito:feito + tamanho])
+            feito += m
+        if 2 * m <= k:
+            tamanho = total - 2 * m + 1
+            potencia = _classes(potencia[:tamanho], potencia[m:m + tamanho])
+        m *= 2
+    return ids[:max(0, len(c1) - k + 1)], ids[len(c1):len(c1) + max(0, len(c2) - k + 1)]
+
+
+def _sementes(ids1, ordem2, ordenados2, a, b):
+    """
+    Pares (i, j) com o mesmo k-mer em seq1[i:] e seq2[j:], para a <= i < b.
+
+    Os k-mers do bloco são ordenados antes da pesquisa binária nos de seq2
+    (já ordenados): as pesquisas seguem então pela mesma ordem, o que é
+    muito mais rápido do que por ordem das posições.
+    """
+    ordem1 = np.argsort(ids1[a:b], kind="stable")
+    chaves = ids1[a:b][ordem1]
+    lo = np.searchsorted(ordenados2, chaves, "left")
+    contagens = np.searchsorted(ordenados2, chaves, "right") - lo
+    total = int(contagens.sum())
+    i = np.repeat(ordem1 + a, contagens)
+    desvios = np.arange(total) - np.repeat(np.cumsum(contagens) - contagens, contagens)
+    return i, ordem2[np.repeat(lo, contagens) + desvios]
+
+
+def _contar_diagonais(c1, c2, i, j, a, b, window, stringency, folga, minimo):
+    """
+    Janelas (p1, p2), com a <= p1 < b, com pelo menos `stringency` posições iguais.
+
+    Cada semente (i, j) só pode pertencer às janelas da sua diagonal com
+    i - folga <= p1 <= i, e cada janela com a stringency pedida tem pelo
+    menos `minimo` sementes na diagonal, a distância <= folga; as outras
+    sementes são descartadas. Os intervalos das restantes são
+    juntos por diagonal e, em cada um, as posições iguais ao longo da
+    diagonal são contadas de uma só vez com uma soma acumulada (todas as
+    diagonais no mesmo array).
+    """
+    n1, n2 = len(c1) - window + 1, len(c2) - window + 1
+    # Sementes ordenadas por diagonal e depois por linha, numa só chave.
+    largura = len(c1) + 2 * folga + 1
+    chaves = np.sort((j - i + len(c1)) * largura + i)
+    if minimo > 1:
+        # As sementes de uma janela são seguidas nesta ordem: fica cada
+        # semente que pertence a `minimo` seguidas a distância <= folga.
+        juntas = chaves[minimo - 1:] - chaves[:len(chaves) - minimo + 1] <= folga
+        marcas = np.zeros(len(chaves) + 1, dtype=np.int32)
+        marcas[:len(juntas)] += juntas
+        marcas[minimo:minimo + len(juntas)] -= juntas
+        chaves = chaves[np.cumsum(marcas[:-1]) > 0]
+    d, i = np.divmod(chaves, largura)
+    d -= len(c1)
+    inicio = np.maximum(np.maximum(i - folga, a), -d)
+    fim = np.minimum(np.minimum(i, b - 1), n2 - 1 - d)
+    validos = inicio <= fim
+    i, d, inicio, fim = i[validos], d[validos], inicio[validos], fim[validos]
+    if len(i) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    # Ao longo de cada diagonal, inicio e fim crescem com i: um novo
+    # intervalo começa quando a diagonal muda ou há um buraco.
+    novo = np.ones(len(i), dtype=bool)
+    novo[1:] = (d[1:] != d[:-1]) | (inicio[1:] > fim[:-1] + 1)
+    grupos = np.flatnonzero(novo)
+    ultimos = np.append(grupos[1:], len(i)) - 1
+    ga, gb, gd = inicio[grupos], fim[ultimos], d[grupos]
+
+    # Posições de seq1 de cada intervalo (ga .. gb + window - 1), todas seguidas.
+    comprimentos = gb - ga + window
+    bases = np.cumsum(comprimentos) - comprimentos
+    grupo = np.repeat(np.arange(len(grupos)), comprimentos)
+    t = np.arange(int(comprimentos.sum())) - bases[grupo] + ga[grupo]
+    iguais = np.zeros(len(t) + 1, dtype=np.int32)
+    np.cumsum(c1[t] == c2[t + gd[grupo]], out=iguais[1:])
+
+    janelas = gb - ga + 1
+    grupo = np.repeat(np.arange(len(grupos)), janelas)
+    desvio = np.arange(int(janelas.sum())) - np.repeat(np.cumsum(janelas) - janelas, janelas)
+    inicio_janela = bases[grupo] + desvio
+    acertos = iguais[inicio_janela + window] - iguais[inicio_janela] >= stringency
+    p1 = ga[grupo][acertos] + desvio[acertos]
+    p2 = p1 + gd[grupo][acertos]
+    ordem = np.lexsort((p2, p1))
+    return p1[ordem], p2[ordem]
+
+
+def _blocos(seq1, seq2, window, stringency):
+    """
+    Gera as coordenadas (p1, p2) das janelas com pelo menos `stringency`
+    posições iguais, por blocos de linhas (p1 crescente) e ordenadas dentro
+    de cada bloco.
+    """
+    n1, n2 = len(seq1) - window + 1, len(seq2) - window + 1
+    if n1 <= 0 or n2 <= 0 or stringency > window:
+        return
+    if stringency <= 0:
+        linhas = max(1, _PONTOS_BLOCO // n2)
+        for a in range(0, n1, linhas):
+            yield np.divmod(np.arange(a * n2, min(a + linhas, n1) * n2, dtype=np.int64), n2)
+        return
+
+    # Uma janela com e = window - stringency diferenças, divididas em e + 1
+    # troços iguais, contém um troço igual com pelo menos k posições e
+    # pelo menos window + 1 - k*(e + 1) k-mers iguais (lema dos q-gramas).
+    diferencas = window - stringency
+    k = -(-stringency // (diferencas + 1))
+    folga = window - k
+    minimo = window + 1 - k * (diferencas + 1)
+    codigos, sigma = _codificar(seq1, seq2)
+    c1, c2 = codigos[:len(seq1)], codigos[len(seq1):]
+    ids1, ids2 = _ids_kmers(c1, c2, k, sigma)
+    ordem2 = np.argsort(ids2, kind="stable")
+    ordenados2 = ids2[ordem2]
+
+    for a in range(0, n1, _LINHAS_BLOCO):
+        b = min(a + _LINHAS_BLOCO, n1)
+        i, j = _sementes(ids1, ordem2, ordenados2, a, min(b + folga, len(ids1)))
+        if folga == 0:
+            ordem = np.argsort(i * n2 + j)
+            yield i[ordem], j[ordem]
+        else:
+            yield _contar_diagonais(c1, c2, i, j, a, b, window, stringency, folga, minimo)
+
+
+def _pontos(seq1, seq2, window, stringency):
+    """Coordenadas (p1, p2) de todos os pontos, por ordem de linha e coluna."""
+    blocos = list(_blocos(seq1, seq2, window, stringency))
+    if not blocos:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    linhas, colunas = zip(*blocos)
+    return np.concatenate(linhas).astype(np.int64), np.concatenate(colunas).astype(np.int64)
+
+
+def _validar(window):
+    if window < 1:
+        raise ValueError("window tem de ser positiva")
+
+
+def _empacotar(linhas, colunas, forma):
+    """Matriz de bits (8 colunas por byte, como `numpy.packbits`) com os pontos dados, ordenados."""
+    largura = (forma[1] + 7) // 8
+    bits = np.zeros((forma[0], largura), dtype=np.uint8)
+    if len(linhas):
+        posicoes = linhas * largura + (colunas >> 3)
+        valores = (128 >> (colunas & 7)).astype(np.uint8)
+        inicios = np.flatnonzero(np.append(True, posicoes[1:] != posicoes[:-1]))
+        bits.ravel()[posicoes[inicios]] = np.bitwise_or.reduceat(valores, inicios)
+    return bits
+
+
+def dot_plot(seq1: str, seq2: str, window: int, stringency: int = None, formato: str = "coordenadas"):
+    """
+    Dot plot com janela deslizante e stringency, sem comparar todos os pares de janelas.
+
+    Há um ponto (p1, p2) se as janelas seq1[p1:p1+window] e
+    seq2[p2:p2+window] tiverem pelo menos `stringency` posições iguais
+    (como em `dot_plot_janela`). Com stringency = window, os pontos são os
+    pares de janelas idênticas, encontrados por hashing: cada janela é
+    reduzida a um identificador (k-mer empacotado num inteiro) e os
+    identificadores de seq2 são ordenados, pelo que cada janela de seq1
+    encontra as iguais por pesquisa binária. Com stringency menor, uma
+    janela com e diferenças contém um troço idêntico de pelo menos
+    ceil(stringency/(e+1)) posições; esses troços servem de sementes e só as
+    janelas das diagonais perto delas são contadas, com somas acumuladas
+    ao longo das diagonais. O trabalho é proporcional ao número de sementes
+    e não a len(seq1)*len(seq2), o que torna possíveis dot plots de genomas
+    de 1 Mb (com sementes longas, ex.: window=stringency=20).
+
+    Args:
+        seq1 (str): Primeira sequência (linhas).
+        seq2 (str): Segunda sequência (colunas).
+        window (int): Tamanho da janela.
+        stringency (int, optional): Número mínimo de posições iguais na
+            janela. Por omissão, igual a `window` (janelas idênticas).
+        formato (str, optional): "coordenadas" (pontos esparsos) ou "bits"
+            (matriz densa empacotada, 1 bit por par de janelas).
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray] | numpy.ndarray: Com
+        "coordenadas", os arrays (p1, p2) dos pontos, por ordem de linha e
+        coluna. Com "bits", um array uint8 de forma
+        (len(seq1)-window+1, ceil((len(seq2)-window+1)/8)), como devolvido
+        por `numpy.packbits(..., axis=1)`.
+
+    Raises:
+        ValueError: Se a janela não for positiva ou o formato for desconhecido.
+
+    Example:
+        >>> p1, p2 = dot_plot("ACGTACGT", "TACG", 3)
+        >>> list(zip(p1.tolist(), p2.tolist()))
+        [(0, 1), (3, 0), (4, 1)]
+        >>> dot_plot("ACGT", "ACGA", 3, 2, formato="bits")
+        array([[128],
+               [ 64]], dtype=uint8)
+    """
+    _validar(window)
+    if formato not in FORMATOS:
+        raise ValueError(f"formato desconhecido: {formato!r} (use {' ou '.join(FORMATOS)})")
+    if stringency is None:
+        stringency = window
+    linhas, colunas = _pontos(seq1, seq2, window, stringency)
+    if formato == "coordenadas":
+        return linhas, colunas
+    forma = (max(0, len(seq1) - window + 1), max(0, len(seq2) - window + 1))
+    return _empacotar(linhas, colunas, forma)
+
+
+def raster_dot_plot(seq1: str, seq2: str, window: int, stringency: int = None,
+                    largura: int = 800, altura: int = None):
+    """
+    Dot plot agregado numa grelha de altura x largura pixels.
+
+    Os pontos de `dot_plot` são gerados por blocos de linhas e cada bloco é
+    logo somado aos pixels onde cai (o pixel (y, x) cobre as janelas com
+    p1*altura // n1 == y e p2*largura // n2 == x, com n1 e n2 os números de
+    janelas). A memória usada é a da grelha mais a de um bloco de pontos,
+    nunca a da matriz n1 x n2, o que permite comparar sequências de
+    dezenas de Mb.
+
+    Args:
+        seq1 (str): Primeira sequência (eixo vertical).
+        seq2 (str): Segunda sequência (eixo horizontal).
+        window (int): Tamanho da janela.
+        stringency (int, optional): Número mínimo de posições iguais
+            (por omissão, igual a `window`).
+        largura (int, optional): Número de colunas da grelha.
+        altura (int, optional): Número de linhas da grelha; por omissão,
+            proporcional aos comprimentos das sequências.
+
+    Returns:
+        numpy.ndarray: Array int64 (altura, largura) com o número de pontos em cada pixel.
+
+    Raises:
+        ValueError: Se a janela ou as dimensões não forem positivas.
+
+    Example:
+        >>> raster_dot_plot("ACGTACGT", "ACGTACGT", 4, largura=2)
+        array([[3, 1],
+               [1, 2]])
+    """
+    _validar(window)
+    if stringency is None:
+        stringency = window
+    n1, n2 = len(seq1) - window + 1, len(seq2) - window + 1
+    if altura is None:
+        altura = max(1, round(largura * n1 / n2)) if n1 > 0 and n2 > 0 else largura
+    if largura < 1 or altura < 1:
+        raise ValueError("largura e altura têm de ser positivas")
+    contagens = np.zeros(altura * largura, dtype=np.int64)
+    for linhas, colunas in _blocos(seq1, seq2, window, stringency):
+        pixeis = (linhas * altura // n1) * largura + colunas * largura // n2
+        contagens += np.bincount(pixeis, minlength=len(contagens))
+    return contagens.reshape(altura, largura)
+
+
+def _bloco_png(tipo, dados):
+    return struct.pack(">I", len(dados)) + tipo + dados + struct.pack(">I", zlib.crc32(tipo + dados))
+
+
+def escrever_imagem(caminho, raster, formato: str = None):
+    """
+    Escreve uma grelha de contagens (ex.: `raster_dot_plot`) como imagem.
+
+    Os pixels sem pontos ficam brancos e os outros mais escuros quanto
+    mais pontos tiverem (escala logarítmica até ao máximo da grelha). O
+    formato PBM só tem preto e branco (preto = pelo menos um ponto). O PNG
+    (cinzentos de 8 bits) é comprimido com `zlib`, sem dependências
+    externas.
+
+    Args:
+        caminho (str | os.PathLike): Ficheiro a escrever.
+        raster (numpy.ndarray): Array 2D de contagens não negativas.
+        formato (str, optional): "pgm", "pbm" ou "png"; por omissão, a
+            extensão do ficheiro.
+
+    Raises:
+        ValueError: Se o formato for desconhecido.
+
+    Example:
+        >>> escrever_imagem("dotplot.png", raster_dot_plot(seq1, seq2, 20, largura=1000))
+    """
+    if formato is None:
+        formato = os.path.splitext(os.fspath(caminho))[1].lstrip(".").lower()
+    if formato not in FORMATOS_IMAGEM:
+        raise ValueError(f"formato desconhecido: {formato!r} (use {', '.join(FORMATOS_IMAGEM)})")
+    raster = np.asarray(raster)
+    altura, largura = raster.shape
+    cabecalho = f"{largura} {altura}\n".encode()
+    if formato == "pbm":
+        with open(caminho, "wb") as f:
+            f.write(b"P4\n" + cabecalho + np.packbits(raster > 0, axis=1).tobytes())
+        return
+
+    escala = np.log1p(raster.astype(np.float64))
+    maximo = escala.max(initial=0)
+    cinzentos = np.full(raster.shape, 255, dtype=np.uint8)
+    if maximo > 0:
+        cinzentos[...] = np.round(255 * (1 - escala / maximo))
+    with open(caminho, "wb") as f:
+        if formato == "pgm":
+            f.write(b"P5\n" + cabecalho + b"255\n" + cinzentos.tobytes())
+            return
+        # Cada linha do PNG começa com o tipo de filtro (0 = nenhum).
+        linhas = np.zeros((altura, largura + 1), dtype=np.uint8)
+        linhas[:, 1:] = cinzentos
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(_bloco_png(b"IHDR", struct.pack(">IIBBBBB", largura, altura, 8, 0, 0, 0, 0)))
+        f.write(_bloco_png(b"IDAT", zlib.compress(linhas.tobytes(), 6)))
+        f.write(_bloco_png(b"IEND", b""))
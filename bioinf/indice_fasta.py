@@ -0,0 +1,237 @@
+# Índice FASTA (compatível com .fai do samtools) e acesso aleatório por regiões
+import mmap
+import os
+from collections import namedtuple
+
+from .leitor import e_gzip
+from .sequencias import reverse_complement
+
+EntradaIndice = namedtuple("EntradaIndice", ["nome", "comprimento", "offset", "bases_linha", "bytes_linha"])
+EntradaIndice.__doc__ = """
+Linha de um índice .fai.
+
+Attributes:
+    nome (str): Nome da sequência.
+    comprimento (int): Número de bases.
+    offset (int): Posição (bytes) da primeira base no ficheiro.
+    bases_linha (int): Bases por linha.
+    bytes_linha (int): Bytes por linha, incluindo a quebra de linha.
+"""
+
+
+def construir_indice(caminho, caminho_indice=None):
+    """
+    Constrói o índice .fai de um ficheiro FASTA e escreve-o em disco.
+
+    O formato é o do `samtools faidx`: uma linha por sequência com
+    nome, comprimento, offset, bases por linha e bytes por linha.
+
+    Args:
+        caminho (str | os.PathLike): Ficheiro FASTA (não comprimido).
+        caminho_indice (str | os.PathLike | None, optional): Onde escrever o índice.
+            Por omissão é `caminho + ".fai"`.
+
+    Returns:
+        list[EntradaIndice]: Entradas do índice, pela ordem do ficheiro.
+
+    Raises:
+        ValueError: Se o ficheiro estiver comprimido, tiver nomes repetidos ou
+            linhas de comprimento irregular dentro de uma sequência.
+    """
+    if e_gzip(caminho):
+        raise ValueError("Ficheiros gzip não podem ser indexados; descomprima primeiro")
+    entradas = []
+    atual = None
+    with open(caminho, "rb", buffering=1 << 20) as f:
+        offset = 0
+        for linha in f:
+            inicio, offset = offset, offset + len(linha)
+            if linha.startswith(b">"):
+                if atual is not None:
+                    entradas.append(_fechar_entrada(atual))
+                nome = linha[1:].split(None, 1)[0].decode() if linha[1:].strip() else ""
+                atual = {"nome": nome, "comprimento": 0, "offset": offset,
+                         "bases_linha": 0, "bytes_linha": 0, "ultima_curta": False}
+                continue
+            if atual is None:
+                if linha.strip():
+                    raise ValueError("Ficheiro FASTA inválido: sequência antes do primeiro cabeçalho")
+                continue
+            bases = len(linha.rstrip(b"\r\n"))
+            if bases == 0:
+                atual["ultima_curta"] = True
+                continue
+            if atual["ultima_curta"]:
+                raise ValueError("Linhas de comprimento irregular na sequência " + atual["nome"])
+            if atual["bases_linha"] == 0:
+                atual["bases_linha"], atual["bytes_linha"] = bases, len(linha)
+            elif bases > atual["bases_linha"] or len(linha) - bases != atual["bytes_linha"] - atual["bases_linha"]:
+                raise ValueError("Linhas de comprimento irregular na sequência " + atual["nome"])
+            atual["ultima_curta"] = bases < atual["bases_linha"]
+            atual["comprimento"] += bases
+    if atual is not None:
+        entradas.append(_fechar_entrada(atual))
+
+    if len({e.nome for e in entradas}) != len(entradas):
+        raise ValueError("Nomes de sequência repetidos no ficheiro FASTA")
+
+    with open(caminho_indice or os.fspath(caminho) + ".fai", "w") as fai:
+        for e in entradas:
+            fai.write("\t".join(map(str, e)) + "\n")
+    return entradas
+
+
+def _fechar_entrada(atual):
+    return EntradaIndice(atual["nome"], atual["comprimento"], atual["offset"],
+                         atual["bases_linha"], atual["bytes_linha"])
+
+
+def ler_indice(caminho_indice):
+    """
+    Lê um índice .fai.
+
+    Args:
+        caminho_indice (str | os.PathLike): Caminho do índice.
+
+    Returns:
+        list[EntradaIndice]: Entradas do índice.
+    """
+    entradas = []
+    with open(caminho_indice) as fai:
+        for linha in fai:
+            campos = linha.rstrip("\n").split("\t")
+            if len(campos) >= 5:
+                entradas.append(EntradaIndice(campos[0], *map(int, campos[1:5])))
+    return entradas
+
+
+def _interpretar_regiao(regiao):
+    """Converte "nome:inicio-fim" (base 1, inclusivo) em (nome, inicio, fim) em base 0."""
+    nome, _, intervalo = regiao.rpartition(":")
+    if not nome or not intervalo:
+        return regiao, 0, None
+    inicio, _, fim = intervalo.replace(",", "").partition("-")
+    return nome, int(inicio) - 1, (int(fim) if fim else None)
+
+
+class FastaIndexado:
+    """
+    Acesso aleatório a regiões de um ficheiro FASTA através do índice .fai.
+
+    O ficheiro é mapeado em memória (mmap); cada consulta calcula, a partir
+    do índice, os bytes exatos da região e lê apenas esses bytes, sem
+    percorrer nem carregar a sequência inteira. Se o índice não existir,
+    é construído.
+
+    Args:
+        caminho (str | os.PathLike): Ficheiro FASTA (não comprimido).
+        caminho_indice (str | os.PathLike | None, optional): Índice .fai.
+
+    Example:
+        >>> with FastaIndexado("genoma.fa") as fa:
+        ...     fa.buscar("chr1", 1000, 1010)
+        'ACGTTGCAAT'
+        >>> fa.regiao("chr1:1001-1010", reverso=True)
+        'ATTGCAACGT'
+    """
+
+    def __init__(self, caminho, caminho_indice=None):
+        caminho_indice = caminho_indice or os.fspath(caminho) + ".fai"
+        if os.path.exists(caminho_indice):
+            entradas = ler_indice(caminho_indice)
+        else:
+            entradas = construir_indice(caminho, caminho_indice)
+        self.indice = {e.nome: e for e in entradas}
+        with open(caminho, "rb") as f:
+            vazio = f.seek(0, 2) == 0
+            self._mm = None if vazio else mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Liberta o mapeamento do ficheiro."""
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+    @property
+    def nomes(self):
+        """list[str]: Nomes das sequências, pela ordem do ficheiro."""
+        return list(self.indice)
+
+    def __contains__(self, nome):
+        return nome in self.indice
+
+    def __len__(self):
+        return len(self.indice)
+
+    def comprimento(self, nome):
+        """Número de bases da sequência `nome`."""
+        return self._entrada(nome).comprimento
+
+    def _entrada(self, nome):
+        try:
+            return self.indice[nome]
+        except KeyError:
+            raise KeyError("Sequência inexistente no índice: " + nome) from None
+
+    def _offset(self, e, pos):
+        if e.bases_linha == 0:
+            return e.offset
+        linha, coluna = divmod(pos, e.bases_linha)
+        return e.offset + linha * e.bytes_linha + coluna
+
+    def buscar(self, nome, inicio=0, fim=None, reverso=False):
+        """
+        Devolve a região [inicio, fim) (base 0) da sequência `nome`.
+
+        Args:
+            nome (str): Nome da sequência.
+            inicio (int, optional): Primeira posição (base 0, incluída).
+            fim (int | None, optional): Última posição (exclusiva). Por omissão
+                é o fim da sequência. Valores fora dos limites são ajustados.
+            reverso (bool, optional): Se True, devolve o complemento reverso
+                da região (mantendo as minúsculas).
+
+        Returns:
+            str: Sequência da região.
+
+        Raises:
+            KeyError: Se a sequência não existir no índice.
+            ValueError: Se `inicio` for maior do que `fim`.
+        """
+        e = self._entrada(nome)
+        fim = e.comprimento if fim is None else min(fim, e.comprimento)
+        inicio = max(inicio, 0)
+        if inicio > fim:
+            raise ValueError("inicio não pode ser maior do que fim")
+        if inicio == fim:
+            return ""
+        bruto = self._mm[self._offset(e, inicio):self._offset(e, fim)]
+        dados = bruto.translate(None, b"\r\n")
+        if reverso:
+            dados = reverse_complement(dados, soft_mask=True)
+        return dados.decode("ascii")
+
+    def regiao(self, regiao, reverso=False):
+        """
+        Devolve uma região no formato do samtools, "nome:inicio-fim" (base 1, inclusivo).
+
+        Args:
+            regiao (str): Região (ex.: "chr1:1001-2000" ou apenas "chr1").
+            reverso (bool, optional): Se True, devolve o complemento reverso.
+
+        Returns:
+            str: Sequência da região.
+        """
+        nome, inicio, fim = _interpretar_regiao(regiao)
+        if nome not in self.indice and regiao in self.indice:
+            nome, inicio, fim = regiao, 0, None
+        return self.buscar(nome, inicio, fim, reverso)
+
+    def __getitem__(self, nome):
+        return self.buscar(nome)
@@ -0,0 +1,313 @@
+# Contagem de k-mers (codificação em 2 bits)
+import numpy as np
+
+from .leitor import Registo, como_bytes
+
+K_MAXIMO = 31
+
+_CODIGOS = np.full(256, 4, dtype=np.uint8)
+_CODIGOS[list(b"ACGTacgt")] = [0, 1, 2, 3, 0, 1, 2, 3]
+_LETRAS = "ACGT"
+
+
+def _validar_k(k):
+    if not 0 < k <= K_MAXIMO:
+        raise ValueError(f"k tem de estar entre 1 e {K_MAXIMO}")
+
+
+def codificar_kmer(kmer):
+    """
+    Codifica um k-mer de DNA como inteiro (2 bits por base, A=0 C=1 G=2 T=3).
+
+    Args:
+        kmer (str): k-mer com símbolos A, C, G ou T.
+
+    Returns:
+        int: Código do k-mer.
+
+    Raises:
+        ValueError: Se o k-mer for vazio, maior do que `K_MAXIMO` ou tiver outros símbolos.
+
+    Example:
+        >>> codificar_kmer("ACGT")
+        27
+    """
+    _validar_k(len(kmer))
+    codigo = 0
+    for base in kmer.upper():
+        if base not in _LETRAS:
+            raise ValueError("Símbolo inválido no k-mer: " + base)
+        codigo = (codigo << 2) | _LETRAS.index(base)
+    return codigo
+
+
+def descodificar_kmer(codigo, k):
+    """
+    Operação inversa de `codificar_kmer`.
+
+    Example:
+        >>> descodificar_kmer(27, 4)
+        'ACGT'
+    """
+    return "".join(_LETRAS[(int(codigo) >> (2 * (k - 1 - i))) & 3] for i in range(k))
+
+
+def complemento_reverso_kmer(codigo, k):
+    """
+    Calcula o código do complemento reverso de um k-mer codificado.
+
+    Example:
+        >>> descodificar_kmer(complemento_reverso_kmer(codificar_kmer("AAC"), 3), 3)
+        'GTT'
+    """
+    rc = 0
+    for _ in range(k):
+        rc = (rc << 2) | (3 - (codigo & 3))
+        codigo >>= 2
+    return rc
+
+
+def codigos_kmers(seq, k, canonico=True):
+    """
+    Calcula o código de todos os k-mers válidos de uma sequência.
+
+    A atualização rolante `kmer = (kmer << 2) | base` é aplicada em simultâneo
+    a todas as posições com arrays NumPy `uint64`, em vez de um ciclo por
+    base. Os k-mers que contêm símbolos fora de ACGT (ex.: N) são
+    descartados. Com `canonico=True`, cada k-mer é substituído pelo menor
+    entre ele e o seu complemento reverso.
+
+    Args:
+        seq (str | bytes | Registo): Sequência de DNA.
+        k (int): Tamanho dos k-mers (1 a `K_MAXIMO`).
+        canonico (bool, optional): Junta cada k-mer com o complemento reverso.
+
+    Returns:
+        numpy.ndarray: Códigos `uint64`, pela ordem das posições.
+    """
+    _validar_k(k)
+    codigos = _CODIGOS[np.frombuffer(como_bytes(seq), dtype=np.uint8)]
+    n = len(codigos) - k + 1
+    if n <= 0:
+        return np.zeros(0, dtype=np.uint64)
+
+    base = codigos.astype(np.uint64)
+    direto = _rolar(base, k, n)
+    if canonico:
+        # O complemento reverso na posição i é o k-mer direto da sequência
+        # complementar invertida, na posição n-1-i.
+        complemento = np.uint64(3) - np.minimum(base, np.uint64(3))
+        reverso = _rolar(complemento[::-1], k, n)[::-1]
+
+    invalidos = np.concatenate(([0], np.cumsum(codigos == 4)))
+    validos = invalidos[k:] == invalidos[:n]
+    if canonico:
+        np.minimum(direto, reverso, out=direto)
+    return direto[validos]
+
+
+def _rolar(base, k, n, bits=2):
+    """
+    Aplica `kmer = (kmer << bits) | base` k vezes a todas as posições.
+
+    Em vez de k passos, junta blocos de tamanho 1, 2, 4, 8, ... (a
+    decomposição binária de k), o que reduz o número de operações
+    vetoriais para O(log k). Exige k*bits <= 64.
+    """
+    total = len(base)
+    kmers, feito = None, 0
+    potencia, m = base, 1
+    while m <= k:
+        if k & m:
+            if kmers is None:
+                kmers = potencia
+            else:
+                tamanho = total - feito - m + 1
+                kmers = (kmers[:tamanho] << np.uint64(bits * m)) | potencia[feito:feito + tamanho]
+            feito += m
+        if 2 * m <= k:
+            tamanho = total - 2 * m + 1
+            potencia = (potencia[:tamanho] << np.uint64(bits * m)) | potencia[m:m + tamanho]
+        m *= 2
+    return kmers[:n].copy()
+
+
+def _reduzir(kmers, contagens):
+    """Ordena e junta k-mers repetidos, somando as contagens."""
+    if len(kmers) == 0:
+        return kmers, contagens
+    ordem = np.argsort(kmers, kind="stable")
+    kmers, contagens = kmers[ordem], contagens[ordem]
+    inicio = np.ones(len(kmers), dtype=bool)
+    inicio[1:] = kmers[1:] != kmers[:-1]
+    posicoes = np.flatnonzero(inicio)
+    return kmers[posicoes], np.add.reduceat(contagens, posicoes)
+
+
+class ContadorKmers:
+    """
+    Contador de k-mers com codificação inteira em 2 bits (k <= 31).
+
+    As contagens são guardadas em dois arrays ordenados (códigos `uint64` e
+    contagens `int64`), obtidos por ordenação e redução, em vez de um
+    dicionário de substrings como em `blast.novo_indice`. Os k-mers de cada
+    sequência adicionada ficam pendentes e só são juntos à tabela quando
+    ela é consultada ou quando os pendentes passam o tamanho da tabela (ou
+    `tamanho_bloco`), pelo que adicionar muitas sequências curtas (reads,
+    contigs) não reordena a tabela inteira de cada vez.
+
+    Args:
+        k (int): Tamanho dos k-mers.
+        canonico (bool, optional): Se True, cada k-mer é contado junto com o
+            seu complemento reverso (forma canónica = o menor dos dois).
+        tamanho_bloco (int, optional): Número de bases processadas de cada vez.
+
+    Raises:
+        ValueError: Se k não estiver entre 1 e `K_MAXIMO`.
+
+    Example:
+        >>> c = ContadorKmers(2, canonico=False)
+        >>> c.adicionar("ATATA")
+        >>> c.top(2)
+        [('AT', 2), ('TA', 2)]
+    """
+
+    def __init__(self, k, canonico=True, tamanho_bloco=1 << 22):
+        _validar_k(k)
+        self.k = k
+        self.canonico = canonico
+        self.tamanho_bloco = max(tamanho_bloco, k)
+        self._kmers = np.zeros(0, dtype=np.uint64)
+        self._contagens = np.zeros(0, dtype=np.int64)
+        # k-mers distintos e contagens de cada bloco ainda não juntos à tabela.
+        self._pendentes = []
+        self._n_pendentes = 0
+
+    def adicionar(self, seq):
+        """
+        Conta os k-mers de uma sequência (str, bytes ou `Registo`).
+
+        Sequências longas são processadas em blocos com sobreposição de k-1
+        bases, para limitar a memória temporária.
+        """
+        dados = memoryview(como_bytes(seq))
+        passo = self.tamanho_bloco
+        for inicio in range(0, max(len(dados) - self.k + 1, 0), passo):
+            bloco = dados[inicio:inicio + passo + self.k - 1]
+            kmers, n = np.unique(codigos_kmers(bloco, self.k, self.canonico), return_counts=True)
+            self._pendentes.append((kmers, n.astype(np.int64)))
+            self._n_pendentes += len(kmers)
+            if self._n_pendentes > max(self.tamanho_bloco, len(self._kmers)):
+                self._consolidar()
+
+    def _consolidar(self):
+        """Junta os k-mers pendentes à tabela ordenada (uma só ordenação)."""
+        if not self._pendentes:
+            return
+        kmers, contagens = zip(*self._pendentes)
+        self._kmers, self._contagens = _reduzir(np.concatenate((self._kmers,) + kmers),
+                                                np.concatenate((self._contagens,) + contagens))
+        self._pendentes = []
+        self._n_pendentes = 0
+
+    def _codigo(self, kmer):
+        codigo = codificar_kmer(kmer)
+        if len(kmer) != self.k:
+            raise ValueError(f"O k-mer deve ter comprimento {self.k}")
+        if self.canonico:
+            codigo = min(codigo, complemento_reverso_kmer(codigo, self.k))
+        return codigo
+
+    def __getitem__(self, kmer):
+        codigo = np.uint64(self._codigo(kmer))
+        self._consolidar()
+        pos = np.searchsorted(self._kmers, codigo)
+        if pos < len(self._kmers) and self._kmers[pos] == codigo:
+            return int(self._contagens[pos])
+        return 0
+
+    def __len__(self):
+        self._consolidar()
+        return len(self._kmers)
+
+    @property
+    def total(self):
+        """int: Número total de k-mers contados."""
+        self._consolidar()
+        return int(self._contagens.sum())
+
+    def items(self):
+        """
+        Devolve todos os k-mers e contagens, ordenados pelo código.
+
+        Returns:
+            tuple[numpy.ndarray, numpy.ndarray]: (códigos, contagens).
+        """
+        self._consolidar()
+        return self._kmers.copy(), self._contagens.copy()
+
+    def top(self, n):
+        """
+        Devolve os n k-mers mais frequentes.
+
+        Em caso de empate, os k-mers ficam por ordem alfabética.
+
+        Args:
+            n (int): Número de k-mers a devolver.
+
+        Returns:
+            list[tuple[str, int]]: Pares (k-mer, contagem) por ordem decrescente.
+        """
+        self._consolidar()
+        if n <= 0 or len(self._kmers) == 0:
+            return []
+        n = min(n, len(self._kmers))
+        candidatos = np.argpartition(-self._contagens, n - 1)[:n]
+        limite = self._contagens[candidatos].min()
+        # Inclui todos os empatados com o limite para desempatar pelo código.
+        candidatos = np.flatnonzero(self._contagens >= limite)
+        ordem = candidatos[np.lexsort((self._kmers[candidatos], -self._contagens[candidatos]))][:n]
+        return [(descodificar_kmer(self._kmers[i], self.k), int(self._contagens[i])) for i in ordem]
+
+    def espectro(self):
+        """
+        Calcula o espectro de k-mers (histograma das multiplicidades).
+
+        Returns:
+            dict[int, int]: Para cada multiplicidade, o número de k-mers
+            distintos que ocorrem esse número de vezes.
+
+        Example:
+            >>> c = ContadorKmers(1, canonico=False)
+            >>> c.adicionar("AAC")
+            >>> c.espectro()
+            {1: 1, 2: 1}
+        """
+        self._consolidar()
+        multiplicidades, frequencias = np.unique(self._contagens, return_counts=True)
+        return {int(m): int(f) for m, f in zip(multiplicidades, frequencias)}
+
+
+def contar_kmers(seqs, k, canonico=True):
+    """
+    Conta os k-mers de uma ou várias sequências.
+
+    Args:
+        seqs (str | bytes | Registo | Iterable): Sequência ou iterável de sequências
+            (por exemplo, os registos de `leitor.ler_fasta`).
+        k (int): Tamanho dos k-mers.
+        canonico (bool, optional): Junta cada k-mer com o complemento reverso.
+
+    Returns:
+        ContadorKmers: Contador com todas as sequências adicionadas.
+
+    Example:
+        >>> contar_kmers("ACGTT", 2)["AA"]
+        1
+    """
+    contador = ContadorKmers(k, canonico)
+    if isinstance(seqs, (str, bytes, bytearray, memoryview, Registo)):
+        seqs = [seqs]
+    for seq in seqs:
+        contador.adicionar(seq)
+    return contador
@@ -0,0 +1,309 @@
+# Leitura de ficheiros FASTA/FASTQ
+import gzip
+import io
+import mmap
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_QUEBRAS = b"\r\n"
+_ESPACOS = b" \t\r\n"
+
+
+class Registo:
+    """
+    Registo de um ficheiro FASTA/FASTQ.
+
+    A sequência (e a qualidade, em FASTQ) é guardada como `memoryview`,
+    pelo que pode apontar diretamente para o ficheiro mapeado em memória
+    sem cópias. As funções de `sequencias`, `motifs` e `blast` aceitam
+    um `Registo` no lugar de uma `str`.
+
+    Attributes:
+        nome (str): Identificador (primeira palavra do cabeçalho).
+        descricao (str): Resto do cabeçalho ("" se não existir).
+        seq (memoryview): Sequência, sem quebras de linha.
+        qual (memoryview | None): Qualidades (apenas FASTQ).
+
+    Example:
+        >>> r = Registo("seq1", "", memoryview(b"ACGT"))
+        >>> len(r), str(r)
+        (4, 'ACGT')
+    """
+
+    __slots__ = ("nome", "descricao", "seq", "qual")
+
+    def __init__(self, nome, descricao, seq, qual=None):
+        self.nome = nome
+        self.descricao = descricao
+        self.seq = seq
+        self.qual = qual
+
+    def __len__(self):
+        return len(self.seq)
+
+    def __bytes__(self):
+        return bytes(self.seq)
+
+    def __str__(self):
+        return str(self.seq, "ascii")
+
+    def __repr__(self):
+        return f"Registo(nome={self.nome!r}, comprimento={len(self.seq)})"
+
+
+def como_texto(seq):
+    """
+    Converte uma sequência (str, bytes, memoryview ou `Registo`) em `str`.
+
+    Args:
+        seq (str | bytes | bytearray | memoryview | Registo): Sequência.
+
+    Returns:
+        str: Sequência como texto.
+
+    Example:
+        >>> como_texto(memoryview(b"ACGT"))
+        'ACGT'
+    """
+    if isinstance(seq, str):
+        return seq
+    if isinstance(seq, Registo):
+        seq = seq.seq
+    return str(seq, "ascii")
+
+
+def como_bytes(seq):
+    """
+    Converte uma sequência (str, bytes, memoryview ou `Registo`) num objeto bytes-like.
+
+    Símbolos não ASCII de uma `str` são substituídos por '?'. Objetos
+    bytes-like e registos são devolvidos sem cópia.
+
+    Args:
+        seq (str | bytes | bytearray | memoryview | Registo): Sequência.
+
+    Returns:
+        bytes | bytearray | memoryview: Sequência como bytes.
+
+    Example:
+        >>> como_bytes("ACGT")
+        b'ACGT'
+    """
+    if isinstance(seq, str):
+        return seq.encode("ascii", "replace")
+    if isinstance(seq, Registo):
+        return seq.seq
+    if isinstance(seq, (bytes, bytearray, memoryview)):
+        return seq
+    return bytes(seq)
+
+
+def abrir(caminho, tamanho_buffer=1 << 20):
+    """
+    Abre um ficheiro em modo binário com buffer grande, descomprimindo gzip.
+
+    O formato gzip é detetado pelos bytes mágicos, não pela extensão.
+
+    Args:
+        caminho (str | os.PathLike): Caminho do ficheiro.
+        tamanho_buffer (int, optional): Tamanho do buffer de leitura (bytes).
+
+    Returns:
+        io.BufferedReader: Ficheiro aberto para leitura binária.
+    """
+    if e_gzip(caminho):
+        return io.BufferedReader(gzip.open(caminho, "rb"), tamanho_buffer)
+    return open(caminho, "rb", buffering=tamanho_buffer)
+
+
+def e_gzip(caminho):
+    with open(caminho, "rb") as f:
+        return f.read(2) == _GZIP_MAGIC
+
+
+def _cabecalho(linha):
+    """Divide a linha de cabeçalho (sem '>'/'@') em (nome, descricao)."""
+    partes = bytes(linha[1:]).strip().split(None, 1)
+    if not partes:
+        return "", ""
+    nome = partes[0].decode()
+    descricao = partes[1].decode() if len(partes) > 1 else ""
+    return nome, descricao
+
+
+def _mapear(caminho):
+    """Mapeia o ficheiro em memória (ou devolve None se estiver vazio)."""
+    with open(caminho, "rb") as f:
+        if f.seek(0, 2) == 0:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _fim_linha(mm, inicio, n):
+    """Devolve (fim_sem_quebra, inicio_proxima_linha) da linha em `inicio`."""
+    fim = mm.find(b"\n", inicio)
+    proxima = n if fim < 0 else fim + 1
+    fim = n if fim < 0 else fim
+    if fim > inicio and mm[fim - 1] == 13:
+        fim -= 1
+    return fim, proxima
+
+
+def _saltar_espacos(mm, pos, n):
+    while pos < n and mm[pos] in _ESPACOS:
+        pos += 1
+    return pos
+
+
+def _fasta_mmap(mm):
+    n = len(mm)
+    vista = memoryview(mm)
+    pos = _saltar_espacos(mm, 0, n)
+    while pos < n:
+        if mm[pos] != ord(">"):
+            raise ValueError("Ficheiro FASTA inválido: cabeçalho esperado na posição " + str(pos))
+        fim_cab, inicio = _fim_linha(mm, pos, n)
+        nome, descricao = _cabecalho(mm[pos:fim_cab])
+
+        seguinte = mm.find(b"\n>", inicio - 1)
+        fim = n if seguinte < 0 else seguinte + 1
+        fim_seq = fim
+        while fim_seq > inicio and mm[fim_seq - 1] in _ESPACOS:
+            fim_seq -= 1
+
+        if mm.find(b"\n", inicio, fim_seq) < 0 and mm.find(b"\r", inicio, fim_seq) < 0:
+            seq = vista[inicio:fim_seq]
+        else:
+            seq = memoryview(mm[inicio:fim_seq].translate(None, _QUEBRAS))
+        yield Registo(nome, descricao, seq)
+        pos = fim
+
+
+def _fasta_stream(f):
+    nome = descricao = None
+    partes = []
+    for linha in f:
+        if linha.startswith(b">"):
+            if nome is not None:
+                yield Registo(nome, descricao, memoryview(b"".join(partes)))
+            nome, descricao = _cabecalho(linha)
+            partes = []
+        elif nome is not None:
+            partes.append(linha.rstrip(_QUEBRAS))
+        elif linha.strip():
+            raise ValueError("Ficheiro FASTA inválido: cabeçalho esperado")
+    if nome is not None:
+        yield Registo(nome, descricao, memoryview(b"".join(partes)))
+
+
+def _fastq_mmap(mm):
+    n = len(mm)
+    vista = memoryview(mm)
+    pos = _saltar_espacos(mm, 0, n)
+    while pos < n:
+        if mm[pos] != ord("@"):
+            raise ValueError("Ficheiro FASTQ inválido: '@' esperado na posição " + str(pos))
+        fim_cab, inicio_seq = _fim_linha(mm, pos, n)
+        fim_seq, inicio_mais = _fim_linha(mm, inicio_seq, n)
+        _, inicio_qual = _fim_linha(mm, inicio_mais, n)
+        fim_qual, proximo = _fim_linha(mm, inicio_qual, n)
+        if inicio_mais >= n or mm[inicio_mais] != ord("+") or fim_qual - inicio_qual != fim_seq - inicio_seq:
+            raise ValueError("Ficheiro FASTQ inválido no registo da posição " + str(pos))
+        nome, descricao = _cabecalho(mm[pos:fim_cab])
+        yield Registo(nome, descricao, vista[inicio_seq:fim_seq], vista[inicio_qual:fim_qual])
+        pos = _saltar_espacos(mm, proximo, n)
+
+
+def _fastq_stream(f):
+    for cab in f:
+        if not cab.strip():
+            continue
+        seq = f.readline().rstrip(_QUEBRAS)
+        mais = f.readline()
+        qual = f.readline().rstrip(_QUEBRAS)
+        if not cab.startswith(b"@") or not mais.startswith(b"+") or len(qual) != len(seq):
+            raise ValueError("Ficheiro FASTQ inválido")
+        nome, descricao = _cabecalho(cab)
+        yield Registo(nome, descricao, memoryview(seq), memoryview(qual))
+
+
+def _ler(caminho, tamanho_buffer, usar_mmap, por_mmap, por_stream):
+    if usar_mmap and not e_gzip(caminho):
+        mm = _mapear(caminho)
+        if mm is not None:
+            # O mmap não é fechado explicitamente: as memoryviews devolvidas
+            # mantêm-no vivo enquanto forem usadas.
+            yield from por_mmap(mm)
+        return
+    with abrir(caminho, tamanho_buffer) as f:
+        yield from por_stream(f)
+
+
+def ler_fasta(caminho, tamanho_buffer=1 << 20, usar_mmap=True):
+    """
+    Lê um ficheiro FASTA (opcionalmente gzip) registo a registo.
+
+    Ficheiros não comprimidos são mapeados em memória (mmap) e as sequências
+    em linha única são devolvidas como vistas sem cópia. Sequências em várias
+    linhas e ficheiros gzip são lidos com buffer grande; a memória usada
+    depende apenas do maior registo, não do tamanho do ficheiro.
+
+    Args:
+        caminho (str | os.PathLike): Caminho do ficheiro FASTA.
+        tamanho_buffer (int, optional): Tamanho do buffer de leitura (bytes).
+        usar_mmap (bool, optional): Se False, usa sempre leitura em stream.
+
+    Yields:
+        Registo: Um registo por sequência, pela ordem do ficheiro.
+
+    Raises:
+        ValueError: Se o ficheiro não estiver em formato FASTA.
+
+    Example:
+        >>> for r in ler_fasta("genoma.fa.gz"):
+        ...     dna_counter(r)
+    """
+    return _ler(caminho, tamanho_buffer, usar_mmap, _fasta_mmap, _fasta_stream)
+
+
+def ler_fastq(caminho, tamanho_buffer=1 << 20, usar_mmap=True):
+    """
+    Lê um ficheiro FASTQ (4 linhas por registo, opcionalmente gzip).
+
+    Args:
+        caminho (str | os.PathLike): Caminho do ficheiro FASTQ.
+        tamanho_buffer (int, optional): Tamanho do buffer de leitura (bytes).
+        usar_mmap (bool, optional): Se False, usa sempre leitura em stream.
+
+    Yields:
+        Registo: Um registo por read, com `seq` e `qual`.
+
+    Raises:
+        ValueError: Se algum registo estiver mal formado.
+    """
+    return _ler(caminho, tamanho_buffer, usar_mmap, _fastq_mmap, _fastq_stream)
+
+
+def ler_sequencias(caminho, tamanho_buffer=1 << 20, usar_mmap=True):
+    """
+    Lê um ficheiro FASTA ou FASTQ, detetando o formato pelo primeiro símbolo.
+
+    Args:
+        caminho (str | os.PathLike): Caminho do ficheiro.
+        tamanho_buffer (int, optional): Tamanho do buffer de leitura (bytes).
+        usar_mmap (bool, optional): Se False, usa sempre leitura em stream.
+
+    Returns:
+        Iterator[Registo]: Registos do ficheiro.
+
+    Raises:
+        ValueError: Se o formato não for reconhecido.
+    """
+    with abrir(caminho, tamanho_buffer) as f:
+        inicio = f.read(1 << 12).lstrip(_ESPACOS)[:1]
+    if inicio == b">":
+        return ler_fasta(caminho, tamanho_buffer, usar_mmap)
+    if inicio == b"@":
+        return ler_fastq(caminho, tamanho_buffer, usar_mmap)
+    if not inicio:
+        return iter(())
+    raise ValueError("Formato não reconhecido (esperado FASTA ou FASTQ)")
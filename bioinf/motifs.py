@@ -3,6 +3,8 @@ import re
 import math
 from collections import Counter
 
+from .leitor import como_texto
+
 # Padrões com ambiguidades
 
 IUPAC = {
@@ -17,7 +19,7 @@ IUPAC = {
 def _clean_seq(seq):
     if seq is None:
         raise TypeError("seq não pode ser None")
-    return seq.upper().strip()
+    return como_texto(seq).upper().strip()
 
 
 def _find_overlapping_positions(seq, rgx):
@@ -57,7 +59,7 @@ def find_overlapping(seq, pat_iupac):
     Encontra todas as ocorrências (com sobreposição) de um padrão IUPAC numa sequência.
 
     Args:
-        seq (str): Sequência alvo (DNA).
+        seq (str | bytes | Registo): Sequência alvo (DNA).
         pat_iupac (str): Padrão IUPAC (DNA).
 
     Returns:
@@ -122,7 +124,7 @@ def find_prosite(seq, prosite):
     Encontra todas as ocorrências (com sobreposição) de um padrão PROSITE numa sequência.
 
     Args:
-        seq (str): Sequência alvo (proteína, tipicamente).
+        seq (str | bytes | Registo): Sequência alvo (proteína, tipicamente).
         prosite (str): Padrão PROSITE (mínimo).
 
     Returns:
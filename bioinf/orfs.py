@@ -0,0 +1,210 @@
+# Pesquisa de ORFs (open reading frames) nas duas cadeias
+import itertools
+from collections import namedtuple
+
+import numpy as np
+
+from .leitor import como_bytes, ler_fasta
+from .traducao import CODAO_INVALIDO, codao_para_aminoacido, codificar_bases, indices_codoes
+
+ORF = namedtuple("ORF", ["cadeia", "fase", "inicio", "fim"])
+ORF.__doc__ = """
+ORF encontrada por `encontrar_orfs`.
+
+Attributes:
+    cadeia (str): "+" (cadeia direta) ou "-" (complemento reverso).
+    fase (int): Fase de leitura (1, 2 ou 3), como em `traducao.traduzir`
+        (na cadeia "-" corresponde à fase -1, -2 ou -3).
+    inicio (int): Posição inicial na cadeia direta (base 0, incluída).
+    fim (int): Posição final na cadeia direta (exclusiva). O intervalo
+        inclui o codão de início e o codão stop.
+"""
+
+_INICIO, _STOP, _INICIO_RC, _STOP_RC = 1, 2, 4, 8
+
+
+def _indice(codao):
+    codao = codao.upper().replace("U", "T")
+    if len(codao) != 3 or set(codao) - set("ACGT"):
+        raise ValueError("Codão inválido: " + codao)
+    return int(indices_codoes(codificar_bases(codao))[0])
+
+
+def _indice_rc(i):
+    return ((3 - (i & 3)) << 4) | ((3 - ((i >> 2) & 3)) << 2) | (3 - (i >> 4))
+
+
+def _tabela_eventos(inicios, stops, tabela):
+    """Tabela de 65 entradas: para cada índice de codão, os bits de início/stop nas duas cadeias."""
+    if stops is None:
+        stops = ["".join(c) for c in itertools.product("ACGT", repeat=3)
+                 if codao_para_aminoacido("".join(c), tabela) == "*"]
+    eventos = np.zeros(CODAO_INVALIDO + 1, dtype=np.uint8)
+    for codao in inicios:
+        i = _indice(codao)
+        eventos[i] |= _INICIO
+        eventos[_indice_rc(i)] |= _INICIO_RC
+    for codao in stops:
+        i = _indice(codao)
+        eventos[i] |= _STOP
+        eventos[_indice_rc(i)] |= _STOP_RC
+    return eventos
+
+
+def _eventos_bloco(codigos, eventos):
+    """Tipo de evento (bits) de cada codão que começa em cada posição do bloco."""
+    invalido = codigos == 4
+    indices = (codigos[:-2] << 4) | (codigos[1:-1] << 2) | codigos[2:]
+    indices[invalido[:-2] | invalido[1:-1] | invalido[2:]] = CODAO_INVALIDO
+    return eventos[indices]
+
+
+def _direta(pos_inicios, pos_stops, aberto):
+    """
+    ORFs da cadeia direta numa fase: cada stop fecha a ORF que começa no
+    primeiro codão de início depois do stop anterior.
+
+    Devolve (inicios, stops, novo_aberto).
+    """
+    grupo = np.searchsorted(pos_stops, pos_inicios)
+    grupos, primeiro = np.unique(grupo, return_index=True)
+    inicios = pos_inicios[primeiro]
+    if aberto is not None:
+        if len(grupos) and grupos[0] == 0:
+            inicios[0] = aberto
+        else:
+            grupos = np.concatenate(([0], grupos))
+            inicios = np.concatenate(([aberto], inicios))
+    fechado = grupos < len(pos_stops)
+    novo = int(inicios[-1]) if len(grupos) and not fechado[-1] else None
+    return inicios[fechado], pos_stops[grupos[fechado]], novo
+
+
+def _reversa(pos_inicios, pos_stops, ultimo_stop, pendente):
+    """
+    ORFs do complemento reverso numa fase, lida da esquerda para a direita:
+    entre dois stops consecutivos, a ORF vai do stop da esquerda até ao
+    último codão de início antes do stop seguinte.
+
+    Devolve (stops, inicios, fechos, novo_ultimo_stop, novo_pendente).
+    """
+    grupo = np.searchsorted(pos_stops, pos_inicios)
+    # Último início de cada grupo (os inícios estão ordenados).
+    ultimo = np.ones(len(grupo), dtype=bool)
+    ultimo[:-1] = grupo[1:] != grupo[:-1]
+    grupos, inicios = grupo[ultimo], pos_inicios[ultimo]
+    if pendente is not None and not (len(grupos) and grupos[0] == 0):
+        grupos = np.concatenate(([0], grupos))
+        inicios = np.concatenate(([pendente], inicios))
+
+    anteriores = np.concatenate(([-1 if ultimo_stop is None else ultimo_stop], pos_stops))[grupos]
+    fechado = (grupos < len(pos_stops)) & (anteriores >= 0)
+    aberto = grupos == len(pos_stops)
+    novo_pendente = int(inicios[aberto][0]) if aberto.any() else None
+    novo_ultimo = int(pos_stops[-1]) if len(pos_stops) else ultimo_stop
+    return (anteriores[fechado], inicios[fechado], pos_stops[grupos[fechado]],
+            novo_ultimo, novo_pendente)
+
+
+def encontrar_orfs(seq, comprimento_minimo=75, inicios=("ATG",), stops=None, tabela=1,
+                   tamanho_bloco=1 << 22):
+    """
+    Procura ORFs nas seis fases de leitura, num único passo sobre a sequência.
+
+    A sequência é percorrida em blocos: em cada bloco, o codão de cada
+    posição é convertido no seu índice de 6 bits e uma tabela de consulta
+    indica se é início ou stop na cadeia direta ou, através do complemento
+    reverso do codão, na cadeia reversa. Só as posições com eventos são
+    processadas; de um bloco para o seguinte passa apenas um pequeno estado
+    por fase. As proteínas traduzidas e o complemento reverso da sequência
+    nunca são construídos, pelo que a memória usada depende de
+    `tamanho_bloco` e não do tamanho da sequência.
+
+    Para cada stop é devolvida a ORF mais longa (a partir do primeiro codão
+    de início após o stop anterior na mesma fase). Só são devolvidas ORFs
+    completas, com início e stop. As ORFs são produzidas à medida que ficam
+    fechadas, ordenadas pela posição onde isso acontece.
+
+    Args:
+        seq (str | bytes | Registo): Sequência de DNA.
+        comprimento_minimo (int, optional): Comprimento mínimo (nucleótidos,
+            incluindo o stop).
+        inicios (Iterable[str], optional): Codões de início.
+        stops (Iterable[str] | None, optional): Codões stop. Por omissão, os
+            stops do código genético `tabela`.
+        tabela (int, optional): Código genético do NCBI (ver `traducao.CODIGOS_GENETICOS`).
+        tamanho_bloco (int, optional): Número de bases processadas de cada vez.
+
+    Yields:
+        ORF: (cadeia, fase, inicio, fim) em coordenadas da cadeia direta.
+
+    Raises:
+        ValueError: Se algum codão de início/stop for inválido.
+
+    Example:
+        >>> list(encontrar_orfs("CCATGAAATGA", comprimento_minimo=6))
+        [ORF(cadeia='+', fase=3, inicio=2, fim=11)]
+    """
+    eventos = _tabela_eventos(inicios, stops, tabela)
+    dados = memoryview(como_bytes(seq)).cast("B")
+    n = len(dados)
+    passo = max(tamanho_bloco - tamanho_bloco % 3, 3)
+    abertos = [None] * 3
+    ultimos_stops = [None] * 3
+    pendentes = [None] * 3
+
+    for base in range(0, max(n - 2, 0), passo):
+        tipos = _eventos_bloco(codificar_bases(dados[base:base + passo + 2]), eventos)
+        posicoes = np.flatnonzero(tipos)
+        tipos = tipos[posicoes]
+        posicoes += base
+        encontradas = []
+        for f in range(3):
+            mesma_fase = posicoes % 3 == f
+            pos, tip = posicoes[mesma_fase], tipos[mesma_fase]
+
+            ini, stp, abertos[f] = _direta(pos[(tip & _INICIO) > 0], pos[(tip & _STOP) > 0], abertos[f])
+            encontradas.append(("+", ini, stp + 3, stp + 3))
+
+            stp, ini, fecho, ultimos_stops[f], pendentes[f] = _reversa(
+                pos[(tip & _INICIO_RC) > 0], pos[(tip & _STOP_RC) > 0], ultimos_stops[f], pendentes[f])
+            encontradas.append(("-", stp, ini + 3, fecho))
+        yield from _emitir(encontradas, n, comprimento_minimo)
+
+    finais = []
+    for f in range(3):
+        if ultimos_stops[f] is not None and pendentes[f] is not None:
+            finais.append(("-", np.array([ultimos_stops[f]]), np.array([pendentes[f] + 3]), np.array([n])))
+    yield from _emitir(finais, n, comprimento_minimo)
+
+
+def _emitir(encontradas, n, comprimento_minimo):
+    """Filtra pelo comprimento e devolve as ORFs ordenadas pela posição de fecho."""
+    orfs = []
+    for cadeia, inicio, fim, fecho in encontradas:
+        validas = (fim - inicio) >= comprimento_minimo
+        for i, j, k in zip(inicio[validas].tolist(), fim[validas].tolist(), fecho[validas].tolist()):
+            fase = i % 3 + 1 if cadeia == "+" else (n - j) % 3 + 1
+            orfs.append((k, ORF(cadeia, fase, i, j)))
+    orfs.sort()
+    return (orf for _, orf in orfs)
+
+
+def orfs_ficheiro(caminho, comprimento_minimo=75, inicios=("ATG",), stops=None, tabela=1,
+                  tamanho_bloco=1 << 22):
+    """
+    Procura ORFs em todas as sequências de um ficheiro FASTA (opcionalmente gzip).
+
+    Os registos são lidos um a um com `leitor.ler_fasta`, pelo que é possível
+    processar montagens metagenómicas de vários GB com memória limitada.
+
+    Args:
+        caminho (str | os.PathLike): Ficheiro FASTA.
+        comprimento_minimo, inicios, stops, tabela, tamanho_bloco: Ver `encontrar_orfs`.
+
+    Yields:
+        tuple[str, ORF]: Nome do registo e ORF encontrada.
+    """
+    for registo in ler_fasta(caminho):
+        for orf in encontrar_orfs(registo, comprimento_minimo, inicios, stops, tabela, tamanho_bloco):
+            yield registo.nome, orf
@@ -0,0 +1,189 @@
+# Pesquisa de uma query contra uma base de dados de sequências (Smith-Waterman em lote)
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from .alinhamento import alinhar_local, escolha_de_matriz
+from .leitor import Registo, como_texto
+from .substituicao import MatrizSubstituicao
+
+Acerto = namedtuple("Acerto", ["indice", "nome", "score", "alinhamento"])
+Acerto.__doc__ = """
+Sujeito da base de dados selecionado por `pesquisar`.
+
+Attributes:
+    indice (int): Posição do sujeito na lista dada.
+    nome (str | None): Nome do registo (se o sujeito for um `Registo`).
+    score (int): Score do alinhamento local com a query.
+    alinhamento (tuple[str, str] | None): Segmentos alinhados (query, sujeito).
+"""
+
+ResultadoPesquisa = namedtuple("ResultadoPesquisa", ["acertos", "celulas", "segundos", "cups"])
+ResultadoPesquisa.__doc__ = """
+Resultado de `pesquisar`.
+
+Attributes:
+    acertos (list[Acerto]): Os melhores sujeitos, por score decrescente.
+    celulas (int): Células da matriz calculadas (len(query) x soma dos comprimentos).
+    segundos (float): Tempo do cálculo dos scores.
+    cups (float): Células atualizadas por segundo (cell updates per second).
+"""
+
+
+def _validar_simbolos(query, sujeitos, subst):
+    """Verifica que todos os símbolos existem na matriz de substituição."""
+    alfabeto = set(subst.alfabeto if isinstance(subst, MatrizSubstituicao) else subst)
+    for nome, seq in [("da query", query)] + [(f"do sujeito {k}", s) for k, s in enumerate(sujeitos)]:
+        if not alfabeto.issuperset(seq):
+            simbolo = next(c for c in seq if c not in alfabeto)
+            raise ValueError(f"Símbolo {simbolo!r} {nome} não existe na matriz de substituição")
+
+
+def _codificar(query, sujeitos, subst):
+    """Códigos dos sujeitos (listas de inteiros) e perfil da query (símbolo do sujeito x posição)."""
+    _validar_simbolos(query, sujeitos, subst)
+    if isinstance(subst, MatrizSubstituicao):
+        return [subst.codificar(s) for s in sujeitos], subst.perfil(query)
+    alfabeto = sorted(set().union(*map(set, sujeitos)))
+    indice = {b: k for k, b in enumerate(alfabeto)}
+    perfil = np.array([[subst[a][b] for a in query] for b in alfabeto], dtype=np.int32)
+    perfil = perfil.reshape(len(alfabeto), len(query))
+    codigos = [np.fromiter((indice[b] for b in s), dtype=np.intp, count=len(s)) for s in sujeitos]
+    return codigos, perfil
+
+
+def _scores_lote(perfil, codigos, comprimentos, space, local=True):
+    """
+    Scores de Smith-Waterman de um lote de sujeitos, um por linha (lane).
+
+    Os sujeitos são juntos num array com padding e percorridos posição a
+    posição; em cada passo a coluna da matriz de cada sujeito (ao longo da
+    query) é atualizada para todo o lote com operações vetoriais, e a
+    dependência ao longo da query é resolvida com um máximo acumulado.
+    Com `local=False` calcula os scores de Needleman-Wunsch: o score de
+    cada sujeito é a última célula da coluna da sua última posição.
+    """
+    lanes, n = len(codigos), perfil.shape[1]
+    largura = int(comprimentos.max(initial=0))
+    matriz = np.zeros((lanes, largura), dtype=np.intp)
+    for k, c in enumerate(codigos):
+        matriz[k, :len(c)] = c
+    passos = np.arange(n + 1, dtype=np.int32) * np.int32(space)
+    coluna = np.zeros((lanes, n + 1), dtype=np.int32)
+    if not local:
+        coluna[:] = passos
+    nova = np.zeros_like(coluna)
+    cima = np.empty((lanes, n), dtype=np.int32)
+    melhor = np.zeros(lanes, dtype=np.int32) if local else np.full(lanes, passos[-1], dtype=np.int32)
+    for j in range(largura):
+        np.add(coluna[:, :-1], perfil[matriz[:, j]], out=nova[:, 1:])
+        np.add(coluna[:, 1:], space, out=cima)
+        np.maximum(nova[:, 1:], cima, out=nova[:, 1:])
+        if local:
+            np.maximum(nova, 0, out=nova)
+        else:
+            nova[:, 0] = (j + 1) * space
+        nova -= passos
+        np.maximum.accumulate(nova, axis=1, out=nova)
+        nova += passos
+        if local:
+            ativos = comprimentos > j
+            np.maximum(melhor, np.where(ativos, nova.max(axis=1), 0), out=melhor)
+        else:
+            fim = comprimentos == j + 1
+            melhor[fim] = nova[fim, -1]
+        coluna, nova = nova, coluna
+    return melhor
+
+
+def pontuacoes_locais(query, sujeitos, match=2, mismatch=-3, space=-4, subst=None, lanes=256):
+    """
+    Calcula o score de Smith-Waterman da query contra cada sujeito.
+
+    Os sujeitos são ordenados por comprimento e agrupados em lotes de
+    `lanes` sequências, com padding até ao maior do lote; cada lote é
+    processado de uma só vez com arrays inteiros NumPy.
+
+    Args:
+        query (str | Registo): Sequência a pesquisar.
+        sujeitos (Iterable[str | Registo]): Base de dados.
+        match (int, optional): Pontuação para match (DNA).
+        mismatch (int, optional): Pontuação para mismatch (DNA).
+        space (int, optional): Penalidade de gap.
+        subst (dict | MatrizSubstituicao | None, optional): Matriz de
+            substituição (ex.: `carregar_matriz("BLOSUM62")`). Por omissão é
+            escolhida pelo tipo da query, como em `escolha_de_matriz`.
+        lanes (int, optional): Número de sujeitos por lote.
+
+    Returns:
+        numpy.ndarray: Score (int) de cada sujeito, pela ordem dada.
+
+    Raises:
+        ValueError: Se a query ou algum sujeito tiver um símbolo que não
+            existe na matriz de substituição (ex.: N numa matriz de DNA).
+
+    Example:
+        >>> pontuacoes_locais("ACGT", ["TTACGTTT", "GGGG"]).tolist()
+        [8, 2]
+    """
+    query = como_texto(query)
+    sujeitos = [como_texto(s) for s in sujeitos]
+    if subst is None:
+        subst = escolha_de_matriz(query, query, match, mismatch)
+    codigos, perfil = _codificar(query, sujeitos, subst)
+    comprimentos = np.array([len(s) for s in sujeitos], dtype=np.int64)
+    ordem = np.argsort(comprimentos, kind="stable")
+    scores = np.zeros(len(sujeitos), dtype=np.int64)
+    for inicio in range(0, len(ordem), lanes):
+        lote = ordem[inicio:inicio + lanes]
+        scores[lote] = _scores_lote(perfil, [codigos[k] for k in lote], comprimentos[lote], space)
+    return scores
+
+
+def pesquisar(query, sujeitos, top=10, match=2, mismatch=-3, space=-4, subst=None, lanes=256,
+              alinhar=True):
+    """
+    Pesquisa uma query numa base de dados e devolve os `top` melhores sujeitos.
+
+    Primeiro calcula só os scores de todos os sujeitos em lotes (ver
+    `pontuacoes_locais`); o alinhamento completo (com traceback) é depois
+    calculado apenas para os sujeitos selecionados.
+
+    Args:
+        query (str | Registo): Sequência a pesquisar.
+        sujeitos (Iterable[str | Registo]): Base de dados (por exemplo, os
+            registos de `leitor.ler_fasta`).
+        top (int, optional): Número de sujeitos a devolver.
+        match, mismatch, space, subst, lanes: Ver `pontuacoes_locais`.
+        alinhar (bool, optional): Se False, não reconstrói os alinhamentos.
+
+    Returns:
+        ResultadoPesquisa: Melhores sujeitos (por score decrescente e, em caso
+        de empate, pela ordem dada), células calculadas, tempo e células por segundo.
+
+    Example:
+        >>> r = pesquisar("ACGT", ["GGGG", "TTACGTTT"], top=1)
+        >>> r.acertos[0].indice, r.acertos[0].score, r.acertos[0].alinhamento
+        (1, 8, ('ACGT', 'ACGT'))
+    """
+    sujeitos = list(sujeitos)
+    nomes = [s.nome if isinstance(s, Registo) else None for s in sujeitos]
+    query = como_texto(query)
+    if subst is None:
+        subst = escolha_de_matriz(query, query, match, mismatch)
+
+    inicio = time.perf_counter()
+    scores = pontuacoes_locais(query, sujeitos, space=space, subst=subst, lanes=lanes)
+    segundos = time.perf_counter() - inicio
+    celulas = len(query) * sum(len(s) for s in sujeitos)
+
+    melhores = np.lexsort((np.arange(len(scores)), -scores))[:max(top, 0)]
+    acertos = []
+    for k in melhores.tolist():
+        alinhamento = None
+        if alinhar:
+            a1, a2, _ = alinhar_local(query, como_texto(sujeitos[k]), subst, space)
+            alinhamento = (a1, a2)
+        acertos.append(Acerto(k, nomes[k], int(scores[k]), alinhamento))
+    return ResultadoPesquisa(acertos, celulas, segundos, celulas / segundos if segundos > 0 else 0.0)
@@ -1,9 +1,20 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, reduce
+from itertools import islice
+from operator import and_
+
+import numpy as np
+
+from .leitor import Registo, abrir, como_bytes, como_texto, e_gzip
+
+
 def is_dna(dna):
     """
     Verifica se uma sequência é DNA válida (contém apenas A, G, C, T).
 
     Args:
-        dna (str): Sequência a ser verificada.
+        dna (str | bytes | Registo | PackedSeq): Sequência a ser verificada.
 
     Returns:
         None
@@ -18,9 +29,11 @@ def is_dna(dna):
         >>> is_dna("AGCTX")
         Sequência inválida
     """
-    dna = dna.upper()
-    seq = set("AGCT")
-    if set(dna).issubset(seq):
+    if isinstance(dna, PackedSeq):
+        valida = not dna.ns
+    else:
+        valida = set(como_texto(dna).upper()).issubset(set("AGCT"))
+    if valida:
         print("Sequência válida")
     else:
         print("Sequência inválida")
@@ -33,7 +46,7 @@ def dna_counter(dna):
     Conta a ocorrência de cada nucleotídeo em uma sequência de DNA.
 
     Args:
-        dna (str): Sequência de DNA a ser analisada.
+        dna (str | bytes | memoryview | Registo | PackedSeq): Sequência de DNA a ser analisada.
 
     Returns:
         dict[str, int]: Dicionário com o número de ocorrências de cada nucleotídeo.
@@ -45,16 +58,222 @@ def dna_counter(dna):
         >>> dna_counter("TTTAAA")
         {'A': 3, 'G': 0, 'C': 0, 'T': 3}
     """
-    dna = dna.upper()
-    dic = {
-        "A": dna.count("A"),
-        "G": dna.count("G"),
-        "C": dna.count("C"),
-        "T": dna.count("T")
+    if isinstance(dna, PackedSeq):
+        contagem = dna.contar()
+        return {base: contagem[base] for base in "AGCT"}
+    if isinstance(dna, str):
+        dna = dna.upper()
+        return {base: dna.count(base) for base in "AGCT"}
+    histograma = _histograma(_como_bytes(dna))
+    return {base: int(histograma[ord(base)] + histograma[ord(base.lower())]) for base in "AGCT"}
+
+
+# Contagem em massa (vários ficheiros FASTA)
+
+_ESPACOS_ORD = [ord(c) for c in " \t\r\n"]
+
+
+def _histograma(dados):
+    """Conta os 256 valores de byte numa única passagem."""
+    return np.bincount(np.frombuffer(dados, dtype=np.uint8), minlength=256)
+
+
+def _contagem_de_histograma(histograma):
+    """Converte um histograma de bytes em {símbolo: contagem}, sem distinguir maiúsculas."""
+    histograma = histograma.copy()
+    histograma[_ESPACOS_ORD] = 0
+    histograma[ord("A"):ord("Z") + 1] += histograma[ord("a"):ord("z") + 1]
+    histograma[ord("a"):ord("z") + 1] = 0
+    contagem = {base: int(histograma[ord(base)]) for base in "ACGTN"}
+    for byte in np.flatnonzero(histograma):
+        contagem.setdefault(chr(byte), int(histograma[byte]))
+    return contagem
+
+
+def _segmentos(bloco):
+    """
+    Divide um bloco (começado e terminado em fronteira de linha) por registo.
+
+    Returns:
+        list[tuple[str | None, numpy.ndarray]]: (nome, histograma) de cada
+        segmento; o nome é None para a continuação do registo anterior.
+    """
+    vista = memoryview(bloco)
+    segmentos = []
+    nome, inicio = None, 0
+    while True:
+        if inicio == 0 and bloco.startswith(b">"):
+            cab = 0
+        else:
+            cab = bloco.find(b"\n>", inicio)
+            cab = len(bloco) if cab < 0 else cab + 1
+        if cab > inicio or nome is not None:
+            segmentos.append((nome, _histograma(vista[inicio:cab])))
+        if cab >= len(bloco):
+            return segmentos
+        fim_cab = bloco.find(b"\n", cab)
+        fim_cab = len(bloco) if fim_cab < 0 else fim_cab
+        partes = bloco[cab + 1:fim_cab].split(None, 1)
+        nome = partes[0].decode() if partes else ""
+        inicio = fim_cab
+
+
+def _contar_tarefa(tarefa):
+    """Conta um intervalo [inicio, fim) de um ficheiro (ou um gzip inteiro)."""
+    caminho, inicio, fim, tamanho_bloco = tarefa
+    if fim is not None:
+        with open(caminho, "rb") as f:
+            f.seek(inicio)
+            return _segmentos(f.read(fim - inicio))
+    segmentos, resto = [], b""
+    with abrir(caminho) as f:
+        while True:
+            bloco = f.read(tamanho_bloco)
+            if not bloco:
+                break
+            dados = resto + bloco
+            corte = dados.rfind(b"\n") + 1
+            segmentos += _segmentos(dados[:corte])
+            resto = dados[corte:]
+    if resto:
+        segmentos += _segmentos(resto)
+    return segmentos
+
+
+def _executar(tarefas, processos):
+    """Aplica `_contar_tarefa` às tarefas, por ordem, num conjunto de processos."""
+    if processos == 1 or len(tarefas) <= 1:
+        yield from map(_contar_tarefa, tarefas)
+        return
+    trabalhadores = processos or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=trabalhadores) as executor:
+        yield from executor.map(_contar_tarefa, tarefas, chunksize=max(1, len(tarefas) // (4 * trabalhadores)))
+
+
+def _tarefas_ficheiro(caminho, tamanho_bloco):
+    """Divide um ficheiro em blocos alinhados com o início de uma linha."""
+    if e_gzip(caminho):
+        return [(caminho, 0, None, tamanho_bloco)]
+    tamanho = os.path.getsize(caminho)
+    cortes = [0]
+    with open(caminho, "rb") as f:
+        while cortes[-1] + tamanho_bloco < tamanho:
+            f.seek(cortes[-1] + tamanho_bloco)
+            f.readline()
+            cortes.append(f.tell())
+    if cortes[-1] < tamanho:
+        cortes.append(tamanho)
+    return [(caminho, a, b, tamanho_bloco) for a, b in zip(cortes, cortes[1:])]
+
+
+def dna_counter_ficheiros(caminhos, processos=None, tamanho_bloco=1 << 26):
+    """
+    Conta a composição de bases em vários ficheiros FASTA, em paralelo.
+
+    Cada ficheiro é dividido em blocos de cerca de `tamanho_bloco` bytes
+    (cortados no início de uma linha) que são contados num conjunto de
+    processos. Cada bloco é lido uma única vez e contado com um histograma
+    dos 256 valores de byte, em vez de uma passagem por nucleótido. Os
+    resultados dos blocos são depois juntados por registo e por ficheiro.
+    Ficheiros gzip são contados em stream por um único processo.
+
+    As maiúsculas e minúsculas são contadas em conjunto. As chaves
+    "A", "C", "G", "T" e "N" existem sempre; outros símbolos só aparecem
+    se ocorrerem.
+
+    Args:
+        caminhos (Iterable[str | os.PathLike]): Ficheiros FASTA (opcionalmente gzip).
+        processos (int | None, optional): Número de processos. Com 1, a contagem
+            é feita no processo atual. Por omissão usa todos os CPUs.
+        tamanho_bloco (int, optional): Tamanho aproximado de cada bloco (bytes).
+
+    Returns:
+        dict[str, dict]: Para cada ficheiro, um dicionário com:
+        - "total" (dict[str, int]): contagem de todo o ficheiro
+        - "registos" (list[tuple[str, dict[str, int]]]): contagem de cada registo
+
+    Raises:
+        ValueError: Se `tamanho_bloco` não for positivo ou um ficheiro tiver
+            sequência antes do primeiro cabeçalho.
+
+    Example:
+        >>> dna_counter_ficheiros(["a.fa"], processos=1)["a.fa"]["total"]
+        {'A': 10, 'C': 12, 'G': 8, 'T': 9, 'N': 0}
+    """
+    if tamanho_bloco <= 0:
+        raise ValueError("tamanho_bloco tem de ser > 0")
+    caminhos = [os.fspath(c) for c in caminhos]
+    tarefas = [t for c in caminhos for t in _tarefas_ficheiro(c, tamanho_bloco)]
+
+    por_ficheiro = {c: [] for c in caminhos}
+    for tarefa, segmentos in zip(tarefas, _executar(tarefas, processos)):
+        registos = por_ficheiro[tarefa[0]]
+        for nome, histograma in segmentos:
+            if nome is not None:
+                registos.append([nome, histograma])
+            elif registos:
+                registos[-1][1] = registos[-1][1] + histograma
+            elif _contagem_de_histograma(histograma) != dict.fromkeys("ACGTN", 0):
+                raise ValueError("Ficheiro FASTA inválido (sequência antes do cabeçalho): " + tarefa[0])
+
+    resultado = {}
+    for caminho, registos in por_ficheiro.items():
+        total = sum((h for _, h in registos), np.zeros(256, dtype=np.int64))
+        resultado[caminho] = {
+            "total": _contagem_de_histograma(total),
+            "registos": [(nome, _contagem_de_histograma(h)) for nome, h in registos],
         }
-    return dic
+    return resultado
+
+# Tabelas de tradução (motor por bytes)
 
-def reverse_complement(dna):
+_IUPAC_DNA = "ACGTURYKMSWBDHVN"
+_IUPAC_COMPLEMENTO = "TGCAAYRMKSWVHDBN"
+_IUPAC_RNA = "UGCAAYRMKSWVHDBN"
+_VALIDOS = (_IUPAC_DNA + _IUPAC_DNA.lower()).encode("ascii")
+_ESPACOS = b" \t\r\n"
+
+
+def _tabela(origem, destino, soft_mask):
+    """Cria uma tabela de 256 entradas para `bytes.translate`."""
+    minusculas = destino.lower() if soft_mask else destino
+    return bytes.maketrans((origem + origem.lower()).encode("ascii"),
+                           (destino + minusculas).encode("ascii"))
+
+
+_TABELAS = {
+    ("complemento", False): _tabela(_IUPAC_DNA, _IUPAC_COMPLEMENTO, False),
+    ("complemento", True): _tabela(_IUPAC_DNA, _IUPAC_COMPLEMENTO, True),
+    ("rna", False): _tabela(_IUPAC_DNA, _IUPAC_RNA, False),
+    ("rna", True): _tabela(_IUPAC_DNA, _IUPAC_RNA, True),
+}
+
+
+def _como_bytes(dados):
+    """Converte str/bytes/bytearray/memoryview em bytes (ou bytearray) traduzíveis."""
+    if isinstance(dados, str):
+        try:
+            return dados.encode("ascii")
+        except UnicodeEncodeError:
+            raise ValueError("Sequência contém símbolos não ASCII") from None
+    if isinstance(dados, Registo):
+        dados = dados.seq
+    if isinstance(dados, (bytes, bytearray)):
+        return dados
+    if isinstance(dados, memoryview):
+        return dados.tobytes()
+    raise TypeError("Sequência deve ser str, bytes, bytearray, memoryview ou Registo")
+
+
+def _traduzir(dados, tipo, soft_mask):
+    """Valida e traduz uma sequência em bytes com a tabela indicada."""
+    invalidos = dados.translate(None, _VALIDOS)
+    if invalidos:
+        raise ValueError("Símbolo inválido na sequência: " + chr(invalidos[0]))
+    return dados.translate(_TABELAS[(tipo, soft_mask)])
+
+
+def reverse_complement(dna, soft_mask=False):
     """
     Retorna o complemento reverso de uma sequência de DNA.
 
@@ -64,29 +283,39 @@ def reverse_complement(dna):
         A <-> T
         G <-> C
 
+    Os códigos de ambiguidade IUPAC também são complementados
+    (R <-> Y, K <-> M, B <-> V, D <-> H; S, W e N mantêm-se).
+    A tradução é feita com uma tabela de 256 entradas sobre `bytes`,
+    sem ciclos em Python.
+
     Args:
-        dna (str): Sequência de DNA a ser convertida.
+        dna (str | bytes | bytearray | memoryview | Registo | PackedSeq): Sequência de DNA a ser convertida.
+        soft_mask (bool, optional): Se True, mantém as minúsculas (regiões
+            mascaradas). Por omissão o resultado fica em maiúsculas.
 
     Returns:
-        str: Sequência complementar reversa do DNA.
+        str | bytes | PackedSeq: Sequência complementar reversa do DNA, do mesmo
+        tipo da entrada (`str` para `str`, `PackedSeq` para `PackedSeq`,
+        `bytes` nos restantes casos).
+
+    Raises:
+        ValueError: Se a sequência contiver símbolos fora do alfabeto IUPAC.
 
     Examples:
         >>> reverse_complement("ATGC")
         'GCAT'
         >>> reverse_complement("GGCTA")
         'TAGCC'
+        >>> reverse_complement(b"acgTN", soft_mask=True)
+        b'NAcgt'
     """
-    dna = dna.upper()
-    complementar = {
-        "A": "T",
-        "T": "A",
-        "G": "C",
-        "C": "G"
-    }
-    return "".join(complementar[n] for n in dna[::-1])
+    if isinstance(dna, PackedSeq):
+        return dna.reverse_complement()
+    resultado = _traduzir(_como_bytes(dna), "complemento", soft_mask)[::-1]
+    return resultado.decode("ascii") if isinstance(dna, str) else bytes(resultado)
 
 
-def dna_to_rna(dna):
+def dna_to_rna(dna, soft_mask=False):
     """
     Converte uma sequência de DNA em RNA complementar.
 
@@ -96,11 +325,19 @@ def dna_to_rna(dna):
         G -> C
         C -> G
 
+    Os códigos de ambiguidade IUPAC são complementados como em
+    `reverse_complement`.
+
     Args:
-        dna (str): Sequência de DNA a ser transcrita.
+        dna (str | bytes | bytearray | memoryview | Registo): Sequência de DNA a ser transcrita.
+        soft_mask (bool, optional): Se True, mantém as minúsculas.
 
     Returns:
-        str: Sequência de RNA resultante da transcrição.
+        str | bytes: Sequência de RNA resultante da transcrição, do mesmo
+        tipo da entrada.
+
+    Raises:
+        ValueError: Se a sequência contiver símbolos fora do alfabeto IUPAC.
 
     Example:
         >>> dna_to_rna("ATGC")
@@ -108,21 +345,76 @@ def dna_to_rna(dna):
         >>> dna_to_rna("GGCTA")
         'CCGAU'
     """
-    dna = dna.upper()
-    transcricao = {
-      "A":"U",
-      "T":"A",
-      "G":"C",
-      "C":"G"
-      }
-    return "".join(transcricao[letra] for letra in dna)
+    resultado = _traduzir(_como_bytes(dna), "rna", soft_mask)
+    return resultado.decode("ascii") if isinstance(dna, str) else bytes(resultado)
+
+
+def dna_to_rna_blocos(blocos, soft_mask=False):
+    """
+    Transcreve uma sequência em blocos, sem a carregar toda em memória.
+
+    Espaços e quebras de linha são descartados.
+
+    Args:
+        blocos (Iterable[bytes | bytearray | memoryview | str]): Blocos consecutivos da sequência.
+        soft_mask (bool, optional): Se True, mantém as minúsculas.
+
+    Yields:
+        bytes: Blocos de RNA, pela mesma ordem dos blocos de entrada.
+
+    Example:
+        >>> list(dna_to_rna_blocos([b"AT", b"GC\\n"]))
+        [b'UA', b'CG']
+    """
+    for bloco in blocos:
+        dados = _como_bytes(bloco).translate(None, _ESPACOS)
+        yield bytes(_traduzir(dados, "rna", soft_mask))
+
+
+def reverse_complement_ficheiro(origem, destino, tamanho_bloco=1 << 24, soft_mask=False):
+    """
+    Escreve o complemento reverso de um ficheiro de sequência (sem cabeçalho).
+
+    O ficheiro é lido do fim para o início em blocos de `tamanho_bloco`
+    bytes, pelo que a memória usada não depende do tamanho da entrada.
+    Espaços e quebras de linha são descartados.
+
+    Args:
+        origem (str | os.PathLike): Ficheiro com a sequência de DNA.
+        destino (str | os.PathLike): Ficheiro onde escrever o resultado.
+        tamanho_bloco (int, optional): Tamanho de cada bloco lido (bytes).
+        soft_mask (bool, optional): Se True, mantém as minúsculas.
+
+    Returns:
+        int: Número de nucleótidos escritos.
+
+    Raises:
+        ValueError: Se `tamanho_bloco` não for positivo ou a sequência for inválida.
+    """
+    if tamanho_bloco <= 0:
+        raise ValueError("tamanho_bloco tem de ser > 0")
+    escritos = 0
+    with open(origem, "rb") as fin, open(destino, "wb") as fout:
+        pos = fin.seek(0, 2)
+        while pos > 0:
+            inicio = max(0, pos - tamanho_bloco)
+            fin.seek(inicio)
+            bloco = fin.read(pos - inicio).translate(None, _ESPACOS)
+            pos = inicio
+            fout.write(_traduzir(bloco, "complemento", soft_mask)[::-1])
+            escritos += len(bloco)
+    return escritos
+
 
 def identificar_sequencia(seq):
   """
     Identifica se a sequência é DNA, RNA ou proteína.
 
+    A classificação é feita com uma única tabela de 256 entradas
+    (ver `tipo_sequencia`).
+
     Args:
-        seq (str): Sequência biológica.
+        seq (str | bytes | Registo | PackedSeq): Sequência biológica.
 
     Returns:
         str: "DNA", "RNA", "AMINO" ou "ERRO" se não for possível identificar.
@@ -131,18 +423,330 @@ def identificar_sequencia(seq):
         >>> identificar_sequencia("ACGT")
         'DNA'
   """
-  seq = seq.upper()
-  dna = set("ACTG")
-  rna = set("ACUG")
-  proteina = set("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
-
-  if set(seq).issubset({'A','C','G'}):
+  tipo = tipo_sequencia(seq)
+  if tipo == TIPO_INDETERMINADO:
       return "Introduza mais informação da sequência para poder determinar com mais exatidão"
-  elif set(seq).issubset(dna):
-      return "DNA"
-  elif set(seq).issubset(rna):
-      return "RNA"
-  elif set(seq).issubset(proteina):
-      return "AMINO"
-  else:
-      return "ERRO"
\ No newline at end of file
+  return NOMES_TIPO[tipo]
+
+
+# Classificação em lote (tabela de 256 entradas)
+
+TIPO_ERRO = 0
+TIPO_DNA = 1
+TIPO_RNA = 2
+TIPO_AMINO = 3
+TIPO_INDETERMINADO = 4
+NOMES_TIPO = ("ERRO", "DNA", "RNA", "AMINO", "INDETERMINADO")
+
+PROTEINA_IUPAC = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+PROTEINA_PADRAO = "ACDEFGHIKLMNPQRSTVWY"
+
+_BIT_ACG, _BIT_DNA, _BIT_RNA, _BIT_AMINO = 1, 2, 4, 8
+_BITS_TIPO = (_BIT_DNA, _BIT_RNA, _BIT_AMINO)
+_TODOS_BITS = 15
+
+
+def _tipo_da_mascara(mascara):
+    """Tipo correspondente ao AND das máscaras de todos os símbolos."""
+    if mascara & _BIT_ACG:
+        return TIPO_INDETERMINADO
+    if mascara & _BIT_DNA:
+        return TIPO_DNA
+    if mascara & _BIT_RNA:
+        return TIPO_RNA
+    if mascara & _BIT_AMINO:
+        return TIPO_AMINO
+    return TIPO_ERRO
+
+
+_TIPOS_MASCARA = np.array([_tipo_da_mascara(m) for m in range(16)], dtype=np.int8)
+
+
+@lru_cache(maxsize=None)
+def _tabela_mascaras(proteina):
+    """Tabela de 256 entradas: para cada byte, os alfabetos a que pertence (bits)."""
+    tabela = np.zeros(256, dtype=np.uint8)
+    alfabetos = (("ACG", _BIT_ACG), ("ACGT", _BIT_DNA), ("ACGU", _BIT_RNA), (proteina, _BIT_AMINO))
+    for simbolos, bit in alfabetos:
+        for c in simbolos.upper() + simbolos.lower():
+            tabela[ord(c)] |= bit
+    return tabela, tabela.tobytes()
+
+
+def tipo_sequencia(seq, proteina=PROTEINA_IUPAC):
+    """
+    Classifica uma sequência com uma única passagem por uma tabela de 256 entradas.
+
+    Cada byte é traduzido para uma máscara com os alfabetos a que pertence
+    (ACG, DNA, RNA, proteína) e o tipo resulta do AND dessas máscaras.
+
+    Args:
+        seq (str | bytes | Registo | PackedSeq): Sequência biológica.
+        proteina (str, optional): Alfabeto aceite para proteínas. Por omissão
+            todas as letras A-Z.
+
+    Returns:
+        int: Um dos códigos `TIPO_ERRO`, `TIPO_DNA`, `TIPO_RNA`, `TIPO_AMINO`
+        ou `TIPO_INDETERMINADO` (apenas A, C e G).
+
+    Example:
+        >>> NOMES_TIPO[tipo_sequencia("ACGU")]
+        'RNA'
+    """
+    tabela, tabela_bytes = _tabela_mascaras(proteina)
+    if isinstance(seq, PackedSeq):
+        mascaras = {int(tabela[ord(base)]) for base, n in seq.contar().items() if n}
+    else:
+        mascaras = set(bytes(como_bytes(seq)).translate(tabela_bytes))
+    return _tipo_da_mascara(reduce(and_, mascaras, _TODOS_BITS))
+
+
+def _classificar_bloco(lote, tabela):
+    """Classifica um bloco de sequências (bytes) com operações vetoriais."""
+    n = len(lote)
+    comprimentos = np.fromiter(map(len, lote), dtype=np.int64, count=n)
+    inicios = np.zeros(n, dtype=np.int64)
+    np.cumsum(comprimentos[:-1], out=inicios[1:])
+    mascaras = tabela[np.frombuffer(b"".join(lote), dtype=np.uint8)]
+
+    acumulada = np.full(n, _TODOS_BITS, dtype=np.uint8)
+    nao_vazias = comprimentos > 0
+    if nao_vazias.any():
+        acumulada[nao_vazias] = np.bitwise_and.reduceat(mascaras, inicios[nao_vazias])
+    tipos = _TIPOS_MASCARA[acumulada]
+
+    erros = np.full(n, -1, dtype=np.int64)
+    falhou = (acumulada & (_BIT_DNA | _BIT_RNA | _BIT_AMINO)) == 0
+    if falhou.any():
+        # A sequência deixa de ser classificável na posição em que perde o
+        # último alfabeto possível: o máximo, por alfabeto, da primeira falha.
+        for bit in _BITS_TIPO:
+            posicoes = np.flatnonzero((mascaras & bit) == 0)
+            leituras = np.searchsorted(inicios, posicoes, side="right") - 1
+            primeira = np.ones(len(leituras), dtype=bool)
+            primeira[1:] = leituras[1:] != leituras[:-1]
+            leituras = leituras[primeira]
+            relativas = posicoes[primeira] - inicios[leituras]
+            erros[leituras] = np.maximum(erros[leituras], relativas)
+        erros[~falhou] = -1
+    return tipos, erros
+
+
+def classificar_lote(seqs, proteina=PROTEINA_IUPAC, tamanho_lote=1 << 16):
+    """
+    Classifica e valida um conjunto grande de sequências (ex.: reads).
+
+    As sequências são juntadas em blocos de `tamanho_lote`; cada bloco é
+    traduzido de uma só vez pela tabela de 256 entradas de `tipo_sequencia`
+    e reduzido por sequência com operações NumPy, sem ciclos por símbolo.
+
+    Args:
+        seqs (Iterable[str | bytes | Registo]): Sequências a classificar.
+        proteina (str, optional): Alfabeto aceite para proteínas.
+        tamanho_lote (int, optional): Número de sequências por bloco.
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray]:
+            - tipos (int8): código do tipo de cada sequência (ver `NOMES_TIPO`)
+            - erros (int64): para as sequências `TIPO_ERRO`, a posição (base 0)
+              do primeiro símbolo que torna a sequência inválida; -1 nas restantes
+
+    Raises:
+        ValueError: Se `tamanho_lote` não for positivo.
+
+    Example:
+        >>> tipos, erros = classificar_lote(["ACGT", "ACGU", "AC1G"])
+        >>> tipos.tolist(), erros.tolist()
+        ([1, 2, 0], [-1, -1, 2])
+    """
+    if tamanho_lote <= 0:
+        raise ValueError("tamanho_lote tem de ser > 0")
+    tabela, _ = _tabela_mascaras(proteina)
+    iterador = map(como_bytes, seqs)
+    tipos, erros = [np.zeros(0, dtype=np.int8)], [np.zeros(0, dtype=np.int64)]
+    while True:
+        lote = list(islice(iterador, tamanho_lote))
+        if not lote:
+            break
+        t, e = _classificar_bloco(lote, tabela)
+        tipos.append(t)
+        erros.append(e)
+    return np.concatenate(tipos), np.concatenate(erros)
+
+
+# Sequência empacotada (2 bits por base)
+
+_CODIGO_N = 4
+_CODIGOS_ACGTN = bytes.maketrans(b"ACGTNacgtn", bytes([0, 1, 2, 3, 4, 0, 1, 2, 3, 4]))
+_LETRAS_ACGT = np.frombuffer(b"ACGT", dtype=np.uint8)
+
+
+def _tabelas_empacotadas():
+    """Tabelas de 256 entradas sobre bytes com 4 bases (base i nos bits 2i..2i+1)."""
+    byte = np.arange(256, dtype=np.uint8)
+    bases = np.stack([(byte >> (2 * i)) & 3 for i in range(4)], axis=1)
+    contagem = np.stack([(bases == c).sum(axis=1) for c in range(4)], axis=1)
+    complemento = 3 - bases[:, ::-1]
+    rc = sum(complemento[:, i].astype(np.uint8) << (2 * i) for i in range(4)).astype(np.uint8)
+    return contagem, rc
+
+
+_CONTAGEM_BYTE, _RC_BYTE = _tabelas_empacotadas()
+
+
+class PackedSeq:
+    """
+    Sequência de DNA guardada com 2 bits por base (A=0, C=1, G=2, T=3).
+
+    As bases são empacotadas 4 a 4 num array `numpy.uint8`; os troços de
+    N são guardados à parte numa lista de (início, comprimento). Um genoma
+    de 3 Gb ocupa assim cerca de 750 MB em vez de 3 GB como `str`.
+    Contagem e complemento reverso operam byte a byte sobre o array
+    empacotado, sem ciclos em Python por base.
+
+    `dna_counter`, `is_dna`, `reverse_complement` e `identificar_sequencia`
+    aceitam diretamente um `PackedSeq`. As minúsculas não são preservadas.
+
+    Args:
+        seq (str | bytes | memoryview | Registo): Sequência com símbolos A, C, G, T ou N.
+
+    Raises:
+        ValueError: Se a sequência contiver outros símbolos.
+
+    Example:
+        >>> p = PackedSeq("ACGTNNA")
+        >>> p.ns, str(p.reverse_complement())
+        ([(4, 2)], 'TNNACGT')
+    """
+
+    __slots__ = ("_dados", "_n", "_ns")
+
+    def __init__(self, seq):
+        if isinstance(seq, PackedSeq):
+            self._dados, self._n, self._ns = seq._dados, seq._n, list(seq._ns)
+            return
+        dados = _como_bytes(seq)
+        invalidos = dados.translate(None, b"ACGTNacgtn")
+        if invalidos:
+            raise ValueError("PackedSeq aceita apenas A, C, G, T e N: " + chr(invalidos[0]))
+        codigos = np.frombuffer(dados.translate(_CODIGOS_ACGTN), dtype=np.uint8).copy()
+        self._n = len(codigos)
+        self._ns = _trocos_n(codigos == _CODIGO_N)
+        codigos[codigos == _CODIGO_N] = 0
+        self._dados = _empacotar(codigos)
+
+    @classmethod
+    def _de_array(cls, dados, n, ns):
+        novo = cls.__new__(cls)
+        novo._dados, novo._n, novo._ns = dados, n, ns
+        return novo
+
+    @property
+    def ns(self):
+        """list[tuple[int, int]]: Troços de N como (início, comprimento)."""
+        return list(self._ns)
+
+    @property
+    def nbytes(self):
+        """int: Memória ocupada pelas bases empacotadas (bytes)."""
+        return self._dados.nbytes
+
+    def __len__(self):
+        return self._n
+
+    def __bytes__(self):
+        codigos = _desempacotar(self._dados, self._n)
+        letras = _LETRAS_ACGT[codigos]
+        for inicio, comprimento in self._ns:
+            letras[inicio:inicio + comprimento] = ord("N")
+        return letras.tobytes()
+
+    def __str__(self):
+        return bytes(self).decode("ascii")
+
+    def __repr__(self):
+        return f"PackedSeq(comprimento={self._n}, ns={len(self._ns)})"
+
+    def __eq__(self, outro):
+        if not isinstance(outro, PackedSeq):
+            return NotImplemented
+        return self._n == outro._n and self._ns == outro._ns and np.array_equal(self._dados, outro._dados)
+
+    def contar(self):
+        """
+        Conta as bases A, C, G, T e N.
+
+        Usa um histograma dos 256 valores de byte e uma tabela com o número
+        de cada base em cada byte, em vez de percorrer as bases uma a uma.
+
+        Returns:
+            dict[str, int]: Contagem de cada símbolo.
+
+        Example:
+            >>> PackedSeq("AACGN").contar()
+            {'A': 2, 'C': 1, 'G': 1, 'T': 0, 'N': 1}
+        """
+        histograma = np.bincount(self._dados, minlength=256)
+        a, c, g, t = (int(x) for x in histograma @ _CONTAGEM_BYTE)
+        n = sum(comprimento for _, comprimento in self._ns)
+        # O enchimento do último byte e os N estão guardados como A (0).
+        a -= (-self._n) % 4 + n
+        return {"A": a, "C": c, "G": g, "T": t, "N": n}
+
+    def reverse_complement(self):
+        """
+        Calcula o complemento reverso sem desempacotar as bases.
+
+        Cada byte é invertido e complementado por uma tabela de 256 entradas
+        e o enchimento final é corrigido com um deslocamento de bits vetorial.
+        Os N (guardados como A) passam a T no complemento e são repostos a A.
+
+        Returns:
+            PackedSeq: Complemento reverso.
+        """
+        rc = _RC_BYTE[self._dados[::-1]]
+        enchimento = (-self._n) % 4
+        if enchimento:
+            desloc = 2 * enchimento
+            seguinte = np.append(rc[1:], np.uint8(0))
+            rc = (rc >> desloc) | (seguinte << (8 - desloc))
+        ns = [(self._n - inicio - comprimento, comprimento) for inicio, comprimento in reversed(self._ns)]
+        rc = rc.astype(np.uint8)
+        _limpar_trocos(rc, ns)
+        return PackedSeq._de_array(rc, self._n, ns)
+
+
+def _empacotar(codigos):
+    """Empacota códigos 0-3 (um por byte) em 4 bases por byte."""
+    enchimento = (-len(codigos)) % 4
+    if enchimento:
+        codigos = np.concatenate([codigos, np.zeros(enchimento, dtype=np.uint8)])
+    grupos = codigos.reshape(-1, 4)
+    return grupos[:, 0] | (grupos[:, 1] << 2) | (grupos[:, 2] << 4) | (grupos[:, 3] << 6)
+
+
+def _limpar_trocos(dados, trocos):
+    """Põe a 0 (A) as bases dos troços (início, comprimento) no array empacotado."""
+    for inicio, comprimento in trocos:
+        fim = inicio + comprimento
+        # Bytes inteiros dentro do troço de uma vez; as bases das pontas, uma a uma.
+        primeiro, ultimo = -(-inicio // 4), fim // 4
+        if primeiro < ultimo:
+            dados[primeiro:ultimo] = 0
+        for posicao in [*range(inicio, min(fim, 4 * primeiro)), *range(max(inicio, 4 * ultimo), fim)]:
+            dados[posicao // 4] &= 0xFF ^ (3 << (2 * (posicao % 4)))
+
+
+def _desempacotar(dados, n):
+    """Operação inversa de `_empacotar`: devolve um código 0-3 por base."""
+    grupos = np.stack([(dados >> (2 * i)) & 3 for i in range(4)], axis=1)
+    return grupos.reshape(-1)[:n]
+
+
+def _trocos_n(mascara):
+    """Converte uma máscara booleana em troços (início, comprimento)."""
+    if not mascara.any():
+        return []
+    bordas = np.flatnonzero(np.diff(np.concatenate(([0], mascara.view(np.int8), [0]))))
+    inicios, fins = bordas[0::2], bordas[1::2]
+    return [(int(i), int(f - i)) for i, f in zip(inicios, fins)]
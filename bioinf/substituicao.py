@@ -0,0 +1,196 @@
+# Matrizes de substituição (BLOSUM/PAM) em arrays inteiros
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from .leitor import como_texto
+
+MATRIZES_DISPONIVEIS = ("BLOSUM45", "BLOSUM62", "BLOSUM80", "PAM250")
+
+_PASTA_DADOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dados")
+
+
+class MatrizSubstituicao:
+    """
+    Matriz de substituição guardada num pequeno array 2D de inteiros.
+
+    Cada símbolo do alfabeto recebe um código (a sua posição em `alfabeto`)
+    e o score de um par é `valores[codigo_a, codigo_b]`. As sequências são
+    codificadas uma vez (`codificar`) e os algoritmos de alinhamento passam
+    a fazer apenas indexação de arrays, em vez de duas consultas a
+    dicionários por célula. As minúsculas são tratadas como maiúsculas.
+
+    Também aceita `matriz[a][b]`, como os dicionários de
+    `alinhamento.matriz_substituição_dna`.
+
+    Args:
+        alfabeto (str): Símbolos, pela ordem das linhas/colunas.
+        valores (array-like): Matriz quadrada de scores inteiros.
+        nome (str | None, optional): Nome da matriz (ex.: "BLOSUM62").
+
+    Raises:
+        ValueError: Se as dimensões não corresponderem ao alfabeto.
+
+    Example:
+        >>> b62 = carregar_matriz("BLOSUM62")
+        >>> b62["W"]["W"], b62.pontuacao("A", "R")
+        (11, -1)
+    """
+
+    __slots__ = ("alfabeto", "valores", "nome", "_codigos", "_linhas")
+
+    def __init__(self, alfabeto, valores, nome=None):
+        valores = np.array(valores, dtype=np.int32)
+        valores.flags.writeable = False
+        if valores.shape != (len(alfabeto), len(alfabeto)):
+            raise ValueError("A matriz tem de ser quadrada, com uma linha por símbolo do alfabeto")
+        self.alfabeto = alfabeto
+        self.valores = valores
+        self.nome = nome
+        self._codigos = np.full(256, -1, dtype=np.intp)
+        for k, simbolo in enumerate(alfabeto):
+            self._codigos[ord(simbolo.lower())] = k
+        for k, simbolo in enumerate(alfabeto):
+            self._codigos[ord(simbolo)] = k
+        self._linhas = {}
+
+    @classmethod
+    def de_dicionario(cls, subst, nome=None):
+        """
+        Converte uma matriz em dicionários (`subst[a][b]`) numa `MatrizSubstituicao`.
+
+        Raises:
+            KeyError: Se faltar algum par de símbolos.
+        """
+        alfabeto = "".join(subst)
+        return cls(alfabeto, [[subst[a][b] for b in alfabeto] for a in alfabeto], nome)
+
+    @classmethod
+    def dna(cls, match, mismatch):
+        """Matriz para DNA (A, C, G, T) com scores de match e mismatch."""
+        valores = np.full((4, 4), mismatch, dtype=np.int32)
+        np.fill_diagonal(valores, match)
+        return cls("ACGT", valores, f"DNA({match}, {mismatch})")
+
+    def __repr__(self):
+        return f"MatrizSubstituicao({self.nome or self.alfabeto!r})"
+
+    def __len__(self):
+        return len(self.alfabeto)
+
+    def __contains__(self, simbolo):
+        return len(simbolo) == 1 and ord(simbolo) < 256 and self._codigos[ord(simbolo)] >= 0
+
+    def __getitem__(self, a):
+        linha = self._linhas.get(a)
+        if linha is None:
+            valores = self.valores[self._codigo(a)].tolist()
+            linha = self._linhas[a] = dict(zip(self.alfabeto, valores))
+        return linha
+
+    def _codigo(self, simbolo):
+        if simbolo not in self:
+            raise KeyError(simbolo)
+        return int(self._codigos[ord(simbolo)])
+
+    def pontuacao(self, a, b):
+        """Score da substituição de `a` por `b`."""
+        return int(self.valores[self._codigo(a), self._codigo(b)])
+
+    def codificar(self, seq):
+        """
+        Converte uma sequência nos códigos do alfabeto.
+
+        Args:
+            seq (str | bytes | Registo): Sequência.
+
+        Returns:
+            numpy.ndarray: Código (`intp`) de cada símbolo.
+
+        Raises:
+            KeyError: Se a sequência tiver símbolos fora do alfabeto.
+        """
+        texto = como_texto(seq)
+        dados = np.frombuffer(texto.encode("latin-1", "replace"), dtype=np.uint8)
+        codigos = self._codigos[dados]
+        if (codigos < 0).any() or len(dados) != len(texto):
+            invalido = next(c for c in texto if c not in self)
+            raise KeyError(invalido)
+        return codigos
+
+    def perfil(self, query):
+        """
+        Perfil da query: scores de cada posição da query contra cada símbolo.
+
+        É calculado uma vez por query e reutilizado em todas as células:
+        `perfil[b, i]` é o score de `query[i]` contra o símbolo de código `b`.
+
+        Args:
+            query (str | bytes | Registo): Sequência.
+
+        Returns:
+            numpy.ndarray: Array int32 de forma (len(alfabeto), len(query)).
+        """
+        return np.ascontiguousarray(self.valores[self.codificar(query)].T)
+
+
+def ler_matriz(caminho, nome=None):
+    """
+    Lê uma matriz de substituição em formato NCBI (como as do BLAST).
+
+    Linhas começadas por '#' são comentários; a primeira linha útil tem os
+    símbolos das colunas e cada linha seguinte começa pelo símbolo da linha.
+
+    Args:
+        caminho (str | os.PathLike): Ficheiro da matriz.
+        nome (str | None, optional): Nome a atribuir à matriz.
+
+    Returns:
+        MatrizSubstituicao: Matriz lida.
+
+    Raises:
+        ValueError: Se o ficheiro não estiver no formato esperado.
+    """
+    with open(caminho) as f:
+        linhas = [linha.split() for linha in f if linha.strip() and not linha.startswith("#")]
+    if not linhas:
+        raise ValueError("Matriz vazia: " + os.fspath(caminho))
+    colunas = linhas[0]
+    valores = {}
+    for linha in linhas[1:]:
+        if len(linha) != len(colunas) + 1:
+            raise ValueError("Linha com número de colunas inválido na matriz: " + linha[0])
+        valores[linha[0]] = [int(v) for v in linha[1:]]
+    if sorted(valores) != sorted(colunas):
+        raise ValueError("As linhas e as colunas da matriz têm símbolos diferentes")
+    alfabeto = "".join(colunas)
+    return MatrizSubstituicao(alfabeto, [valores[a] for a in colunas], nome)
+
+
+def carregar_matriz(nome):
+    """
+    Carrega uma das matrizes incluídas na biblioteca (ver `MATRIZES_DISPONIVEIS`).
+
+    Args:
+        nome (str): "BLOSUM45", "BLOSUM62", "BLOSUM80" ou "PAM250".
+
+    Returns:
+        MatrizSubstituicao: Matriz completa (20 aminoácidos, B, Z, X e *).
+
+    Raises:
+        ValueError: Se a matriz não existir.
+
+    Example:
+        >>> carregar_matriz("PAM250").pontuacao("W", "W")
+        17
+    """
+    nome = nome.upper()
+    if nome not in MATRIZES_DISPONIVEIS:
+        raise ValueError(f"Matriz desconhecida: {nome} (disponíveis: {', '.join(MATRIZES_DISPONIVEIS)})")
+    return _carregar(nome)
+
+
+@lru_cache(maxsize=None)
+def _carregar(nome):
+    return ler_matriz(os.path.join(_PASTA_DADOS, nome), nome)
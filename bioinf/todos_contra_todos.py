@@ -0,0 +1,219 @@
+# Scores de todos contra todos (matriz de distâncias condensada), em paralelo
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .alinhamento import _codificar, escolha_de_matriz
+from .leitor import como_texto
+from .pesquisa import _scores_lote
+
+MODOS = ("global", "local")
+
+# Estado de cada processo: códigos de todas as sequências (em memória partilhada),
+# deslocamentos, matriz de substituição, penalidade de gap e modo.
+_DADOS = {}
+
+
+def indice_condensado(n, i, j):
+    """
+    Posição do par (i, j) numa matriz condensada de `n` sequências.
+
+    A ordem é a de `scipy.spatial.distance.pdist`: (0, 1), (0, 2), ...,
+    (0, n-1), (1, 2), ...
+
+    Args:
+        n (int): Número de sequências.
+        i (int): Índice de uma sequência.
+        j (int): Índice da outra sequência (diferente de `i`).
+
+    Returns:
+        int: Posição no array condensado.
+
+    Raises:
+        ValueError: Se `i == j` ou algum índice estiver fora de [0, n).
+
+    Example:
+        >>> indice_condensado(4, 2, 1)
+        3
+    """
+    if i == j or not (0 <= i < n and 0 <= j < n):
+        raise ValueError(f"Par inválido para {n} sequências: ({i}, {j})")
+    i, j = min(i, j), max(i, j)
+    return n * i - i * (i + 1) // 2 + j - i - 1
+
+
+def _blocos(n, tamanho_bloco):
+    """Blocos (a0, a1, b0, b1) do triângulo superior, com a0 <= b0."""
+    cortes = list(range(0, n, tamanho_bloco)) + [n]
+    return [(cortes[a], cortes[a + 1], cortes[b], cortes[b + 1])
+            for a in range(len(cortes) - 1) for b in range(a, len(cortes) - 1)]
+
+
+def _iniciar(nome, dtype, tamanho, deslocamentos, matriz, space, local):
+    """Inicializador dos processos: liga-se à memória partilhada com os códigos."""
+    memoria = shared_memory.SharedMemory(name=nome)
+    codigos = np.ndarray((tamanho,), dtype=dtype, buffer=memoria.buf)
+    _DADOS.update(memoria=memoria, codigos=codigos, deslocamentos=deslocamentos,
+                  matriz=matriz, space=space, local=local)
+
+
+def _bloco(bloco):
+    """Scores de um bloco: lista de (i, primeiro j, scores de i contra j..b1-1)."""
+    a0, a1, b0, b1 = bloco
+    codigos, deslocamentos = _DADOS["codigos"], _DADOS["deslocamentos"]
+    sequencia = lambda k: codigos[deslocamentos[k]:deslocamentos[k + 1]]
+    linhas = []
+    for i in range(a0, a1):
+        inicio = max(b0, i + 1)
+        if inicio >= b1:
+            continue
+        perfil = _DADOS["matriz"][sequencia(i)].T
+        sujeitos = [sequencia(j) for j in range(inicio, b1)]
+        comprimentos = np.diff(deslocamentos[inicio:b1 + 1])
+        scores = _scores_lote(perfil, sujeitos, comprimentos, _DADOS["space"], _DADOS["local"])
+        linhas.append((i, inicio, scores))
+    return bloco, linhas
+
+
+def _assinatura(codigos, deslocamentos, matriz, parametros):
+    """Resumo SHA-256 das sequências codificadas e dos parâmetros."""
+    h = hashlib.sha256(json.dumps(parametros, sort_keys=True).encode())
+    for array in (codigos, deslocamentos, matriz):
+        h.update(np.ascontiguousarray(array).tobytes())
+    return h.hexdigest()
+
+
+def _abrir_checkpoint(pasta, parametros, total, n_blocos):
+    """Abre (ou cria) os ficheiros de checkpoint; devolve (scores, blocos feitos)."""
+    os.makedirs(pasta, exist_ok=True)
+    caminho_parametros = os.path.join(pasta, "parametros.json")
+    caminho_scores = os.path.join(pasta, "pontuacoes.npy")
+    caminho_blocos = os.path.join(pasta, "blocos.npy")
+    if os.path.exists(caminho_parametros):
+        with open(caminho_parametros, encoding="utf-8") as f:
+            guardados = json.load(f)
+        if guardados != parametros:
+            raise ValueError(f"O checkpoint em {pasta!r} é de outras sequências ou parâmetros")
+        scores = np.lib.format.open_memmap(caminho_scores, mode="r+")
+        feitos = np.lib.format.open_memmap(caminho_blocos, mode="r+")
+        return scores, feitos
+    scores = np.lib.format.open_memmap(caminho_scores, mode="w+", dtype=np.int64, shape=(total,))
+    feitos = np.lib.format.open_memmap(caminho_blocos, mode="w+", dtype=np.bool_, shape=(n_blocos,))
+    scores.flush()
+    feitos.flush()
+    # Os parâmetros só são escritos depois dos arrays, para o checkpoint nunca ficar a meio.
+    with open(caminho_parametros, "w", encoding="utf-8") as f:
+        json.dump(parametros, f)
+    return scores, feitos
+
+
+def _executar_blocos(blocos, processos, codigos, deslocamentos, matriz, space, local):
+    """Calcula os blocos, num conjunto de processos que partilham os códigos."""
+    if processos == 1 or len(blocos) <= 1:
+        _DADOS.update(codigos=codigos, deslocamentos=deslocamentos, matriz=matriz, space=space, local=local)
+        try:
+            yield from map(_bloco, blocos)
+        finally:
+            _DADOS.clear()
+        return
+    memoria = shared_memory.SharedMemory(create=True, size=max(1, codigos.nbytes))
+    try:
+        np.ndarray(codigos.shape, dtype=codigos.dtype, buffer=memoria.buf)[:] = codigos
+        argumentos = (memoria.name, codigos.dtype, len(codigos), deslocamentos, matriz, space, local)
+        trabalhadores = processos or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=trabalhadores, initializer=_iniciar, initargs=argumentos) as executor:
+            futuros = [executor.submit(_bloco, bloco) for bloco in blocos]
+            for futuro in as_completed(futuros):
+                yield futuro.result()
+    finally:
+        memoria.close()
+        memoria.unlink()
+
+
+def pontuacoes_todos_contra_todos(seqs, modo="global", match=2, mismatch=-3, space=-4, subst=None,
+                                  processos=None, tamanho_bloco=128, checkpoint=None):
+    """
+    Calcula os scores de alinhamento de todos os pares de sequências.
+
+    As sequências são codificadas uma só vez e os códigos postos em memória
+    partilhada (`multiprocessing.shared_memory`), de onde cada processo os
+    lê sem cópias. O triângulo superior da matriz de pares é dividido em
+    blocos de `tamanho_bloco` x `tamanho_bloco` sequências, distribuídos por
+    um conjunto de processos; dentro de cada bloco, cada sequência é
+    alinhada contra as do bloco de uma só vez (um sujeito por linha de um
+    array, como em `pesquisa.pontuacoes_locais`).
+
+    Com `checkpoint` (uma pasta), os scores vão sendo escritos num ficheiro
+    `.npy` mapeado em memória e cada bloco é marcado como feito depois de
+    os seus scores estarem em disco; uma nova chamada com as mesmas
+    sequências e parâmetros só calcula os blocos que faltam.
+
+    Args:
+        seqs (Iterable[str | Registo]): Sequências.
+        modo (str, optional): "global" (Needleman-Wunsch) ou "local"
+            (Smith-Waterman).
+        match (int, optional): Pontuação para match (DNA).
+        mismatch (int, optional): Pontuação para mismatch (DNA).
+        space (int, optional): Penalidade de gap.
+        subst (dict | MatrizSubstituicao | None, optional): Matriz de
+            substituição. Por omissão é escolhida pelo tipo das sequências,
+            como em `escolha_de_matriz`.
+        processos (int | None, optional): Número de processos; None usa
+            `os.cpu_count()` e 1 calcula tudo no processo atual.
+        tamanho_bloco (int, optional): Sequências por lado de cada bloco.
+        checkpoint (str | None, optional): Pasta para guardar o progresso
+            e retomar um cálculo interrompido.
+
+    Returns:
+        numpy.ndarray: Array condensado (int64) com n*(n-1)/2 scores, pela
+        ordem de `scipy.spatial.distance.pdist` (ver `indice_condensado`).
+
+    Raises:
+        ValueError: Se o modo for desconhecido, `tamanho_bloco` não for
+            positivo, ou o checkpoint for de outras sequências ou parâmetros.
+
+    Example:
+        >>> pontuacoes_todos_contra_todos(["ACGT", "ACGA", "TTTT"], processos=1).tolist()
+        [3, -7, -12]
+    """
+    if modo not in MODOS:
+        raise ValueError(f"Modo desconhecido: {modo!r} (use {' ou '.join(MODOS)})")
+    if tamanho_bloco < 1:
+        raise ValueError("tamanho_bloco tem de ser positivo")
+    seqs = [como_texto(s) for s in seqs]
+    n = len(seqs)
+    todas = "".join(seqs)
+    if subst is None:
+        subst = escolha_de_matriz(todas, todas, match, mismatch)
+    codigos, _, matriz = _codificar(todas, todas, subst)
+    matriz = matriz.astype(np.int32)
+    codigos = codigos.astype(np.uint8 if len(matriz) <= 256 else np.int32)
+    deslocamentos = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum([len(s) for s in seqs], out=deslocamentos[1:])
+
+    total = n * (n - 1) // 2
+    blocos = _blocos(n, tamanho_bloco)
+    if checkpoint is None:
+        scores, feitos = np.zeros(total, dtype=np.int64), np.zeros(len(blocos), dtype=np.bool_)
+    else:
+        parametros = {"n": n, "modo": modo, "space": space, "tamanho_bloco": tamanho_bloco}
+        parametros["assinatura"] = _assinatura(codigos, deslocamentos, matriz, parametros)
+        scores, feitos = _abrir_checkpoint(checkpoint, parametros, total, len(blocos))
+
+    indice = {bloco: k for k, bloco in enumerate(blocos)}
+    pendentes = [bloco for k, bloco in enumerate(blocos) if not feitos[k]]
+    calculados = _executar_blocos(pendentes, processos, codigos, deslocamentos, matriz, space, modo == "local")
+    for bloco, linhas in calculados:
+        for i, inicio, valores in linhas:
+            posicao = indice_condensado(n, i, inicio)
+            scores[posicao:posicao + len(valores)] = valores
+        if checkpoint is not None:
+            scores.flush()
+        feitos[indice[bloco]] = True
+        if checkpoint is not None:
+            feitos.flush()
+    return np.array(scores)
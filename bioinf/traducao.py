@@ -0,0 +1,177 @@
+# Tradução DNA -> proteína (seis fases de leitura)
+import numpy as np
+
+from .leitor import como_bytes
+
+# Tabelas do NCBI: aminoácido de cada codão, com as bases pela ordem TCAG
+# (TTT, TTC, TTA, TTG, TCT, ...). "*" representa um codão stop.
+CODIGOS_GENETICOS = {
+    1: "FFLLSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+    2: "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNKKSS**VVVVAAAADDEEGGGG",
+    3: "FFLLSSSSYY**CCWWTTTTPPPPHHQQRRRRIIMMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+    4: "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+    5: "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNKKSSSSVVVVAAAADDEEGGGG",
+    11: "FFLLSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+}
+
+CODAO_INVALIDO = 64
+
+_BASES = "ACGT"
+_CODIGOS = np.full(256, 4, dtype=np.uint8)
+_CODIGOS[list(b"ACGTUacgtu")] = [0, 1, 2, 3, 3, 0, 1, 2, 3, 3]
+
+
+def _tabela_aminoacidos(tabela):
+    """Converte a tabela do NCBI (ordem TCAG) para índices de 6 bits (ordem ACGT)."""
+    try:
+        ncbi = CODIGOS_GENETICOS[tabela]
+    except KeyError:
+        raise ValueError(f"Código genético desconhecido: {tabela}") from None
+    tcag = {"T": 0, "C": 1, "A": 2, "G": 3}
+    letras = np.full(CODAO_INVALIDO + 1, ord("X"), dtype=np.uint8)
+    for i in range(CODAO_INVALIDO):
+        b1, b2, b3 = _BASES[i >> 4], _BASES[(i >> 2) & 3], _BASES[i & 3]
+        letras[i] = ord(ncbi[16 * tcag[b1] + 4 * tcag[b2] + tcag[b3]])
+    return letras
+
+
+_TABELAS = {n: _tabela_aminoacidos(n) for n in CODIGOS_GENETICOS}
+
+
+def _tabela(tabela):
+    if tabela not in _TABELAS:
+        raise ValueError(f"Código genético desconhecido: {tabela}")
+    return _TABELAS[tabela]
+
+
+def codificar_bases(seq):
+    """
+    Codifica uma sequência de DNA/RNA em códigos 0-3 (A, C, G, T/U) e 4 (outros).
+
+    Args:
+        seq (str | bytes | Registo): Sequência.
+
+    Returns:
+        numpy.ndarray: Um código `uint8` por base.
+    """
+    return _CODIGOS[np.frombuffer(como_bytes(seq), dtype=np.uint8)]
+
+
+def complemento_reverso_codigos(codigos):
+    """Complemento reverso de uma sequência já codificada (4 mantém-se 4)."""
+    return np.where(codigos < 4, 3 - codigos, codigos)[::-1]
+
+
+def indices_codoes(codigos, fase=0):
+    """
+    Converte bases codificadas nos índices de 6 bits dos codões de uma fase.
+
+    Cada codão b1 b2 b3 passa a `b1 << 4 | b2 << 2 | b3` (0 a 63), calculado
+    para todos os codões de uma só vez; codões com símbolos fora de ACGT
+    recebem `CODAO_INVALIDO` (64).
+
+    Args:
+        codigos (numpy.ndarray): Resultado de `codificar_bases`.
+        fase (int, optional): Deslocamento inicial (0, 1 ou 2).
+
+    Returns:
+        numpy.ndarray: Índice `uint8` de cada codão completo.
+    """
+    n = (len(codigos) - fase) // 3
+    if n <= 0:
+        return np.zeros(0, dtype=np.uint8)
+    codoes = codigos[fase:fase + 3 * n].reshape(n, 3)
+    indices = (codoes[:, 0] << 4) | (codoes[:, 1] << 2) | codoes[:, 2]
+    indices[(codoes == 4).any(axis=1)] = CODAO_INVALIDO
+    return indices
+
+
+def codao_para_aminoacido(codao, tabela=1):
+    """
+    Devolve o aminoácido de um codão.
+
+    Args:
+        codao (str): Codão de 3 bases (DNA ou RNA).
+        tabela (int, optional): Código genético do NCBI (1 = padrão).
+
+    Returns:
+        str: Aminoácido (uma letra), "*" para stop ou "X" se o codão for inválido.
+
+    Raises:
+        ValueError: Se o codão não tiver 3 bases ou a tabela não existir.
+
+    Example:
+        >>> codao_para_aminoacido("AUG")
+        'M'
+        >>> codao_para_aminoacido("TGA", tabela=2)
+        'W'
+    """
+    if len(codao) != 3:
+        raise ValueError("Um codão tem de ter 3 bases")
+    indice = indices_codoes(codificar_bases(codao))[0]
+    return chr(_tabela(tabela)[indice])
+
+
+def traduzir(seq, fase=0, tabela=1):
+    """
+    Traduz uma sequência de DNA (ou RNA) numa proteína, numa fase de leitura.
+
+    Todos os codões são convertidos em índices de 6 bits e traduzidos por
+    uma tabela de consulta num único passo vetorial. Bases incompletas no
+    fim são ignoradas e codões com ambiguidades (ex.: N) dão "X".
+
+    Args:
+        seq (str | bytes | Registo): Sequência de DNA/RNA.
+        fase (int, optional): Fase de leitura: 1, 2, 3 (cadeia direta, a
+            começar na 1.ª, 2.ª ou 3.ª base) ou -1, -2, -3 (complemento reverso).
+            0 é aceite como sinónimo de 1.
+        tabela (int, optional): Código genético do NCBI (ver `CODIGOS_GENETICOS`).
+
+    Returns:
+        str: Proteína, com "*" nos codões stop.
+
+    Raises:
+        ValueError: Se a fase ou a tabela forem inválidas.
+
+    Example:
+        >>> traduzir("ATGGCCTAA")
+        'MA*'
+        >>> traduzir("TTAGGCCAT", fase=-1)
+        'MA*'
+    """
+    if fase not in (0, 1, 2, 3, -1, -2, -3):
+        raise ValueError("Fase inválida (use 1, 2, 3, -1, -2 ou -3)")
+    codigos = codificar_bases(seq)
+    if fase < 0:
+        codigos = complemento_reverso_codigos(codigos)
+    letras = _tabela(tabela)[indices_codoes(codigos, max(abs(fase) - 1, 0))]
+    return letras.tobytes().decode("ascii")
+
+
+def seis_fases(seq, tabela=1):
+    """
+    Traduz uma sequência nas seis fases de leitura.
+
+    A sequência é codificada uma única vez e o complemento reverso é
+    calculado sobre os códigos, sem ciclos em Python por base.
+
+    Args:
+        seq (str | bytes | Registo): Sequência de DNA/RNA.
+        tabela (int, optional): Código genético do NCBI.
+
+    Returns:
+        dict[int, str]: Proteína de cada fase (chaves 1, 2, 3, -1, -2, -3).
+
+    Example:
+        >>> seis_fases("ATGGCC")[1]
+        'MA'
+    """
+    letras = _tabela(tabela)
+    direta = codificar_bases(seq)
+    reversa = complemento_reverso_codigos(direta)
+    resultado = {}
+    for sinal, codigos in ((1, direta), (-1, reversa)):
+        for deslocamento in range(3):
+            proteina = letras[indices_codoes(codigos, deslocamento)]
+            resultado[sinal * (deslocamento + 1)] = proteina.tobytes().decode("ascii")
+    return resultado
@@ -1,3 +1,4 @@
+import random
 import unittest
 
 from bioinf.alinhamento import (
@@ -14,8 +15,18 @@ from bioinf.alinhamento import (
     alinhar_par,
     alinhar_consenso,
     alinhamento_progressivo,
-    escolha_de_matriz
+    escolha_de_matriz,
+    needleman_wunsch_linear,
+    pontuacao_needleman_wunsch,
+    SetasCompactas,
+    AlinhamentoMultiplo,
+    alinhar_local,
+    reconstruir_alinhamento_local,
+    Alinhamento,
+    Alinhamentos,
+    alinhar,
 )
+from bioinf import alinhamento
 
 
 class TestMatrizesBasicas(unittest.TestCase):
@@ -105,6 +116,173 @@ class TestReconstrucao(unittest.TestCase):
         self.assertEqual(len(a1), len(a2))
 
 
+class TestNeedlemanWunschLinear(unittest.TestCase):
+
+    def _casos(self):
+        rng = random.Random(11)
+        for k in range(60):
+            alfabeto = "AC" if k % 3 == 0 else "ACGT"
+            s1 = "".join(rng.choice(alfabeto) for _ in range(rng.randint(0, 35)))
+            s2 = "".join(rng.choice(alfabeto) for _ in range(rng.randint(0, 35)))
+            yield s1, s2, rng.choice([(2, -3, -4), (1, -1, -1), (1, 0, 0), (2, -1, -2)])
+
+    def test_igual_a_reconstruir_alinhamento(self):
+        for s1, s2, (match, mismatch, space) in self._casos():
+            matriz, setas = needleman_wunsch(s1, s2, match, mismatch, space)
+            esperado = reconstruir_alinhamento(setas, s1, s2)
+            self.assertEqual(needleman_wunsch_linear(s1, s2, match, mismatch, space), esperado)
+            self.assertEqual(pontuacao_needleman_wunsch(s1, s2, match, mismatch, space), matriz[-1][-1])
+
+    def test_divisao_em_blocos_pequenos(self):
+        original = alinhamento._CELULAS_BLOCO
+        alinhamento._CELULAS_BLOCO = 4
+        try:
+            for s1, s2, (match, mismatch, space) in self._casos():
+                _, setas = needleman_wunsch(s1, s2, match, mismatch, space)
+                self.assertEqual(needleman_wunsch_linear(s1, s2, match, mismatch, space),
+                                 reconstruir_alinhamento(setas, s1, s2))
+        finally:
+            alinhamento._CELULAS_BLOCO = original
+
+    def test_proteina(self):
+        s1, s2 = "EFCADE", "DFCAE"
+        _, setas = needleman_wunsch(s1, s2)
+        self.assertEqual(needleman_wunsch_linear(s1, s2), reconstruir_alinhamento(setas, s1, s2))
+
+
+class TestBackendNumpy(unittest.TestCase):
+
+    def _casos(self):
+        rng = random.Random(12)
+        for k in range(60):
+            alfabeto = "AC" if k % 3 == 0 else "ACGT"
+            s1 = "".join(rng.choice(alfabeto) for _ in range(rng.randint(0, 30)))
+            s2 = "".join(rng.choice(alfabeto) for _ in range(rng.randint(0, 30)))
+            yield s1, s2, rng.choice([(2, -3, -4), (1, -1, -1), (1, 0, 0), (1, -1, 0)])
+
+    def test_matrizes_e_setas_iguais(self):
+        for funcao in (needleman_wunsch, smith_waterman):
+            for s1, s2, parametros in self._casos():
+                matriz, setas = funcao(s1, s2, *parametros)
+                matriz_np, setas_np = funcao(s1, s2, *parametros, backend="numpy")
+                self.assertEqual(matriz_np.tolist(), matriz)
+                self.assertEqual(setas_np, setas)
+                self.assertEqual(setas_np.texto(), setas.texto())
+                self.assertEqual(setas_np.nbytes, (len(s1) + 1) * ((len(s2) + 4) // 4))
+
+    def test_alinhar_par_e_reconstrucao(self):
+        for s1, s2, (match, mismatch, space) in self._casos():
+            subst = matriz_substituição_dna(match, mismatch)
+            self.assertEqual(alinhar_par(s1, s2, subst, space, backend="numpy"),
+                             alinhar_par(s1, s2, subst, space))
+
+    def test_alinhamento_local(self):
+        for backend in ("python", "numpy"):
+            matriz, setas = smith_waterman("TTACGTT", "GACGA", backend=backend)
+            self.assertEqual(reconstruir_alinhamento_local(matriz, setas, "TTACGTT", "GACGA"), ("ACG", "ACG"))
+        subst = matriz_substituição_dna(2, -3)
+        self.assertEqual(alinhar_local("TTACGTT", "GACGA", subst, -4), ("ACG", "ACG", 6))
+        self.assertEqual(alinhar_local("AAAA", "CCCC", subst, -4), ("", "", 0))
+
+    def test_reconstrucao_local_a_partir_do_maximo(self):
+        for s1, s2, parametros in self._casos():
+            matriz, setas = smith_waterman(s1, s2, *parametros)
+            matriz_np, setas_np = smith_waterman(s1, s2, *parametros, backend="numpy")
+            esperado = reconstruir_alinhamento_local(matriz, setas, s1, s2)
+            self.assertEqual(reconstruir_alinhamento(setas, s1, s2, matriz), esperado)
+            self.assertEqual(reconstruir_alinhamento(setas, s1, s2), esperado)
+            self.assertEqual(reconstruir_alinhamento(setas_np, s1, s2), esperado)
+            self.assertEqual(reconstruir_alinhamento(setas.texto(), s1, s2, matriz), esperado)
+        for backend in ("python", "numpy"):
+            matriz, setas = smith_waterman("TTACGTT", "GACGA", backend=backend)
+            self.assertEqual(reconstruir_alinhamento(setas, "TTACGTT", "GACGA"), ("ACG", "ACG"))
+            self.assertEqual(setas.fim, (5, 4))
+        matriz, setas = smith_waterman("ACGTT", "CG")
+        with self.assertRaises(ValueError):
+            reconstruir_alinhamento(setas.texto(), "ACGTT", "CG")
+
+    def test_setas_compactas(self):
+        codigos = [[3, 2, 2, 2, 2], [1, 0, 1, 2, 3], [1, 3, 0, 0, 1]]
+        setas = SetasCompactas.de_codigos(codigos)
+        self.assertEqual(setas.bits.shape, (3, 2))
+        self.assertEqual([[setas[i, j] for j in range(5)] for i in range(3)], codigos)
+        self.assertEqual(setas.codigos().tolist(), codigos)
+        self.assertEqual(setas.texto()[0], ["", "←", "←", "←", "←"])
+        self.assertEqual(setas.texto()[2][1], "STOP")
+
+    def test_backend_invalido(self):
+        with self.assertRaises(ValueError):
+            needleman_wunsch("AC", "AC", backend="gpu")
+
+
+class TestAlinhamentoCigar(unittest.TestCase):
+
+    def test_igual_aos_alinhadores(self):
+        rng = random.Random(23)
+        subst = matriz_substituição_dna(2, -3)
+        for _ in range(60):
+            s1 = "".join(rng.choice("ACGT") for _ in range(rng.randint(0, 20)))
+            s2 = "".join(rng.choice("ACGT") for _ in range(rng.randint(0, 20)))
+            aln = alinhar(s1, s2)
+            self.assertEqual(aln.linhas(), alinhar_par(s1, s2, subst, -4, backend="numpy"))
+            self.assertEqual(aln.score, pontuacao_needleman_wunsch(s1, s2))
+            a1, a2, score = alinhar_local(s1, s2, subst, -4)
+            aln = alinhar(s1, s2, modo="local")
+            self.assertEqual((aln.linhas(), aln.score), ((a1, a2), score))
+            self.assertEqual((s1[aln.inicio1:aln.fim1], s2[aln.inicio2:aln.fim2]), (a1.replace("-", ""), a2.replace("-", "")))
+            matriz, setas = smith_waterman(s1, s2)
+            self.assertEqual(Alinhamento.de_setas(setas, s1, s2, score, matriz).linhas(), (a1, a2))
+            copia = Alinhamento.de_strings(a1, a2, score, s1, s2, aln.inicio1, aln.inicio2)
+            self.assertEqual(copia.cigar_texto(), aln.cigar_texto())
+
+    def test_cigar_e_vistas(self):
+        aln = alinhar("ACGTT", "AGTT")
+        self.assertEqual(aln.cigar_texto(), "1M1I3M")
+        self.assertEqual(aln.cigar.tolist(), [1 << 2, 1 << 2 | 1, 3 << 2])
+        self.assertEqual(aln.operacoes(), [(1, "M"), (1, "I"), (3, "M")])
+        self.assertEqual(len(aln), 5)
+        self.assertEqual(aln.identicos(), 4)
+        self.assertAlmostEqual(aln.identidade(), 0.8)
+        pos1, pos2 = aln.colunas()
+        self.assertEqual((pos1.tolist(), pos2.tolist()), ([0, 1, 2, 3, 4], [0, -1, 1, 2, 3]))
+        aln = Alinhamento("TTACGA", "CGTA", 1, "2M1D1M", inicio1=3)
+        self.assertEqual(aln.linhas(), ("CG-A", "CGTA"))
+        self.assertEqual((aln.fim1, aln.fim2), (6, 4))
+        self.assertEqual(Alinhamento("", "", 0, "").linhas(), ("", ""))
+        self.assertFalse(hasattr(aln, "__dict__"))
+
+    def test_erros(self):
+        with self.assertRaises(ValueError):
+            Alinhamento("ACG", "ACG", 0, "3N")
+        with self.assertRaises(ValueError):
+            Alinhamento("ACG", "ACG", 0, "4M")
+        with self.assertRaises(ValueError):
+            Alinhamento.de_strings("A-", "A-", 0)
+        with self.assertRaises(ValueError):
+            alinhar("ACG", "ACG", modo="semiglobal")
+
+    def test_colecao_em_colunas(self):
+        rng = random.Random(29)
+        s1 = "".join(rng.choice("ACGT") for _ in range(30))
+        sujeitos = ["".join(rng.choice("ACGT") for _ in range(rng.randint(5, 25))) for _ in range(40)]
+        originais = [alinhar(s1, s2, modo=modo) for modo in ("global", "local") for s2 in sujeitos]
+        colecao = Alinhamentos()
+        for aln in originais:
+            colecao.adicionar(aln)
+        ajustada = Alinhamentos.de_alinhamentos(originais)
+        for c in (colecao, ajustada):
+            self.assertEqual(len(c), len(originais))
+            self.assertEqual(c.scores.tolist(), [aln.score for aln in originais])
+            self.assertEqual([repr(aln) for aln in c], [repr(aln) for aln in originais])
+            self.assertEqual(c[-1].linhas(), originais[-1].linhas())
+        self.assertEqual(len(ajustada.sequencias), 1 + len(sujeitos))
+        self.assertIs(ajustada[3].seq1, s1)
+        runs = sum(len(aln.cigar) for aln in originais)
+        self.assertEqual(ajustada.nbytes, 32 * len(originais) + 8 + 4 * runs)
+        with self.assertRaises(IndexError):
+            ajustada[len(originais)]
+
+
 class TestAlinhamentoMultiplo(unittest.TestCase):
 
     def test_consenso(self):
@@ -126,6 +304,45 @@ class TestAlinhamentoMultiplo(unittest.TestCase):
         alinh = alinhamento_progressivo(seqs, subst)
         self.assertEqual(len(alinh), 3)
 
+    @staticmethod
+    def _progressivo_referencia(seqs, subst, space):
+        """Versão original: consenso e linhas refeitos a cada adição."""
+        alinhamento = [seqs[0]]
+        for nova in seqs[1:]:
+            cons_al, nova_al = alinhar_par(consenso(alinhamento), nova, subst, space)
+            colunas, idx = [], 0
+            for simbolo in cons_al:
+                if simbolo == "-":
+                    colunas.append("-" * len(alinhamento))
+                else:
+                    colunas.append("".join(seq[idx] for seq in alinhamento))
+                    idx += 1
+            alinhamento = ["".join(c) for c in zip(*colunas)] + [nova_al]
+        return alinhamento
+
+    def test_perfil_incremental_igual_ao_original(self):
+        rng = random.Random(20)
+        subst = matriz_substituição_dna(2, -1)
+        for _ in range(15):
+            seqs = ["".join(rng.choice("ACGT") for _ in range(rng.randint(1, 12))) for _ in range(rng.randint(1, 8))]
+            esperado = self._progressivo_referencia(seqs, subst, -2)
+            self.assertEqual(alinhamento_progressivo(seqs, subst, -2), esperado)
+            msa = AlinhamentoMultiplo(seqs[0])
+            for seq in seqs[1:]:
+                msa.adicionar(seq, subst, -2)
+                self.assertEqual(msa.consenso(), consenso(msa.linhas()))
+            self.assertEqual([msa[k] for k in range(len(msa))], esperado)
+            self.assertEqual(msa.contagens.sum(), sum(len(s) for s in seqs))
+
+    def test_perfil_de_alinhamento(self):
+        msa = AlinhamentoMultiplo.de_alinhamento(["AC-T", "GCAT", "G-AA"])
+        self.assertEqual(msa.linhas(), ["AC-T", "GCAT", "G-AA"])
+        self.assertEqual(msa.consenso(), consenso(["AC-T", "GCAT", "G-AA"]))
+        self.assertEqual(msa.consenso(), "GCAT")
+        self.assertEqual(AlinhamentoMultiplo.de_alinhamento(["TA", "AT"]).consenso(), "TA")
+        with self.assertRaises(ValueError):
+            AlinhamentoMultiplo.de_alinhamento(["AC", "A"])
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,114 @@
+import random
+
+import pytest
+from bioinf import alinhamento_afim
+from bioinf.alinhamento import matriz_substituição_dna, needleman_wunsch, smith_waterman
+from bioinf.alinhamento_afim import MODOS, alinhamento_afim as alinhar, pontuacao_afim
+from bioinf.substituicao import carregar_matriz
+
+NEG = -10 ** 9
+
+
+def _gotoh(s1, s2, subst, abertura, extensao, modo):
+  """Três matrizes completas de Gotoh, em Python (referência)."""
+  n, m = len(s1), len(s2)
+  borda = (lambda k: abertura + (k - 1) * extensao) if modo == "global" else (lambda k: 0)
+  H = [[NEG] * (m + 1) for _ in range(n + 1)]
+  E = [[NEG] * (m + 1) for _ in range(n + 1)]
+  F = [[NEG] * (m + 1) for _ in range(n + 1)]
+  H[0][0] = 0
+  for j in range(1, m + 1):
+    H[0][j] = borda(j)
+  for i in range(1, n + 1):
+    H[i][0] = borda(i)
+  for i in range(1, n + 1):
+    for j in range(1, m + 1):
+      E[i][j] = max(E[i][j - 1] + extensao, H[i][j - 1] + abertura)
+      F[i][j] = max(F[i - 1][j] + extensao, H[i - 1][j] + abertura)
+      H[i][j] = max(H[i - 1][j - 1] + subst[s1[i - 1]][s2[j - 1]], E[i][j], F[i][j])
+      if modo == "local":
+        H[i][j] = max(H[i][j], 0)
+  if modo == "global":
+    return H[n][m]
+  if modo == "local":
+    return max(max(linha) for linha in H)
+  return max([H[n][j] for j in range(m + 1)] + [H[i][m] for i in range(n + 1)])
+
+
+def _pontuar(a1, a2, subst, abertura, extensao):
+  score, gap = 0, None
+  for x, y in zip(a1, a2):
+    if x == "-" or y == "-":
+      tipo = "E" if x == "-" else "F"
+      score += extensao if gap == tipo else abertura
+      gap = tipo
+    else:
+      score += subst[x][y]
+      gap = None
+  return score
+
+
+def _sem_pontas(a1, a2):
+  """Retira os gaps das pontas (grátis no modo semiglobal)."""
+  colunas = list(zip(a1, a2))
+  for extremo in (0, -1):
+    for lado in (0, 1):
+      if colunas and colunas[extremo][lado] == "-":
+        while colunas and colunas[extremo][lado] == "-":
+          colunas.pop(extremo)
+        break
+  return "".join(c[0] for c in colunas), "".join(c[1] for c in colunas)
+
+
+@pytest.mark.parametrize("bloco", [1, 16, 1 << 20])
+def test_contra_referencia(monkeypatch, bloco):
+  monkeypatch.setattr(alinhamento_afim, "_CELULAS_BLOCO", bloco)
+  random.seed(bloco)
+  subst = matriz_substituição_dna(2, -3)
+  for _ in range(60):
+    s1 = "".join(random.choice("ACGT") for _ in range(random.randint(0, 25)))
+    s2 = "".join(random.choice("ACGT") for _ in range(random.randint(0, 25)))
+    abertura = random.choice([-1, -3, -5, -8])
+    extensao = random.choice([e for e in (0, -1, -2, -3) if e >= abertura])
+    for modo in MODOS:
+      a1, a2, score = alinhar(s1, s2, abertura=abertura, extensao=extensao, modo=modo, subst=subst)
+      assert score == _gotoh(s1, s2, subst, abertura, extensao, modo)
+      assert score == pontuacao_afim(s1, s2, abertura=abertura, extensao=extensao, modo=modo, subst=subst)
+      if modo == "local":
+        assert a1.replace("-", "") in s1 and a2.replace("-", "") in s2
+      else:
+        assert a1.replace("-", "") == s1 and a2.replace("-", "") == s2
+      if modo == "semiglobal":
+        a1, a2 = _sem_pontas(a1, a2)
+      assert _pontuar(a1, a2, subst, abertura, extensao) == score
+
+
+def test_gap_linear_igual_a_needleman_wunsch_e_smith_waterman():
+  random.seed(5)
+  for _ in range(20):
+    s1 = "".join(random.choice("ACGT") for _ in range(random.randint(1, 30)))
+    s2 = "".join(random.choice("ACGT") for _ in range(random.randint(1, 30)))
+    matriz, _ = needleman_wunsch(s1, s2, 2, -3, -4)
+    assert pontuacao_afim(s1, s2, 2, -3, -4, -4) == matriz[-1][-1]
+    matriz, _ = smith_waterman(s1, s2, 2, -3, -4)
+    assert pontuacao_afim(s1, s2, 2, -3, -4, -4, modo="local") == max(max(linha) for linha in matriz)
+
+
+def test_gap_longo_preferido():
+  a1, a2, score = alinhar("ACGTTTTTTACG", "ACGACG", abertura=-5, extensao=-1)
+  assert (a1, a2, score) == ("ACGTTTTTTACG", "ACG------ACG", 2)
+  assert alinhar("TTTTACGTACGTTTTT", "ACGTACG", modo="semiglobal") == ("TTTTACGTACGTTTTT", "----ACGTACG-----", 14)
+
+
+def test_proteinas_blosum62():
+  b62 = carregar_matriz("BLOSUM62")
+  a1, a2, score = alinhar("HEAGAWGHEE", "PAWHEAE", abertura=-10, extensao=-1, modo="local", subst=b62)
+  assert score == _gotoh("HEAGAWGHEE", "PAWHEAE", b62, -10, -1, "local")
+  assert _pontuar(a1, a2, b62, -10, -1) == score
+
+
+def test_erros():
+  with pytest.raises(ValueError):
+    pontuacao_afim("ACG", "ACG", modo="glocal")
+  with pytest.raises(ValueError):
+    alinhar("ACG", "ACG", abertura=-1, extensao=-5)
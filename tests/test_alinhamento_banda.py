@@ -0,0 +1,87 @@
+import random
+
+import pytest
+from bioinf import alinhamento_banda
+from bioinf.alinhamento import matriz_substituição_dna, needleman_wunsch
+from bioinf.alinhamento_afim import pontuacao_afim
+from bioinf.alinhamento_banda import MODOS, alinhamento_banda as alinhar, pontuacao_banda
+from bioinf.substituicao import carregar_matriz
+
+
+def _mutar(seq, edicoes):
+  seq = list(seq)
+  for _ in range(edicoes):
+    p = random.randrange(len(seq) + 1)
+    op = random.random()
+    if op < 0.4 and p < len(seq):
+      seq[p] = random.choice("ACGT")
+    elif op < 0.7:
+      seq.insert(p, random.choice("ACGT"))
+    elif p < len(seq):
+      del seq[p]
+  return "".join(seq)
+
+
+def _pontuar(a1, a2, subst, space, modo):
+  colunas = list(zip(a1, a2))
+  if modo == "semiglobal":
+    for extremo in (0, -1):
+      for lado in (0, 1):
+        if colunas and colunas[extremo][lado] == "-":
+          while colunas and colunas[extremo][lado] == "-":
+            colunas.pop(extremo)
+          break
+  return sum(space if "-" in c else subst[c[0]][c[1]] for c in colunas)
+
+
+@pytest.mark.parametrize("bloco", [1, 5, 32768])
+def test_contra_matriz_completa(monkeypatch, bloco):
+  monkeypatch.setattr(alinhamento_banda, "_LINHAS_BLOCO", bloco)
+  random.seed(bloco)
+  subst = matriz_substituição_dna(2, -3)
+  for _ in range(60):
+    s1 = "".join(random.choice("ACGT") for _ in range(random.randint(0, 30)))
+    if random.random() < 0.5:
+      s2 = _mutar(s1, random.randint(0, 5))
+    else:
+      s2 = "".join(random.choice("ACGT") for _ in range(random.randint(0, 30)))
+    space = random.choice([-1, -2, -4, -6])
+    for modo in MODOS:
+      esperado = pontuacao_afim(s1, s2, abertura=space, extensao=space, modo=modo, subst=subst)
+      for largura in (1, 2, 5, 64):
+        assert pontuacao_banda(s1, s2, space=space, modo=modo, largura=largura, subst=subst) == esperado
+        a1, a2, score = alinhar(s1, s2, space=space, modo=modo, largura=largura, subst=subst)
+        assert score == esperado
+        assert a1.replace("-", "") == s1 and a2.replace("-", "") == s2
+        assert _pontuar(a1, a2, subst, space, modo) == score
+
+
+def test_igual_a_needleman_wunsch():
+  random.seed(16)
+  for _ in range(20):
+    s1 = "".join(random.choice("ACGT") for _ in range(random.randint(1, 40)))
+    s2 = _mutar(s1, 3)
+    matriz, _ = needleman_wunsch(s1, s2, 2, -3, -4)
+    assert pontuacao_banda(s1, s2, 2, -3, -4, largura=1) == matriz[-1][-1]
+
+
+def test_sequencias_longas_quase_identicas():
+  random.seed(17)
+  s1 = "".join(random.choice("ACGT") for _ in range(5000))
+  s2 = _mutar(s1, 10)
+  a1, a2, score = alinhar(s1, s2)
+  assert score == pontuacao_banda(s1, s2) == pontuacao_afim(s1, s2, abertura=-4, extensao=-4)
+  assert _pontuar(a1, a2, matriz_substituição_dna(2, -3), -4, "global") == score
+  assert alinhar("TTTTACGTACGTTTTT", "ACGTACG", modo="semiglobal") == ("TTTTACGTACGTTTTT", "----ACGTACG-----", 14)
+
+
+def test_proteinas_blosum62():
+  b62 = carregar_matriz("BLOSUM62")
+  a1, a2, score = alinhar("HEAGAWGHEE", "PAWHEAE", space=-8, subst=b62)
+  assert score == pontuacao_afim("HEAGAWGHEE", "PAWHEAE", abertura=-8, extensao=-8, subst=b62)
+  assert _pontuar(a1, a2, b62, -8, "global") == score
+
+
+def test_erros():
+  with pytest.raises(ValueError):
+    pontuacao_banda("ACG", "ACG", modo="local")
@@ -0,0 +1,46 @@
+import random
+
+import pytest
+from bioinf.alinhamento import alinhar, needleman_wunsch_linear, smith_waterman
+from bioinf.alinhamento_wavefront import MODOS, alinhamento_wavefront, pontuacao_wavefront
+from bioinf.substituicao import carregar_matriz
+
+
+@pytest.mark.parametrize("bloco", [1, 3, 8, 1 << 12])
+def test_igual_a_matriz_completa(bloco):
+  random.seed(bloco)
+  for _ in range(40):
+    s1 = "".join(random.choice("ACGT") for _ in range(random.randint(0, 30)))
+    s2 = "".join(random.choice("ACGT") for _ in range(random.randint(0, 30)))
+    for modo in MODOS:
+      esperado = alinhar(s1, s2, modo=modo)
+      for processos in (1, 3):
+        aln = alinhamento_wavefront(s1, s2, modo=modo, bloco=bloco, processos=processos)
+        assert (aln.score, aln.inicio1, aln.inicio2, aln.linhas()) == \
+          (esperado.score, esperado.inicio1, esperado.inicio2, esperado.linhas())
+        assert pontuacao_wavefront(s1, s2, modo=modo, bloco=bloco, processos=processos) == esperado.score
+
+
+def test_sequencias_longas_e_processos():
+  random.seed(2)
+  s1 = "".join(random.choice("ACGT") for _ in range(700))
+  s2 = "".join(b if random.random() > 0.1 else random.choice("ACGT") for b in s1)
+  aln = alinhamento_wavefront(s1, s2, bloco=128, processos=2, paralelismo="processos")
+  assert aln.linhas() == needleman_wunsch_linear(s1, s2)
+  local = alinhamento_wavefront(s1, s2[100:500], modo="local", bloco=100, processos=2, paralelismo="processos")
+  matriz, _ = smith_waterman(s1, s2[100:500], backend="numpy")
+  assert local.score == matriz.max()
+  assert local.linhas() == alinhar(s1, s2[100:500], modo="local").linhas()
+
+
+def test_proteinas_e_erros():
+  b62 = carregar_matriz("BLOSUM62")
+  esperado = alinhar("HEAGAWGHEE", "PAWHEAE", modo="local", subst=b62, space=-8)
+  aln = alinhamento_wavefront("HEAGAWGHEE", "PAWHEAE", modo="local", subst=b62, space=-8, bloco=3)
+  assert (aln.score, aln.linhas()) == (esperado.score, esperado.linhas())
+  with pytest.raises(ValueError):
+    pontuacao_wavefront("ACG", "ACG", modo="semiglobal")
+  with pytest.raises(ValueError):
+    pontuacao_wavefront("ACG", "ACG", paralelismo="gpu")
+  with pytest.raises(ValueError):
+    pontuacao_wavefront("ACG", "ACG", bloco=0)
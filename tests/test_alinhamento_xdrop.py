@@ -0,0 +1,79 @@
+import random
+
+import pytest
+from bioinf.alinhamento import smith_waterman
+from bioinf.alinhamento_xdrop import PARAGENS, pontuacao_xdrop
+from bioinf.pesquisa import pontuacoes_locais
+from bioinf.substituicao import carregar_matriz
+
+
+def _score_sw(s1, s2, subst=None):
+  matriz, _ = smith_waterman(s1, s2, 2, -3, -4, subst=subst)
+  return max((max(linha) for linha in matriz), default=0)
+
+
+def _aleatoria(tamanho, alfabeto="ACGT"):
+  return "".join(random.choice(alfabeto) for _ in range(tamanho))
+
+
+def test_nunca_acima_de_smith_waterman():
+  random.seed(3)
+  for _ in range(80):
+    s1, s2 = _aleatoria(random.randint(0, 30)), _aleatoria(random.randint(0, 30))
+    score = _score_sw(s1, s2)
+    for x, k in [(10 ** 6, 1), (0, 1), (4, 3), (12, 11)]:
+      r = pontuacao_xdrop(s1, s2, x=x, k=k)
+      assert r.score <= score and r.paragem in PARAGENS
+
+
+def test_segmento_comum_inteiro():
+  random.seed(4)
+  for _ in range(30):
+    comum = _aleatoria(random.randint(11, 40))
+    s1 = _aleatoria(random.randint(0, 30)) + comum + _aleatoria(random.randint(0, 30))
+    s2 = _aleatoria(random.randint(0, 30)) + comum + _aleatoria(random.randint(0, 30))
+    assert pontuacao_xdrop(s1, s2, x=10 ** 6).score == _score_sw(s1, s2)
+
+
+def test_alinhamento_depois_de_ruido():
+  # O ruído do início passa de x antes de o alinhamento verdadeiro começar.
+  random.seed(5)
+  a = _aleatoria(300)
+  assert pontuacao_xdrop(a, a[150:250], x=10) == (200, 548, "fim")
+  assert pontuacao_xdrop(a, a[150:250], x=10, limiar=100).paragem == "limiar"
+  a = _aleatoria(5000)
+  r = pontuacao_xdrop(a, a[2500:4500])
+  assert r.score == 4000 and r.celulas < 5000 * 2000 // 100
+
+
+def test_poda_em_sequencias_parecidas():
+  random.seed(1)
+  s1 = _aleatoria(3000)
+  s2 = "".join(random.choice("ACGT") if k % 40 == 0 else b for k, b in enumerate(s1))
+  poda = pontuacao_xdrop(s1, s2, x=30)
+  assert poda.score == int(pontuacoes_locais(s1, [s2])[0])
+  assert poda.celulas < len(s1) * len(s2) // 20
+
+
+def test_limiar():
+  random.seed(8)
+  for _ in range(60):
+    s1, s2 = _aleatoria(random.randint(1, 30)), _aleatoria(random.randint(1, 30))
+    score = _score_sw(s1, s2)
+    for limiar in (score - 2, score, score + 1):
+      r = pontuacao_xdrop(s1, s2, x=10 ** 6, limiar=limiar, k=2)
+      assert (r.paragem == "limiar") == (r.score >= limiar)
+      assert r.paragem != "limiar" or score >= limiar
+      assert r.paragem == "inalcancavel" if score < limiar else r.paragem in PARAGENS
+  assert pontuacao_xdrop("TTTTACGTACGTTTTT", "GGACGTACGGG", limiar=30, k=4) == (0, 0, "inalcancavel")
+  assert pontuacao_xdrop("TTTTACGTACGTTTTT", "GGACGTACGGG", x=5, limiar=8, k=4) == (14, 27, "limiar")
+
+
+def test_proteinas_e_erros():
+  b62 = carregar_matriz("BLOSUM62")
+  score = _score_sw("HEAGAWGHEE", "PAWHEAE", b62)
+  assert pontuacao_xdrop("HEAGAWGHEE", "PAWHEAE", subst=b62, x=100, k=2).score == score
+  with pytest.raises(ValueError):
+    pontuacao_xdrop("ACG", "ACG", x=-1)
+  with pytest.raises(ValueError):
+    pontuacao_xdrop("ACG", "ACG", k=0)
@@ -0,0 +1,93 @@
+import sqlite3
+
+import pytest
+from bioinf.alinhamento import matriz_substituição_dna, needleman_wunsch, smith_waterman
+from bioinf.blast import alinhamento_pro
+from bioinf.cache_alinhamentos import CacheAlinhamentos, EstatisticasCache
+from bioinf.leitor import Registo
+from bioinf.substituicao import carregar_matriz
+
+chamadas = []
+
+
+def _contar(seq1, seq2, space=-4):
+  chamadas.append((seq1, seq2, space))
+  return [len(seq1), len(seq2), space]
+
+
+def test_resultados_iguais_as_funcoes():
+  cache = CacheAlinhamentos()
+  for _ in range(2):
+    assert cache.needleman_wunsch("ACGT", "AGT") == needleman_wunsch("ACGT", "AGT")
+    assert cache.smith_waterman("TTACGTT", "GACGA") == smith_waterman("TTACGTT", "GACGA")
+    assert cache.alinhar_par("ACG", "AG", matriz_substituição_dna(2, -1), -2) == ("ACG", "A-G")
+    assert cache.alinhamento_pro("ACGT", "TACGTG", k=2) == alinhamento_pro("ACGT", "TACGTG", k=2)
+  assert cache.estatisticas() == EstatisticasCache(4, 0, 4, 4)
+  matriz, setas = cache.needleman_wunsch("ACGT", "AGT", backend="numpy")
+  matriz2, setas2 = cache.needleman_wunsch("ACGT", "AGT", 2, -3, backend="numpy")
+  assert (matriz == matriz2).all() and setas.texto() == setas2.texto()
+  assert cache.estatisticas().acertos_memoria == 5
+
+
+def test_chave_canonica():
+  chave = CacheAlinhamentos.chave
+  assert chave(needleman_wunsch, "ACG", "AG") == chave(needleman_wunsch, seq2="AG", seq1="ACG", space=-4)
+  assert chave(needleman_wunsch, "ACG", "AG") == chave(needleman_wunsch, Registo("r", "", memoryview(b"ACG")), "AG")
+  assert chave(needleman_wunsch, "ACG", "AG") != chave(needleman_wunsch, "ACG", "AG", space=-5)
+  assert chave(needleman_wunsch, "ACG", "AG") != chave(smith_waterman, "ACG", "AG")
+  b62, b45 = carregar_matriz("BLOSUM62"), carregar_matriz("BLOSUM45")
+  assert chave(needleman_wunsch, "HEA", "PAW", subst=b62) != chave(needleman_wunsch, "HEA", "PAW", subst=b45)
+  with pytest.raises(TypeError):
+    chave(needleman_wunsch, "ACG", "AG", subst=object())
+
+
+def test_lru_e_copias():
+  chamadas.clear()
+  cache = CacheAlinhamentos(capacidade=2)
+  cache.chamar(_contar, "A", "AC")
+  cache.chamar(_contar, "C", "AC")
+  resultado = cache.chamar(_contar, "A", "AC")
+  resultado.append("alterado")
+  assert cache.chamar(_contar, "A", "AC") == [1, 2, -4]
+  cache.chamar(_contar, "G", "AC")
+  cache.chamar(_contar, "C", "AC")
+  assert len(chamadas) == 4 and len(cache) == 2
+  assert cache.estatisticas() == EstatisticasCache(2, 0, 4, 2)
+  cache.limpar()
+  assert cache.estatisticas() == EstatisticasCache(0, 0, 0, 0)
+  with pytest.raises(ValueError):
+    CacheAlinhamentos(capacidade=-1)
+
+
+def test_persistencia_em_disco(tmp_path):
+  chamadas.clear()
+  caminho = str(tmp_path / "cache.sqlite")
+  with CacheAlinhamentos(capacidade=1, caminho=caminho) as cache:
+    cache.chamar(_contar, "A", "AC")
+    cache.chamar(_contar, "C", "AC")
+    assert cache.chamar(_contar, "A", "AC") == [1, 2, -4]
+    assert cache.estatisticas() == EstatisticasCache(0, 1, 2, 1)
+  with CacheAlinhamentos(capacidade=0, caminho=caminho) as cache:
+    assert cache.chamar(_contar, "C", "AC") == [1, 2, -4]
+    assert cache.chamar(_contar, "A", "AC", space=-4) == [1, 2, -4]
+    assert cache.estatisticas() == EstatisticasCache(0, 2, 0, 0)
+    cache.limpar(disco=True)
+    cache.chamar(_contar, "A", "AC")
+  assert len(chamadas) == 3
+
+
+def test_escritas_em_lote(tmp_path):
+  caminho = str(tmp_path / "cache.sqlite")
+  guardados = lambda: sqlite3.connect(caminho).execute("SELECT COUNT(*) FROM resultados").fetchone()[0]
+  cache = CacheAlinhamentos(capacidade=0, caminho=caminho, lote_escrita=2)
+  cache.chamar(_contar, "A", "C")
+  assert guardados() == 0
+  assert cache.chamar(_contar, "A", "C") == [1, 1, -4]
+  assert cache.estatisticas().acertos_disco == 1
+  cache.chamar(_contar, "A", "G")
+  assert guardados() == 2
+  cache.chamar(_contar, "A", "T")
+  cache.fechar()
+  assert guardados() == 3
+  with pytest.raises(ValueError):
+    CacheAlinhamentos(lote_escrita=0)
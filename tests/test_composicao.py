@@ -0,0 +1,73 @@
+import random
+
+import numpy as np
+import pytest
+from bioinf.composicao import IndiceComposicao
+from bioinf.sequencias import PackedSeq
+
+
+def _contar(seq):
+  seq = seq.upper()
+  contagem = {b: seq.count(b) for b in "ACGT"}
+  contagem["N"] = len(seq) - sum(contagem.values())
+  return contagem
+
+
+def test_contar_e_gc():
+  indice = IndiceComposicao("GGCCATNA")
+  assert indice.contar(0, 4) == {"A": 0, "C": 2, "G": 2, "T": 0, "N": 0}
+  assert indice.contar() == {"A": 2, "C": 2, "G": 2, "T": 1, "N": 1}
+  assert indice.gc(2, 8) == 0.4
+  assert indice.gc_skew(0, 3) == pytest.approx(1 / 3)
+  assert indice.gc(6, 7) == 0.0 and indice.gc_skew(4, 6) == 0.0
+  assert indice.contar(3, 3) == {"A": 0, "C": 0, "G": 0, "T": 0, "N": 0}
+
+
+def test_intervalo_invalido():
+  indice = IndiceComposicao("ACGT")
+  with pytest.raises(ValueError):
+    indice.contar(2, 5)
+  with pytest.raises(ValueError):
+    indice.contar(3, 2)
+  with pytest.raises(ValueError):
+    IndiceComposicao("ACGT", amostragem=0)
+  with pytest.raises(ValueError):
+    indice.janelas(0)
+
+
+@pytest.mark.parametrize("amostragem", [1, 3, 64])
+def test_contra_dna_counter(amostragem):
+  random.seed(amostragem)
+  seq = "".join(random.choice("ACGTacgtNR") for _ in range(700))
+  indice = IndiceComposicao(seq, amostragem)
+  for _ in range(200):
+    i = random.randint(0, len(seq))
+    j = random.randint(i, len(seq))
+    assert indice.contar(i, j) == _contar(seq[i:j])
+
+
+@pytest.mark.parametrize("amostragem", [1, 64])
+def test_janelas(amostragem):
+  random.seed(7)
+  seq = "".join(random.choice("ACGTN") for _ in range(1000))
+  indice = IndiceComposicao(seq, amostragem)
+  inicios, contagens = indice.janelas(100, 37)
+  assert inicios.tolist() == list(range(0, 901, 37))
+  for i, linha in zip(inicios, contagens):
+    assert dict(zip("ACGTN", linha.tolist())) == _contar(seq[i:i + 100])
+  _, gc = indice.gc_janelas(100, 37)
+  _, skew = indice.skew_janelas(100, 37)
+  assert np.allclose(gc, [indice.gc(i, i + 100) for i in inicios])
+  assert np.allclose(skew, [indice.gc_skew(i, i + 100) for i in inicios])
+
+
+def test_janela_maior_que_sequencia_e_packedseq():
+  inicios, contagens = IndiceComposicao("ACG").janelas(5)
+  assert len(inicios) == 0 and contagens.shape == (0, 5)
+  assert IndiceComposicao(PackedSeq("ACGTN")).contar() == {"A": 1, "C": 1, "G": 1, "T": 1, "N": 1}
+  assert IndiceComposicao("acgtNR").contar(0, 6) == {"A": 1, "C": 1, "G": 1, "T": 1, "N": 2}
+
+
+def test_amostragem_reduz_memoria():
+  seq = "ACGT" * 1000
+  assert IndiceComposicao(seq, 64).nbytes * 32 < IndiceComposicao(seq).nbytes
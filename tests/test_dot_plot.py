@@ -0,0 +1,123 @@
+import random
+import struct
+import zlib
+
+import numpy as np
+import pytest
+from bioinf import dot_plot as modulo
+from bioinf.alinhamento import dot_plot_janela, janela_match
+from bioinf.dot_plot import dot_plot, escrever_imagem, raster_dot_plot
+
+
+def _referencia(s1, s2, window, stringency):
+  return [(p1, p2) for p1 in range(len(s1) - window + 1) for p2 in range(len(s2) - window + 1)
+          if janela_match(s1, s2, p1, p2, window) >= stringency]
+
+
+@pytest.mark.parametrize("bloco", [1, 3, 1 << 16])
+def test_contra_janela_deslizante(monkeypatch, bloco):
+  monkeypatch.setattr(modulo, "_LINHAS_BLOCO", bloco)
+  random.seed(bloco)
+  for _ in range(150):
+    alfabeto = random.choice(["AC", "ACGT", "ACDEFGHIKLMNPQRSTVWY"])
+    s1 = "".join(random.choice(alfabeto) for _ in range(random.randint(0, 30)))
+    s2 = "".join(random.choice(alfabeto) for _ in range(random.randint(0, 30)))
+    window = random.randint(1, 8)
+    stringency = random.randint(-1, window + 1)
+    esperado = _referencia(s1, s2, window, stringency)
+    p1, p2 = dot_plot(s1, s2, window, stringency)
+    assert list(zip(p1.tolist(), p2.tolist())) == esperado
+
+    bits = dot_plot(s1, s2, window, stringency, formato="bits")
+    n1, n2 = max(0, len(s1) - window + 1), max(0, len(s2) - window + 1)
+    densa = np.zeros((n1, n2), dtype=np.uint8)
+    for i, j in esperado:
+      densa[i, j] = 1
+    assert bits.shape == (n1, (n2 + 7) // 8)
+    assert np.array_equal(np.unpackbits(bits, axis=1, count=n2), densa)
+
+
+def test_kmers_longos():
+  random.seed(18)
+  s1 = "".join(random.choice("ACGT") for _ in range(300))
+  s2 = s1[50:250]
+  for stringency in (40, 36):
+    p1, p2 = dot_plot(s1, s2, 40, stringency)
+    assert list(zip(p1.tolist(), p2.tolist())) == _referencia(s1, s2, 40, stringency)
+
+
+def test_sequencias_longas():
+  random.seed(19)
+  s1 = "".join(random.choice("ACGT") for _ in range(20000))
+  s2 = list(s1[5000:] + s1[:5000])
+  for p in random.sample(range(len(s2)), 100):
+    s2[p] = "A" if s2[p] != "A" else "C"
+  s2 = "".join(s2)
+  p1, p2 = dot_plot(s1, s2, 20)
+  assert np.all((p2 - p1) % len(s1) == 15000)
+  p1, p2 = dot_plot(s1, s2, 40, 36)
+  assert len(p1) > len(s1) - 400 * 40 and np.all((p2 - p1) % len(s1) == 15000)
+
+
+def test_dot_plot_janela_igual():
+  m = dot_plot_janela("ACGTACGT", "TACG", 3, 2)
+  assert [(i, j) for i, linha in enumerate(m) for j, v in enumerate(linha) if v] == \
+    _referencia("ACGTACGT", "TACG", 3, 2)
+
+
+def test_raster(monkeypatch):
+  monkeypatch.setattr(modulo, "_LINHAS_BLOCO", 7)
+  monkeypatch.setattr(modulo, "_PONTOS_BLOCO", 10)
+  random.seed(20)
+  s1 = "".join(random.choice("ACGT") for _ in range(60))
+  s2 = "".join(random.choice("ACGT") for _ in range(45))
+  for stringency in (0, 2, 4):
+    raster = raster_dot_plot(s1, s2, 4, stringency, largura=5, altura=3)
+    esperado = np.zeros((3, 5), dtype=np.int64)
+    for p1, p2 in _referencia(s1, s2, 4, stringency):
+      esperado[p1 * 3 // 57, p2 * 5 // 42] += 1
+    assert np.array_equal(raster, esperado)
+  assert raster_dot_plot(s1, s2, 4, largura=21).shape == (28, 21)
+  assert raster_dot_plot("AC", "ACGT", 3, largura=4).tolist() == [[0, 0, 0, 0]] * 4
+
+
+def _ler_png(caminho):
+  dados = open(caminho, "rb").read()
+  assert dados[:8] == b"\x89PNG\r\n\x1a\n"
+  pos, blocos = 8, {}
+  while pos < len(dados):
+    tamanho, tipo = struct.unpack(">I4s", dados[pos:pos + 8])
+    conteudo = dados[pos + 8:pos + 8 + tamanho]
+    assert struct.unpack(">I", dados[pos + 8 + tamanho:pos + 12 + tamanho])[0] == zlib.crc32(tipo + conteudo)
+    blocos[tipo] = blocos.get(tipo, b"") + conteudo
+    pos += 12 + tamanho
+  largura, altura = struct.unpack(">II", blocos[b"IHDR"][:8])
+  linhas = np.frombuffer(zlib.decompress(blocos[b"IDAT"]), dtype=np.uint8).reshape(altura, largura + 1)
+  assert not linhas[:, 0].any()
+  return linhas[:, 1:]
+
+
+def test_escrever_imagem(tmp_path):
+  raster = np.array([[0, 1, 9], [0, 0, 3]])
+  escrever_imagem(tmp_path / "d.png", raster)
+  escrever_imagem(tmp_path / "d.pgm", raster)
+  escrever_imagem(tmp_path / "d.pbm", raster)
+  png = _ler_png(tmp_path / "d.png")
+  assert png[0, 0] == 255 and png[0, 2] == 0 and 0 < png[1, 2] < png[0, 1] < 255
+  pgm = (tmp_path / "d.pgm").read_bytes()
+  assert pgm.startswith(b"P5\n3 2\n255\n") and np.array_equal(np.frombuffer(pgm[-6:], dtype=np.uint8), png.ravel())
+  pbm = (tmp_path / "d.pbm").read_bytes()
+  assert pbm == b"P4\n3 2\n" + bytes([0b01100000, 0b00100000])
+  escrever_imagem(tmp_path / "vazio.img", np.zeros((2, 2)), formato="png")
+  assert (_ler_png(tmp_path / "vazio.img") == 255).all()
+
+
+def test_erros(tmp_path):
+  with pytest.raises(ValueError):
+    dot_plot("ACGT", "ACGT", 0)
+  with pytest.raises(ValueError):
+    dot_plot("ACGT", "ACGT", 2, formato="png")
+  with pytest.raises(ValueError):
+    raster_dot_plot("ACGT", "ACGT", 2, largura=0)
+  with pytest.raises(ValueError):
+    escrever_imagem(tmp_path / "d.jpg", np.zeros((2, 2)))
@@ -0,0 +1,49 @@
+import pytest
+from bioinf.indice_fasta import FastaIndexado, construir_indice, ler_indice, EntradaIndice
+
+FASTA = b">chr1 teste\nACGTA\nCGTAC\nGG\n>chr2\nTTTTaaaa\n"
+
+
+@pytest.fixture
+def fasta(tmp_path):
+    p = tmp_path / "ref.fa"
+    p.write_bytes(FASTA)
+    return p
+
+
+def test_construir_indice_formato_fai(fasta):
+    entradas = construir_indice(fasta)
+    assert entradas == [EntradaIndice("chr1", 12, 12, 5, 6), EntradaIndice("chr2", 8, 33, 8, 9)]
+    assert (fasta.parent / "ref.fa.fai").read_text() == "chr1\t12\t12\t5\t6\nchr2\t8\t33\t8\t9\n"
+    assert ler_indice(str(fasta) + ".fai") == entradas
+
+
+def test_construir_indice_linhas_irregulares(tmp_path):
+    p = tmp_path / "mau.fa"
+    p.write_bytes(b">x\nACG\nA\nACG\n")
+    with pytest.raises(ValueError):
+        construir_indice(p)
+
+
+def test_buscar_regioes(fasta):
+    with FastaIndexado(fasta) as fa:
+        assert fa.nomes == ["chr1", "chr2"]
+        assert fa.buscar("chr1", 3, 11) == "TACGTACG"
+        assert fa.buscar("chr1", 10) == "GG"
+        assert fa["chr2"] == "TTTTaaaa"
+        assert fa.comprimento("chr1") == 12
+
+
+def test_buscar_reverso_e_regiao_samtools(fasta):
+    with FastaIndexado(fasta) as fa:
+        assert fa.buscar("chr2", 2, 6, reverso=True) == "ttAA"
+        assert fa.regiao("chr1:4-8") == "TACGT"
+        assert fa.regiao("chr2") == "TTTTaaaa"
+
+
+def test_buscar_erros(fasta):
+    with FastaIndexado(fasta) as fa:
+        with pytest.raises(KeyError):
+            fa.buscar("chrX", 0, 1)
+        with pytest.raises(ValueError):
+            fa.buscar("chr1", 5, 2)
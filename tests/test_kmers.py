@@ -0,0 +1,89 @@
+import random
+import unittest
+from collections import Counter
+
+from bioinf.kmers import (
+    ContadorKmers,
+    codificar_kmer,
+    descodificar_kmer,
+    complemento_reverso_kmer,
+    codigos_kmers,
+    contar_kmers,
+)
+from bioinf.leitor import Registo
+
+
+class TestCodificacao(unittest.TestCase):
+
+    def test_codificar_descodificar(self):
+        self.assertEqual(codificar_kmer("ACGT"), 27)
+        self.assertEqual(descodificar_kmer(27, 4), "ACGT")
+
+    def test_codificar_invalido(self):
+        with self.assertRaises(ValueError):
+            codificar_kmer("ACNT")
+        with self.assertRaises(ValueError):
+            codificar_kmer("A" * 32)
+
+    def test_complemento_reverso(self):
+        rc = complemento_reverso_kmer(codificar_kmer("AACG"), 4)
+        self.assertEqual(descodificar_kmer(rc, 4), "CGTT")
+
+    def test_codigos_ignoram_n(self):
+        codigos = codigos_kmers("ACNGT", 2, canonico=False)
+        self.assertEqual([descodificar_kmer(c, 2) for c in codigos], ["AC", "GT"])
+
+
+class TestContador(unittest.TestCase):
+
+    def test_contagem_simples(self):
+        c = contar_kmers("ATATA", 2, canonico=False)
+        self.assertEqual(c["AT"], 2)
+        self.assertEqual(c["TA"], 2)
+        self.assertEqual(c["GG"], 0)
+        self.assertEqual(c.total, 4)
+
+    def test_contagem_canonica(self):
+        c = contar_kmers("AAATTT", 3)
+        self.assertEqual(c["AAA"], 2)
+        self.assertEqual(c["TTT"], 2)
+        self.assertEqual(c["ATT"], 2)
+
+    def test_blocos_e_varias_sequencias(self):
+        seq = "ACGTTGCAACGGTA" * 5
+        referencia = contar_kmers(seq + "N" + seq, 5)
+        c = ContadorKmers(5, tamanho_bloco=7)
+        c.adicionar(seq)
+        c.adicionar(Registo("x", "", memoryview(seq.encode())))
+        self.assertEqual(c.top(10), referencia.top(10))
+        self.assertEqual(c.total, referencia.total)
+
+    def test_muitas_sequencias_curtas(self):
+        rng = random.Random(6)
+        reads = ["".join(rng.choice("ACGTN") for _ in range(rng.randint(0, 40))) for _ in range(3000)]
+        contar = lambda rs: Counter(r[i:i + 4] for r in rs for i in range(len(r) - 3) if "N" not in r[i:i + 4])
+        esperado = contar(reads)
+        c = ContadorKmers(4, canonico=False, tamanho_bloco=64)
+        for n, read in enumerate(reads, 1):
+            c.adicionar(read)
+            if n == 1500:
+                # Consultar a meio junta os pendentes sem perder nada.
+                self.assertEqual(c.total, sum(contar(reads[:n]).values()))
+        self.assertEqual(len(c), len(esperado))
+        self.assertEqual(c.total, sum(esperado.values()))
+        self.assertTrue(all(c[k] == n for k, n in esperado.items()))
+        self.assertEqual(contar_kmers(reads, 4, canonico=False).items()[1].tolist(), c.items()[1].tolist())
+
+    def test_top_e_espectro(self):
+        c = contar_kmers("AAAAC", 2, canonico=False)
+        self.assertEqual(c.top(1), [("AA", 3)])
+        self.assertEqual(c.espectro(), {1: 1, 3: 1})
+
+    def test_sequencia_curta(self):
+        c = contar_kmers("AC", 3)
+        self.assertEqual(len(c), 0)
+        self.assertEqual(c.top(5), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
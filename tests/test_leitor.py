@@ -0,0 +1,71 @@
+import gzip
+
+import pytest
+from bioinf.leitor import Registo, ler_fasta, ler_fastq, ler_sequencias, como_texto
+from bioinf.sequencias import dna_counter, reverse_complement
+from bioinf.motifs import find_overlapping
+from bioinf.blast import alinhamento_pro
+
+FASTA = b">s1 primeira\nACGT\nAC\n>s2\nGGAATTCC\n\n>vazia\n"
+FASTQ = b"@r1 desc\nACGT\n+\nIIII\n@r2\nGG\n+r2\n!!\n"
+
+
+@pytest.fixture
+def fasta(tmp_path):
+  p = tmp_path / "seqs.fa"
+  p.write_bytes(FASTA)
+  return p
+
+
+def test_registo_basico():
+  r = Registo("x", "", memoryview(b"ACGT"))
+  assert len(r) == 4
+  assert str(r) == "ACGT"
+  assert bytes(r) == b"ACGT"
+
+def test_como_texto():
+  assert como_texto(b"AC") == "AC"
+  assert como_texto(Registo("x", "", memoryview(b"GT"))) == "GT"
+
+@pytest.mark.parametrize("usar_mmap", [True, False])
+def test_ler_fasta(fasta, usar_mmap):
+  regs = list(ler_fasta(fasta, usar_mmap=usar_mmap))
+  assert [r.nome for r in regs] == ["s1", "s2", "vazia"]
+  assert regs[0].descricao == "primeira"
+  assert [bytes(r.seq) for r in regs] == [b"ACGTAC", b"GGAATTCC", b""]
+
+def test_ler_fasta_vista_sem_copia(fasta):
+  r = list(ler_fasta(fasta))[1]
+  assert isinstance(r.seq, memoryview)
+  assert r.seq.obj is not None and not isinstance(r.seq.obj, bytes)
+
+def test_ler_fasta_gzip(tmp_path):
+  p = tmp_path / "seqs.fa.gz"
+  p.write_bytes(gzip.compress(FASTA))
+  assert [str(r) for r in ler_fasta(p)] == ["ACGTAC", "GGAATTCC", ""]
+
+def test_ler_fasta_invalido(tmp_path):
+  p = tmp_path / "mau.fa"
+  p.write_bytes(b"ACGT\n>s1\nAC\n")
+  with pytest.raises(ValueError):
+    list(ler_fasta(p))
+
+@pytest.mark.parametrize("usar_mmap", [True, False])
+def test_ler_fastq(tmp_path, usar_mmap):
+  p = tmp_path / "reads.fq"
+  p.write_bytes(FASTQ)
+  regs = list(ler_fastq(p, usar_mmap=usar_mmap))
+  assert [(r.nome, str(r), bytes(r.qual)) for r in regs] == [("r1", "ACGT", b"IIII"), ("r2", "GG", b"!!")]
+
+def test_ler_sequencias_deteta_formato(tmp_path, fasta):
+  p = tmp_path / "reads.fq.gz"
+  p.write_bytes(gzip.compress(FASTQ))
+  assert len(list(ler_sequencias(p))) == 2
+  assert len(list(ler_sequencias(fasta))) == 3
+
+def test_funcoes_aceitam_registos(fasta):
+  s1, s2, _ = ler_fasta(fasta)
+  assert dna_counter(s1) == {"A": 2, "G": 1, "C": 2, "T": 1}
+  assert reverse_complement(s2) == b"GGAATTCC"
+  assert find_overlapping(s2, "GAATTC") == [1]
+  assert alinhamento_pro(s2, "TGAATTCA", k=3)["tamanho"] == 6
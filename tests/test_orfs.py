@@ -0,0 +1,81 @@
+import gzip
+import random
+
+import pytest
+from bioinf.orfs import ORF, encontrar_orfs, orfs_ficheiro
+from bioinf.sequencias import reverse_complement
+from bioinf.traducao import traduzir
+
+
+def _referencia(seq, minimo, inicios=("ATG",), stops=("TAA", "TAG", "TGA")):
+  """Procura direta nas seis fases, com o complemento reverso construído."""
+  n = len(seq)
+  orfs = set()
+  for cadeia, s in (("+", seq), ("-", reverse_complement(seq))):
+    for f in range(3):
+      aberto = None
+      for i in range(f, n - 2, 3):
+        codao = s[i:i + 3]
+        if codao in stops:
+          if aberto is not None and i + 3 - aberto >= minimo:
+            a, b = (aberto, i + 3) if cadeia == "+" else (n - i - 3, n - aberto)
+            orfs.add(ORF(cadeia, a % 3 + 1 if cadeia == "+" else (n - b) % 3 + 1, a, b))
+          aberto = None
+        elif codao in inicios and aberto is None:
+          aberto = i
+  return orfs
+
+
+def test_orf_simples():
+  assert list(encontrar_orfs("CCATGAAATGA", comprimento_minimo=6)) == [ORF("+", 3, 2, 11)]
+  assert list(encontrar_orfs("CCATGAAATGA", comprimento_minimo=12)) == []
+
+
+def test_orf_cadeia_reversa():
+  seq = reverse_complement("ATGAAATAA")
+  assert list(encontrar_orfs(seq, comprimento_minimo=9)) == [ORF("-", 1, 0, 9)]
+
+
+def test_orf_mais_longa_por_stop_e_sem_stop():
+  # Dois ATG na mesma fase antes do stop: só a ORF mais longa é devolvida.
+  assert list(encontrar_orfs("ATGATGTAA", comprimento_minimo=3)) == [ORF("+", 1, 0, 9)]
+  # Sem stop, a ORF não está completa.
+  assert list(encontrar_orfs("ATGAAAAAA", comprimento_minimo=3)) == []
+
+
+def test_codoes_alternativos_e_tabela():
+  assert list(encontrar_orfs("GTGAAATAA", 3, inicios=("GTG",))) == [ORF("+", 1, 0, 9)]
+  # No código mitocondrial de vertebrados (2), TGA não é stop.
+  assert list(encontrar_orfs("ATGTGAAGA", 3, tabela=2)) == [ORF("+", 1, 0, 9)]
+  with pytest.raises(ValueError):
+    list(encontrar_orfs("ATG", inicios=("ANG",)))
+
+
+@pytest.mark.parametrize("bloco", [3, 10, 64, 1 << 22])
+def test_contra_referencia(bloco):
+  random.seed(bloco)
+  for _ in range(40):
+    seq = "".join(random.choice("ACGTN") for _ in range(random.randint(0, 300)))
+    obtidas = list(encontrar_orfs(seq, 9, tamanho_bloco=bloco))
+    assert len(obtidas) == len(set(obtidas))
+    assert set(obtidas) == _referencia(seq, 9)
+
+
+def test_orf_traduz_para_proteina():
+  random.seed(5)
+  seq = "".join(random.choice("ACGT") for _ in range(2000))
+  n = len(seq)
+  for orf in encontrar_orfs(seq, 30):
+    if orf.cadeia == "+":
+      proteina = traduzir(seq[orf.inicio:orf.fim])
+    else:
+      proteina = traduzir(seq, fase=-orf.fase)[(n - orf.fim) // 3:(n - orf.inicio) // 3]
+    assert proteina[0] == "M" and proteina[-1] == "*" and "*" not in proteina[:-1]
+
+
+def test_orfs_ficheiro(tmp_path):
+  p = tmp_path / "contigs.fa.gz"
+  with gzip.open(p, "wb") as f:
+    f.write(b">c1\nCCATGAAA\nTGA\n>c2\nTTATTTCAT\n")
+  assert list(orfs_ficheiro(p, comprimento_minimo=9)) == [
+    ("c1", ORF("+", 3, 2, 11)), ("c2", ORF("-", 1, 0, 9))]
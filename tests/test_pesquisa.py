@@ -0,0 +1,44 @@
+import random
+
+import pytest
+
+from bioinf.alinhamento import smith_waterman
+from bioinf.leitor import Registo
+from bioinf.pesquisa import pesquisar, pontuacoes_locais
+
+
+def _score_sw(query, sujeito, *parametros):
+  matriz, _ = smith_waterman(query, sujeito, *parametros)
+  return max((max(linha) for linha in matriz), default=0)
+
+
+def test_pontuacoes_iguais_a_smith_waterman():
+  random.seed(13)
+  query = "".join(random.choice("ACGT") for _ in range(40))
+  sujeitos = ["".join(random.choice("ACGT") for _ in range(random.randint(0, 80))) for _ in range(60)]
+  for parametros in [(2, -3, -4), (1, -1, -1), (1, 0, 0)]:
+    scores = pontuacoes_locais(query, sujeitos, *parametros, lanes=7)
+    assert scores.tolist() == [_score_sw(query, s, *parametros) for s in sujeitos]
+
+
+def test_pesquisar_top_k_e_alinhamento():
+  sujeitos = ["GGGG", "TTACGTTT", Registo("s3", "", memoryview(b"CCACGACC")), "ACGT"]
+  r = pesquisar("ACGT", sujeitos, top=3)
+  assert [(a.indice, a.score) for a in r.acertos] == [(1, 8), (3, 8), (2, 6)]
+  assert r.acertos[0].alinhamento == ("ACGT", "ACGT")
+  assert r.acertos[2].nome == "s3" and r.acertos[2].alinhamento == ("ACG", "ACG")
+  assert r.celulas == 4 * 24
+  assert r.cups >= 0
+
+
+def test_pesquisar_sem_alinhamento_e_base_vazia():
+  r = pesquisar("ACGT", ["ACGT"], alinhar=False)
+  assert r.acertos[0].alinhamento is None
+  assert pesquisar("ACGT", []).acertos == []
+
+
+def test_simbolo_desconhecido_no_sujeito():
+  with pytest.raises(ValueError, match=r"'N' do sujeito 1"):
+    pontuacoes_locais("ACGT", ["ACGT", "ACGNT"])
+  with pytest.raises(ValueError, match=r"'n' da query"):
+    pesquisar("ACnGT", ["ACGT"])
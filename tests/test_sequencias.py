@@ -1,5 +1,7 @@
 import pytest
 from bioinf.sequencias import is_dna,dna_counter,dna_to_rna,reverse_complement,identificar_sequencia
+from bioinf.sequencias import dna_to_rna_blocos,reverse_complement_ficheiro,PackedSeq,dna_counter_ficheiros
+from bioinf.sequencias import classificar_lote,tipo_sequencia,TIPO_DNA,TIPO_RNA,TIPO_AMINO,TIPO_ERRO,TIPO_INDETERMINADO,PROTEINA_PADRAO
 
 def test_is_dna_valida(capsys):
   is_dna("AGCTAG")
@@ -46,4 +48,113 @@ def test_identificar_insuficiente():
   assert "Introduza mais informação" in msg
 
 def test_identificar_erro():
-  assert identificar_sequencia("1234") == "ERRO"
\ No newline at end of file
+  assert identificar_sequencia("1234") == "ERRO"
+
+def test_reverse_complement_iupac():
+  assert reverse_complement("ARYN") == "NRYT"
+
+def test_reverse_complement_bytes_soft_mask():
+  assert reverse_complement(b"acgTN", soft_mask=True) == b"NAcgt"
+  assert reverse_complement(memoryview(b"acgt")) == b"ACGT"
+
+def test_reverse_complement_invalido():
+  with pytest.raises(ValueError):
+    reverse_complement("ACGX")
+
+def test_dna_to_rna_blocos():
+  assert b"".join(dna_to_rna_blocos([b"AT", b"GC\n", b"gc"])) == b"UACGCG"
+
+def test_reverse_complement_ficheiro(tmp_path):
+  origem = tmp_path / "seq.txt"
+  destino = tmp_path / "rc.txt"
+  origem.write_bytes(b"AACG\nTTGA\n")
+  assert reverse_complement_ficheiro(origem, destino, tamanho_bloco=3) == 8
+  assert destino.read_bytes() == reverse_complement(b"AACGTTGA")
+
+
+def test_packedseq_ida_e_volta():
+  for seq in ["", "A", "ACG", "ACGT", "ACGTNNAC", "nnACgt"]:
+    assert str(PackedSeq(seq)) == seq.upper()
+
+def test_packedseq_memoria():
+  assert PackedSeq("ACGT" * 1000).nbytes == 1000
+
+def test_packedseq_ns():
+  assert PackedSeq("NNACNGT").ns == [(0, 2), (4, 1)]
+
+def test_packedseq_invalido():
+  with pytest.raises(ValueError):
+    PackedSeq("ACGR")
+
+def test_packedseq_reverse_complement():
+  for seq in ["ACGTA", "AACCGGTTN", "NACGTAG"]:
+    assert str(reverse_complement(PackedSeq(seq))) == reverse_complement(seq)
+
+def test_packedseq_reverse_complement_com_ns():
+  for seq in ["NNAC", "ACNNNNNNNNNGT", "NACGTNNA", "TTTTTNNNNNNNNNNNNNNNNNNNC"]:
+    rc = PackedSeq(seq).reverse_complement()
+    assert rc == PackedSeq(str(rc))
+    assert rc.contar() == PackedSeq(reverse_complement(seq)).contar()
+  assert PackedSeq("NNAC").reverse_complement().contar() == {"A": 0, "C": 0, "G": 1, "T": 1, "N": 2}
+
+def test_packedseq_funcoes(capsys):
+  p = PackedSeq("AGCTAGCN")
+  assert dna_counter(p) == {"A": 2, "G": 2, "C": 2, "T": 1}
+  assert p.contar()["N"] == 1
+  assert identificar_sequencia(PackedSeq("ACGT")) == "DNA"
+  is_dna(p)
+  assert "Sequência inválida" in capsys.readouterr().out
+
+
+FASTA_CONTAGEM = b">s1 x\nACGTN\nacgr\n>s2\n\n>s3\nTTTT\n"
+
+def test_dna_counter_bytes():
+  assert dna_counter(b"agcTAGC") == {"A": 2, "G": 2, "C": 2, "T": 1}
+
+@pytest.mark.parametrize("tamanho_bloco", [3, 8, 1 << 20])
+def test_dna_counter_ficheiros_blocos(tmp_path, tamanho_bloco):
+  p = tmp_path / "a.fa"
+  p.write_bytes(FASTA_CONTAGEM)
+  res = dna_counter_ficheiros([p], processos=1, tamanho_bloco=tamanho_bloco)[str(p)]
+  assert res["total"] == {"A": 2, "C": 2, "G": 2, "T": 5, "N": 1, "R": 1}
+  assert [nome for nome, _ in res["registos"]] == ["s1", "s2", "s3"]
+  assert res["registos"][1][1] == {"A": 0, "C": 0, "G": 0, "T": 0, "N": 0}
+  assert res["registos"][2][1]["T"] == 4
+
+def test_dna_counter_ficheiros_paralelo_gzip(tmp_path):
+  import gzip
+  a = tmp_path / "a.fa"
+  b = tmp_path / "b.fa.gz"
+  a.write_bytes(FASTA_CONTAGEM)
+  b.write_bytes(gzip.compress(FASTA_CONTAGEM))
+  res = dna_counter_ficheiros([a, b], processos=2, tamanho_bloco=5)
+  assert res[str(a)] == res[str(b)]
+
+def test_dna_counter_ficheiros_invalido(tmp_path):
+  p = tmp_path / "a.fa"
+  p.write_bytes(b"ACGT\n>s1\nAC\n")
+  with pytest.raises(ValueError):
+    dna_counter_ficheiros([p], processos=1)
+
+
+def test_tipo_sequencia():
+  assert tipo_sequencia("acgt") == TIPO_DNA
+  assert tipo_sequencia(b"ACGU") == TIPO_RNA
+  assert tipo_sequencia("ACG") == TIPO_INDETERMINADO
+  assert tipo_sequencia("MKB") == TIPO_AMINO
+  assert tipo_sequencia("MKB", PROTEINA_PADRAO) == TIPO_ERRO
+
+def test_classificar_lote_tipos_e_erros():
+  tipos, erros = classificar_lote(["ACGT", "ACGU", "AC1G", "", "MKTLL", "ACGTU#"], tamanho_lote=2)
+  assert tipos.tolist() == [TIPO_DNA, TIPO_RNA, TIPO_ERRO, TIPO_INDETERMINADO, TIPO_AMINO, TIPO_ERRO]
+  assert erros.tolist() == [-1, -1, 2, -1, -1, 5]
+  assert tipos.dtype.itemsize == 1
+
+def test_classificar_lote_alfabetos_incompativeis():
+  tipos, erros = classificar_lote(["TTU"], proteina=PROTEINA_PADRAO)
+  assert tipos.tolist() == [TIPO_ERRO]
+  assert erros.tolist() == [2]
+
+def test_classificar_lote_vazio():
+  tipos, erros = classificar_lote([])
+  assert len(tipos) == 0 and len(erros) == 0
@@ -0,0 +1,89 @@
+import random
+
+import numpy as np
+import pytest
+from bioinf.alinhamento import (alinhar_par, matriz_substituição_dna, matriz_substituição_proteína,
+                                needleman_wunsch, needleman_wunsch_linear, smith_waterman)
+from bioinf.pesquisa import pontuacoes_locais
+from bioinf.substituicao import MATRIZES_DISPONIVEIS, MatrizSubstituicao, carregar_matriz, ler_matriz
+
+AMINOACIDOS = "ACDEFGHIKLMNPQRSTVWY"
+
+
+def _proteina(n):
+  return "".join(random.choice(AMINOACIDOS) for _ in range(n))
+
+
+def test_matrizes_incluidas():
+  for nome in MATRIZES_DISPONIVEIS:
+    m = carregar_matriz(nome)
+    assert len(m) == 24 and set(AMINOACIDOS) <= set(m.alfabeto)
+    assert (m.valores == m.valores.T).all()
+  b62 = carregar_matriz("blosum62")
+  assert b62 is carregar_matriz("BLOSUM62")
+  assert b62["W"]["W"] == 11 and b62.pontuacao("A", "R") == -1 and b62.pontuacao("w", "c") == -2
+  assert carregar_matriz("BLOSUM45").pontuacao("W", "W") == 15
+  assert carregar_matriz("BLOSUM80").pontuacao("C", "C") == 13
+  assert carregar_matriz("PAM250").pontuacao("W", "W") == 17
+  assert matriz_substituição_proteína()["W"]["Y"] == 2
+  with pytest.raises(ValueError):
+    carregar_matriz("BLOSUM50")
+
+
+def test_codificar_e_perfil():
+  b62 = carregar_matriz("BLOSUM62")
+  assert b62.alfabeto[b62.codificar("hw")[1]] == "W"
+  perfil = b62.perfil("WAC")
+  assert perfil.shape == (24, 3)
+  assert perfil[b62.codificar("W")[0]].tolist() == [11, -3, -2]
+  with pytest.raises(KeyError):
+    b62.codificar("AJ")
+  with pytest.raises(ValueError):
+    b62.valores[0, 0] = 1
+
+
+def test_de_dicionario_e_dna():
+  dna = MatrizSubstituicao.dna(2, -1)
+  assert dna.pontuacao("A", "A") == 2 and dna["G"]["T"] == -1
+  convertida = MatrizSubstituicao.de_dicionario(matriz_substituição_dna(2, -1))
+  assert all(convertida[a][b] == dna[a][b] for a in "ACGT" for b in "ACGT")
+  with pytest.raises(ValueError):
+    MatrizSubstituicao("AC", [[1]])
+
+
+def test_ler_matriz(tmp_path):
+  caminho = tmp_path / "m.txt"
+  caminho.write_text("# comentario\n   A  B\nA  1 -1\nB -1  2\n")
+  m = ler_matriz(caminho, "teste")
+  assert m.nome == "teste" and m.valores.tolist() == [[1, -1], [-1, 2]]
+  caminho.write_text("   A  B\nA  1 -1\n")
+  with pytest.raises(ValueError):
+    ler_matriz(caminho)
+
+
+def test_alinhadores_com_matriz_igual_a_dicionario():
+  random.seed(14)
+  b62 = carregar_matriz("BLOSUM62")
+  dicionario = matriz_substituição_proteína()
+  for _ in range(10):
+    s1, s2 = _proteina(random.randint(0, 30)), _proteina(random.randint(0, 30))
+    for backend in ("python", "numpy"):
+      m1, setas1 = needleman_wunsch(s1, s2, space=-8, backend=backend, subst=b62)
+      m2, setas2 = needleman_wunsch(s1, s2, space=-8, backend=backend, subst=dicionario)
+      assert np.array_equal(m1, m2) and np.array_equal(setas1, setas2)
+      m1, _ = smith_waterman(s1, s2, space=-8, backend=backend, subst=b62)
+      m2, _ = smith_waterman(s1, s2, space=-8, backend=backend, subst=dicionario)
+      assert np.array_equal(m1, m2)
+      assert alinhar_par(s1, s2, b62, -8, backend) == alinhar_par(s1, s2, dicionario, -8, backend)
+    assert needleman_wunsch_linear(s1, s2, space=-8, subst=b62) == alinhar_par(s1, s2, b62, -8)
+
+
+def test_pesquisa_com_matriz():
+  random.seed(15)
+  pam = carregar_matriz("PAM250")
+  query = _proteina(25)
+  sujeitos = [_proteina(random.randint(0, 50)) for _ in range(20)]
+  scores = pontuacoes_locais(query, sujeitos, space=-6, subst=pam, lanes=6)
+  for s, score in zip(sujeitos, scores.tolist()):
+    matriz, _ = smith_waterman(query, s, space=-6, subst=pam)
+    assert score == max((max(linha) for linha in matriz), default=0)
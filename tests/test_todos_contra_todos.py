@@ -0,0 +1,78 @@
+import random
+
+import numpy as np
+import pytest
+from bioinf import todos_contra_todos
+from bioinf.alinhamento import pontuacao_needleman_wunsch, smith_waterman
+from bioinf.substituicao import carregar_matriz
+from bioinf.todos_contra_todos import indice_condensado, pontuacoes_todos_contra_todos
+
+
+def _aleatorias(quantas, semente, alfabeto="ACGT", maximo=30):
+  random.seed(semente)
+  return ["".join(random.choice(alfabeto) for _ in range(random.randint(0, maximo))) for _ in range(quantas)]
+
+
+def _score_sw(s1, s2):
+  matriz, _ = smith_waterman(s1, s2, 2, -3, -4)
+  return max((max(linha) for linha in matriz), default=0)
+
+
+@pytest.mark.parametrize("processos", [1, 2])
+def test_igual_aos_alinhadores(processos):
+  seqs = _aleatorias(13, processos)
+  n = len(seqs)
+  pares = [(i, j) for i in range(n) for j in range(i + 1, n)]
+  globais = pontuacoes_todos_contra_todos(seqs, processos=processos, tamanho_bloco=4)
+  assert globais.tolist() == [pontuacao_needleman_wunsch(seqs[i], seqs[j], 2, -3, -4) for i, j in pares]
+  locais = pontuacoes_todos_contra_todos(seqs, modo="local", processos=processos, tamanho_bloco=5)
+  assert locais.tolist() == [_score_sw(seqs[i], seqs[j]) for i, j in pares]
+
+
+def test_proteinas_e_indice_condensado():
+  b62 = carregar_matriz("BLOSUM62")
+  seqs = ["HEAGAWGHEE", "PAWHEAE", "MKV", "WWW"]
+  scores = pontuacoes_todos_contra_todos(seqs, subst=b62, space=-8, processos=1, tamanho_bloco=3)
+  assert scores[indice_condensado(4, 1, 0)] == pontuacao_needleman_wunsch("HEAGAWGHEE", "PAWHEAE", space=-8, subst=b62)
+  assert [indice_condensado(4, i, j) for i in range(4) for j in range(i + 1, 4)] == list(range(6))
+  with pytest.raises(ValueError):
+    indice_condensado(4, 2, 2)
+
+
+def test_retoma_do_checkpoint(tmp_path, monkeypatch):
+  seqs = _aleatorias(11, 7)
+  esperado = pontuacoes_todos_contra_todos(seqs, processos=1, tamanho_bloco=3)
+  pasta = str(tmp_path / "ck")
+  assert pontuacoes_todos_contra_todos(seqs, processos=1, tamanho_bloco=3, checkpoint=pasta).tolist() == esperado.tolist()
+
+  # Simula uma interrupção: dois blocos por fazer, com lixo nos seus scores.
+  feitos = np.load(tmp_path / "ck" / "blocos.npy", mmap_mode="r+")
+  scores = np.load(tmp_path / "ck" / "pontuacoes.npy", mmap_mode="r+")
+  feitos[[0, 4]] = False
+  scores[[indice_condensado(11, 0, 1), indice_condensado(11, 1, 2)]] = 999
+  feitos.flush()
+  scores.flush()
+  del feitos, scores
+
+  calculados = []
+  original = todos_contra_todos._bloco
+  monkeypatch.setattr(todos_contra_todos, "_bloco", lambda bloco: calculados.append(bloco) or original(bloco))
+  retomado = pontuacoes_todos_contra_todos(seqs, processos=1, tamanho_bloco=3, checkpoint=pasta)
+  assert len(calculados) == 2
+  assert retomado.tolist() == esperado.tolist()
+  assert pontuacoes_todos_contra_todos(seqs, processos=1, tamanho_bloco=3, checkpoint=pasta).tolist() == esperado.tolist()
+  assert len(calculados) == 2
+
+  with pytest.raises(ValueError):
+    pontuacoes_todos_contra_todos(seqs[:-1], processos=1, tamanho_bloco=3, checkpoint=pasta)
+  with pytest.raises(ValueError):
+    pontuacoes_todos_contra_todos(seqs, modo="local", processos=1, tamanho_bloco=3, checkpoint=pasta)
+
+
+def test_erros_e_casos_triviais():
+  assert pontuacoes_todos_contra_todos([], processos=1).tolist() == []
+  assert pontuacoes_todos_contra_todos(["ACGT"], processos=1).tolist() == []
+  with pytest.raises(ValueError):
+    pontuacoes_todos_contra_todos(["ACG", "ACG"], modo="semiglobal")
+  with pytest.raises(ValueError):
+    pontuacoes_todos_contra_todos(["ACG", "ACG"], tamanho_bloco=0)
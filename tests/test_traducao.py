@@ -0,0 +1,81 @@
+import itertools
+import random
+
+import pytest
+from bioinf.leitor import Registo, como_bytes
+from bioinf.sequencias import reverse_complement
+from bioinf.traducao import CODIGOS_GENETICOS, codao_para_aminoacido, seis_fases, traduzir
+
+# Código padrão escrito à mão, independente das tabelas do NCBI
+PADRAO = {
+    "TTT": "F", "TTC": "F", "TTA": "L", "TTG": "L", "CTT": "L", "CTC": "L", "CTA": "L", "CTG": "L",
+    "ATT": "I", "ATC": "I", "ATA": "I", "ATG": "M", "GTT": "V", "GTC": "V", "GTA": "V", "GTG": "V",
+    "TCT": "S", "TCC": "S", "TCA": "S", "TCG": "S", "CCT": "P", "CCC": "P", "CCA": "P", "CCG": "P",
+    "ACT": "T", "ACC": "T", "ACA": "T", "ACG": "T", "GCT": "A", "GCC": "A", "GCA": "A", "GCG": "A",
+    "TAT": "Y", "TAC": "Y", "TAA": "*", "TAG": "*", "CAT": "H", "CAC": "H", "CAA": "Q", "CAG": "Q",
+    "AAT": "N", "AAC": "N", "AAA": "K", "AAG": "K", "GAT": "D", "GAC": "D", "GAA": "E", "GAG": "E",
+    "TGT": "C", "TGC": "C", "TGA": "*", "TGG": "W", "CGT": "R", "CGC": "R", "CGA": "R", "CGG": "R",
+    "AGT": "S", "AGC": "S", "AGA": "R", "AGG": "R", "GGT": "G", "GGC": "G", "GGA": "G", "GGG": "G",
+}
+
+
+def _referencia(seq):
+    return "".join(PADRAO.get(seq[i:i + 3], "X") for i in range(0, len(seq) - 2, 3))
+
+
+def test_codao_para_aminoacido_todos_os_codoes():
+  for codao in map("".join, itertools.product("ACGT", repeat=3)):
+    assert codao_para_aminoacido(codao) == PADRAO[codao]
+    assert codao_para_aminoacido(codao, tabela=11) == PADRAO[codao]
+
+
+def test_codao_rna_minusculas_e_ambiguo():
+  assert codao_para_aminoacido("AUG") == "M"
+  assert codao_para_aminoacido("atg") == "M"
+  assert codao_para_aminoacido("ANG") == "X"
+
+
+def test_codigos_alternativos():
+  assert codao_para_aminoacido("TGA", tabela=2) == "W"
+  assert codao_para_aminoacido("AGA", tabela=2) == "*"
+  assert codao_para_aminoacido("ATA", tabela=2) == "M"
+  assert codao_para_aminoacido("CTG", tabela=3) == "T"
+  assert codao_para_aminoacido("TGA", tabela=4) == "W"
+  assert codao_para_aminoacido("AGG", tabela=5) == "S"
+  assert all(len(t) == 64 for t in CODIGOS_GENETICOS.values())
+
+
+def test_erros():
+  with pytest.raises(ValueError):
+    codao_para_aminoacido("AT")
+  with pytest.raises(ValueError):
+    traduzir("ATG", tabela=99)
+  with pytest.raises(ValueError):
+    traduzir("ATG", fase=4)
+
+
+def test_traduzir_fases():
+  assert traduzir("ATGGCCTAA") == "MA*"
+  assert traduzir("ATGGCCTAA", fase=1) == "MA*"
+  assert traduzir("CATGGCCTAA", fase=2) == "MA*"
+  assert traduzir("TTAGGCCAT", fase=-1) == "MA*"
+  assert traduzir("ATGNCC") == "MX"
+  assert traduzir("AT") == ""
+
+
+def test_seis_fases_contra_referencia():
+  random.seed(3)
+  seq = "".join(random.choice("ACGTN") for _ in range(1000))
+  rc = reverse_complement(seq)
+  fases = seis_fases(seq)
+  for f in range(3):
+    assert fases[f + 1] == _referencia(seq[f:])
+    assert fases[-(f + 1)] == _referencia(rc[f:])
+    assert traduzir(seq, fase=-(f + 1)) == fases[-(f + 1)]
+
+
+def test_aceita_registo_e_bytes():
+  r = Registo("s", "", memoryview(b"ATGTGA"))
+  assert traduzir(r) == "M*"
+  assert seis_fases(b"ATGTGA", tabela=2)[1] == "MW"
+  assert como_bytes(r) is r.seq